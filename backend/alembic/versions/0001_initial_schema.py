@@ -0,0 +1,210 @@
+"""Initial schema, as previously created by Base.metadata.create_all
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0001_initial_schema'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# SQLAlchemy stores Python enums by member name
+USER_ROLE = ('ADMIN', 'OPERATOR', 'TECHNICIAN')
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('full_name', sa.String(), nullable=True),
+        sa.Column('role', sa.Enum(*USER_ROLE, name='userrole'), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True)),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+
+    op.create_table(
+        'servers',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('ip_address', sa.String(), nullable=True),
+        sa.Column('status', sa.Enum('ONLINE', 'OFFLINE', 'MAINTENANCE', 'ERROR', name='serverstatus'), nullable=False),
+        sa.Column('cpu_usage', sa.Float()),
+        sa.Column('ram_usage', sa.Float()),
+        sa.Column('temperature', sa.Float()),
+        sa.Column('uptime', sa.Integer()),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True)),
+    )
+    op.create_index('ix_servers_id', 'servers', ['id'])
+    op.create_index('ix_servers_name', 'servers', ['name'], unique=True)
+
+    op.create_table(
+        'environment',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('room_temperature', sa.Float()),
+        sa.Column('humidity', sa.Float()),
+        sa.Column('ac_status', sa.Boolean()),
+        sa.Column('ac_target_temp', sa.Float()),
+        sa.Column('ups_battery', sa.Float()),
+        sa.Column('ups_on_battery', sa.Boolean()),
+        sa.Column('power_consumption', sa.Float()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+    )
+    op.create_index('ix_environment_id', 'environment', ['id'])
+
+    op.create_table(
+        'alerts',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('message', sa.String(), nullable=False),
+        sa.Column('level', sa.Enum('INFO', 'WARNING', 'ERROR', 'CRITICAL', name='alertlevel'), nullable=False),
+        sa.Column('source', sa.String(), nullable=True),
+        sa.Column('target_role', postgresql.ENUM(*USER_ROLE, name='userrole', create_type=False), nullable=True),
+        sa.Column('is_read', sa.Boolean()),
+        sa.Column('read_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('read_by_user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=True),
+        sa.Column('read_by_email', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+    )
+    op.create_index('ix_alerts_id', 'alerts', ['id'])
+
+    op.create_table(
+        'alert_thresholds',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('cpu_warning_threshold', sa.Float(), nullable=False),
+        sa.Column('cpu_critical_threshold', sa.Float(), nullable=False),
+        sa.Column('temperature_warning_threshold', sa.Float(), nullable=False),
+        sa.Column('temperature_critical_threshold', sa.Float(), nullable=False),
+        sa.Column('ram_warning_threshold', sa.Float(), nullable=False),
+        sa.Column('ram_critical_threshold', sa.Float(), nullable=False),
+        sa.Column('humidity_warning_threshold', sa.Float(), nullable=False),
+        sa.Column('humidity_critical_threshold', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.Column('updated_by', sa.String(), nullable=True),
+    )
+    op.create_index('ix_alert_thresholds_id', 'alert_thresholds', ['id'])
+
+    op.create_table(
+        'alert_deletions',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('alert_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_by_user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('deleted_by_email', sa.String(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('alert_title', sa.String(), nullable=False),
+        sa.Column('alert_message', sa.String(), nullable=False),
+        sa.Column('alert_level', sa.String(20), nullable=False),
+        sa.Column('alert_source', sa.String(), nullable=True),
+    )
+    op.create_index('ix_alert_deletions_id', 'alert_deletions', ['id'])
+    op.create_index('ix_alert_deletions_alert_id', 'alert_deletions', ['alert_id'])
+
+    op.create_table(
+        'scheduled_tasks',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('task_type', sa.Enum('BACKUP', 'RESTART', 'MAINTENANCE', 'DIAGNOSTIC', 'UPDATE', name='tasktype'),
+                  nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', 'CANCELLED', 'OVERDUE',
+                                    name='taskstatus'), nullable=False),
+        sa.Column('target_server', sa.String(), nullable=True),
+        sa.Column('scheduled_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('executed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('is_recurring', sa.Boolean()),
+        sa.Column('recurrence_pattern', sa.String(), nullable=True),
+        sa.Column('recurrence_days', sa.Integer(), nullable=True),
+        sa.Column('assigned_role', postgresql.ENUM(*USER_ROLE, name='userrole', create_type=False), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('completed_by_user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=True),
+        sa.Column('completed_by_email', sa.String(), nullable=True),
+        sa.Column('completion_comment', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True)),
+    )
+    op.create_index('ix_scheduled_tasks_id', 'scheduled_tasks', ['id'])
+
+    op.create_table(
+        'server_metrics_history',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('server_id', sa.Integer(), sa.ForeignKey('servers.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=False),
+        sa.Column('cpu_usage', sa.Float(), nullable=False),
+        sa.Column('ram_usage', sa.Float(), nullable=False),
+        sa.Column('temperature', sa.Float(), nullable=False),
+        sa.Column('uptime', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+    )
+    op.create_index('ix_server_metrics_history_id', 'server_metrics_history', ['id'])
+    op.create_index('ix_server_metrics_history_server_id', 'server_metrics_history', ['server_id'])
+    op.create_index('ix_server_metrics_history_timestamp', 'server_metrics_history', ['timestamp'])
+
+    op.create_table(
+        'stress_test_logs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('server_id', sa.Integer(), sa.ForeignKey('servers.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('duration_seconds', sa.Integer(), nullable=False),
+        sa.Column('intensity', sa.Float(), nullable=False),
+        sa.Column('started_by_user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('started_by_email', sa.String(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('baseline_cpu_before', sa.Float(), nullable=True),
+        sa.Column('baseline_ram_before', sa.Float(), nullable=True),
+        sa.Column('max_cpu_reached', sa.Float(), nullable=True),
+        sa.Column('max_ram_reached', sa.Float(), nullable=True),
+        sa.Column('max_temp_reached', sa.Float(), nullable=True),
+    )
+    op.create_index('ix_stress_test_logs_id', 'stress_test_logs', ['id'])
+    op.create_index('ix_stress_test_logs_server_id', 'stress_test_logs', ['server_id'])
+
+    op.create_table(
+        'server_baselines',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('server_id', sa.Integer(), sa.ForeignKey('servers.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('cpu_baseline', sa.Float(), nullable=False),
+        sa.Column('ram_baseline', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('updated_by_user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=True),
+        sa.Column('updated_by_email', sa.String(), nullable=True),
+    )
+    op.create_index('ix_server_baselines_id', 'server_baselines', ['id'])
+    op.create_index('ix_server_baselines_server_id', 'server_baselines', ['server_id'], unique=True)
+
+    op.create_table(
+        'task_completion_history',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('task_id', sa.Integer(), sa.ForeignKey('scheduled_tasks.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('completed_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.Column('completed_by_user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('completed_by_email', sa.String(), nullable=False),
+        sa.Column('completion_comment', sa.String(), nullable=True),
+        sa.Column('scheduled_date', sa.Date(), nullable=False),
+    )
+    op.create_index('ix_task_completion_history_id', 'task_completion_history', ['id'])
+    op.create_index('ix_task_completion_task_date', 'task_completion_history', ['task_id', 'scheduled_date'])
+
+
+def downgrade():
+    for table in (
+        'task_completion_history', 'server_baselines', 'stress_test_logs', 'server_metrics_history',
+        'scheduled_tasks', 'alert_deletions', 'alert_thresholds', 'alerts', 'environment', 'servers', 'users'
+    ):
+        op.drop_table(table)
+    for enum in ('taskstatus', 'tasktype', 'alertlevel', 'serverstatus', 'userrole'):
+        sa.Enum(name=enum).drop(op.get_bind(), checkfirst=True)
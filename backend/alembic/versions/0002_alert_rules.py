@@ -0,0 +1,49 @@
+"""Per-server alert threshold overrides and grouped alert member counts
+
+Revision ID: 0002_alert_rules
+Revises: 0001_initial_schema
+Create Date: 2026-10-16
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = '0002_alert_rules'
+down_revision = '0001_initial_schema'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases last touched by create_all may already have these. Offline
+    # (--sql) there is no connection to inspect, so the script emits the
+    # DDL for the schema 0001 leaves behind.
+    if context.is_offline_mode():
+        has_overrides, alert_columns = False, set()
+    else:
+        inspector = sa.inspect(op.get_bind())
+        has_overrides = inspector.has_table('alert_threshold_overrides')
+        alert_columns = {column['name'] for column in inspector.get_columns('alerts')}
+
+    if not has_overrides:
+        op.create_table(
+            'alert_threshold_overrides',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('server_id', sa.Integer(), sa.ForeignKey('servers.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('metric', sa.String(50), nullable=False),
+            sa.Column('warning_threshold', sa.Float(), nullable=True),
+            sa.Column('critical_threshold', sa.Float(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+            sa.Column('updated_by', sa.String(), nullable=True),
+            sa.UniqueConstraint('server_id', 'metric', name='uq_alert_threshold_override_server_metric'),
+        )
+        op.create_index('ix_alert_threshold_overrides_id', 'alert_threshold_overrides', ['id'])
+        op.create_index('ix_alert_threshold_overrides_server_id', 'alert_threshold_overrides', ['server_id'])
+
+    if 'member_count' not in alert_columns:
+        op.add_column('alerts', sa.Column('member_count', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    op.drop_column('alerts', 'member_count')
+    op.drop_table('alert_threshold_overrides')
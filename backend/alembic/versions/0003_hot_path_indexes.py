@@ -0,0 +1,43 @@
+"""Composite and partial indexes for the hot alert, stress test and task queries
+
+Revision ID: 0003_hot_path_indexes
+Revises: 0002_alert_rules
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003_hot_path_indexes'
+down_revision = '0002_alert_rules'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Alert dedup: unread alerts by title/source within a time window
+    op.create_index(
+        'ix_alerts_unread_title_source_created', 'alerts', ['title', 'source', 'created_at'],
+        postgresql_where=sa.text('is_read = false')
+    )
+    # Unread list and the websocket snapshot: newest unread first
+    op.create_index(
+        'ix_alerts_unread_created', 'alerts', ['created_at'],
+        postgresql_where=sa.text('is_read = false')
+    )
+    # Alert list and log: newest first
+    op.create_index('ix_alerts_created_at', 'alerts', ['created_at'])
+
+    # Running test per server (stress-test start/cancel/state, completions)
+    op.create_index('ix_stress_test_logs_server_status', 'stress_test_logs', ['server_id', 'status'])
+
+    # Task lists per role ordered by schedule
+    op.create_index('ix_scheduled_tasks_role_time', 'scheduled_tasks', ['assigned_role', 'scheduled_time'])
+
+
+def downgrade():
+    op.drop_index('ix_scheduled_tasks_role_time', table_name='scheduled_tasks')
+    op.drop_index('ix_stress_test_logs_server_status', table_name='stress_test_logs')
+    op.drop_index('ix_alerts_created_at', table_name='alerts')
+    op.drop_index('ix_alerts_unread_created', table_name='alerts')
+    op.drop_index('ix_alerts_unread_title_source_created', table_name='alerts')
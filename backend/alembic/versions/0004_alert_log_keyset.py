@@ -0,0 +1,26 @@
+"""(timestamp, id) indexes for the keyset-paginated alert log
+
+Revision ID: 0004_alert_log_keyset
+Revises: 0003_hot_path_indexes
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = '0004_alert_log_keyset'
+down_revision = '0003_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Both branches of the log UNION walk (timestamp, id) in index order
+    op.create_index('ix_alerts_created_id', 'alerts', ['created_at', 'id'])
+    op.drop_index('ix_alerts_created_at', table_name='alerts')
+    op.create_index('ix_alert_deletions_deleted_id', 'alert_deletions', ['deleted_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_alert_deletions_deleted_id', table_name='alert_deletions')
+    op.create_index('ix_alerts_created_at', 'alerts', ['created_at'])
+    op.drop_index('ix_alerts_created_id', table_name='alerts')
@@ -0,0 +1,5 @@
+# Server metrics that can carry per-server thresholds; each matches an
+# AlertThreshold <metric>_warning/critical_threshold column pair. The API
+# validates overrides against this and the worker's rule table applies
+# them for these metrics only, so keep it free of app imports.
+OVERRIDABLE_METRICS = ("cpu", "temperature", "ram")
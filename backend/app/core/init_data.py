@@ -1,10 +1,15 @@
+import argparse
+import random
+import time
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
 from app.models import (
     Server, Environment, ServerStatus, User, UserRole,
-    AlertThreshold, Alert, AlertLevel
+    AlertThreshold, AlertThresholdOverride, Alert, AlertLevel, ServerBaseline
 )
 from app.core.security import get_password_hash
 from app.core.database import SessionLocal
+from app.core.alert_metrics import OVERRIDABLE_METRICS
 
 
 def init_db():
@@ -129,5 +134,124 @@ def init_db():
         db.close()
 
 
+# Bulk-inserts synthetic servers (and their load baselines, and per-server
+# threshold overrides on `overrides` random ones). Metrics history comes
+# from the simulator itself, see backfill_history.
+def generate_fleet(
+    count: int,
+    with_baselines: bool = True,
+    overrides: int = 0,
+    batch_size: int = 5000
+):
+    db: Session = SessionLocal()
+    started = time.perf_counter()
+
+    try:
+        if not db.query(Environment).first():
+            db.add(Environment())
+        thresholds = db.query(AlertThreshold).first()
+        if not thresholds:
+            thresholds = AlertThreshold(updated_by="system")
+            db.add(thresholds)
+        db.commit()
+
+        # Names and addresses follow the highest id, not the row count, so
+        # they cannot collide with servers left over after deletions.
+        offset = db.query(func.max(Server.id)).scalar() or 0
+        server_ids = []
+
+        for batch_start in range(0, count, batch_size):
+            rows = []
+            for i in range(batch_start, min(count, batch_start + batch_size)):
+                n = offset + i + 1
+                is_online = random.random() > 0.05
+                rows.append({
+                    "name": f"Fleet-{n:06d}",
+                    "ip_address": f"10.{(n >> 16) & 255}.{(n >> 8) & 255}.{n & 255}",
+                    "status": ServerStatus.ONLINE if is_online else ServerStatus.OFFLINE,
+                    "cpu_usage": random.uniform(15, 60) if is_online else 0.0,
+                    "ram_usage": random.uniform(25, 70) if is_online else 0.0,
+                    "temperature": random.uniform(30, 55) if is_online else 22.0,
+                    "uptime": random.randint(3600, 86400 * 90) if is_online else 0,
+                })
+            result = db.execute(insert(Server).returning(Server.id), rows)
+            server_ids.extend(result.scalars().all())
+
+        if with_baselines:
+            for batch_start in range(0, len(server_ids), batch_size):
+                db.execute(insert(ServerBaseline), [
+                    {
+                        "server_id": server_id,
+                        "cpu_baseline": random.uniform(20, 50),
+                        "ram_baseline": random.uniform(30, 60),
+                        "updated_by_email": "generator",
+                    }
+                    for server_id in server_ids[batch_start:batch_start + batch_size]
+                ])
+
+        # One metric per server, shifted around the global pair so some
+        # servers alert earlier and some later than the rest of the fleet.
+        override_rows = []
+        for server_id in random.sample(server_ids, min(overrides, len(server_ids))):
+            metric = random.choice(OVERRIDABLE_METRICS)
+            warning = getattr(thresholds, f"{metric}_warning_threshold") + random.uniform(-15, 5)
+            critical = getattr(thresholds, f"{metric}_critical_threshold") + random.uniform(-10, 3)
+            override_rows.append({
+                "server_id": server_id,
+                "metric": metric,
+                "warning_threshold": round(warning, 1),
+                "critical_threshold": round(max(critical, warning + 5), 1),
+                "updated_by": "generator",
+            })
+        for batch_start in range(0, len(override_rows), batch_size):
+            db.execute(insert(AlertThresholdOverride), override_rows[batch_start:batch_start + batch_size])
+
+        db.commit()
+        print(f"Generated {len(server_ids)} servers ({len(override_rows)} with threshold overrides) in {time.perf_counter() - started:.1f}s")
+
+        return server_ids
+    except Exception as e:
+        print(f"Error generating fleet: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# Runs simulator.backfill for the generated ids. The simulator lives in the
+# worker tree, so this only works where it is importable, e.g. in the
+# worker container: cd /backend && PYTHONPATH=/app python -m app.core.init_data ...
+def backfill_history(server_ids: list, hours: float, interval: float = 60.0):
+    if not server_ids:
+        return
+
+    argv = ["--from-id", str(min(server_ids)), "--servers", str(len(server_ids)),
+            "--hours", str(hours), "--interval", str(interval)]
+    try:
+        from simulator import backfill
+    except ImportError:
+        print(f"Simulator not importable here; backfill in the worker container with: python -m simulator.backfill {' '.join(argv)}")
+        return
+
+    backfill.main(argv)
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the database")
+    parser.add_argument("--servers", type=int, default=0, help="generate this many additional synthetic servers")
+    parser.add_argument("--no-baselines", action="store_true", help="skip per-server load baselines")
+    parser.add_argument("--overrides", type=int, default=0, help="give this many generated servers a per-server threshold override")
+    parser.add_argument("--history-hours", type=float, default=0, help="backfill this many hours of simulated metrics history")
+    parser.add_argument("--history-interval", type=float, default=60.0, help="simulated seconds between history rows")
+    args = parser.parse_args()
+
     init_db()
+
+    if args.servers:
+        server_ids = generate_fleet(
+            args.servers,
+            with_baselines=not args.no_baselines,
+            overrides=args.overrides
+        )
+        if args.history_hours:
+            backfill_history(server_ids, args.history_hours, args.history_interval)
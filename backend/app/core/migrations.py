@@ -0,0 +1,28 @@
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.core.database import engine
+
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini")
+INITIAL_REVISION = "0001_initial_schema"
+
+
+def upgrade_database():
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "alembic"))
+
+    # Databases created by the old create_all at import have the initial
+    # schema but no alembic_version table: adopt them at the first revision.
+    tables = inspect(engine).get_table_names()
+    if "users" in tables and "alembic_version" not in tables:
+        print(f"[MIGRATIONS] Stamping existing schema as {INITIAL_REVISION}")
+        command.stamp(config, INITIAL_REVISION)
+
+    command.upgrade(config, "head")
+
+
+if __name__ == "__main__":
+    upgrade_database()
@@ -8,15 +8,13 @@ class RedisPubSub:
     def __init__(self):
         self.redis: Optional[aioredis.Redis] = None
         self.pubsub: Optional[aioredis.client.PubSub] = None
-        self.subscribers: dict[str, list[Callable]] = {}
+        self.subscribers: dict[str, list[tuple[Callable, bool]]] = {}
 
     async def connect(self):
         if not self.redis:
-            self.redis = await aioredis.from_url(
-                settings.REDIS_URL,
-                encoding="utf-8",
-                decode_responses=True
-            )
+            # Raw responses: binary channels are handed to their subscribers
+            # as bytes, JSON channels are decoded in listen().
+            self.redis = await aioredis.from_url(settings.REDIS_URL)
             self.pubsub = self.redis.pubsub()
 
     async def disconnect(self):
@@ -30,7 +28,7 @@ class RedisPubSub:
             await self.connect()
         await self.redis.publish(channel, json.dumps(message))
 
-    async def subscribe(self, channel: str, callback: Callable):
+    async def subscribe(self, channel: str, callback: Callable, raw: bool = False):
         if not self.pubsub:
             await self.connect()
 
@@ -38,7 +36,17 @@ class RedisPubSub:
             self.subscribers[channel] = []
             await self.pubsub.subscribe(channel)
 
-        self.subscribers[channel].append(callback)
+        self.subscribers[channel].append((callback, raw))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if not self.redis:
+            await self.connect()
+        return await self.redis.get(key)
+
+    async def set_flag(self, key: str):
+        if not self.redis:
+            await self.connect()
+        await self.redis.set(key, 1)
 
     async def listen(self):
         if not self.pubsub:
@@ -46,12 +54,12 @@ class RedisPubSub:
 
         async for message in self.pubsub.listen():
             if message["type"] == "message":
-                channel = message["channel"]
-                data = json.loads(message["data"])
+                channel = message["channel"].decode()
+                payload = message["data"]
 
                 if channel in self.subscribers:
-                    for callback in self.subscribers[channel]:
-                        await callback(data)
+                    for callback, raw in self.subscribers[channel]:
+                        await callback(payload if raw else json.loads(payload))
 
 
 redis_pubsub = RedisPubSub()
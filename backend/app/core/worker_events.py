@@ -0,0 +1,101 @@
+import json
+import time
+import redis
+from app.core.config import settings
+
+CONFIG_CHANNEL = "config_invalidate"
+CONFIG_VERSION_KEY = "config:version:{kind}"
+
+_redis_client = None
+
+
+def _get_client() -> redis.Redis:
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis_client
+
+
+def publish_config_change(kind: str):
+    # Bump the version the worker compares against and announce the change.
+    # Failures are logged only: the worker also reloads its cache on a timer.
+    try:
+        pipe = _get_client().pipeline()
+        pipe.incr(CONFIG_VERSION_KEY.format(kind=kind))
+        pipe.publish(CONFIG_CHANNEL, json.dumps({"kind": kind}))
+        pipe.execute()
+    except redis.RedisError as e:
+        print(f"[WARN] Failed to publish {kind} config change: {e}")
+
+
+SIMULATOR_COMMAND_STREAM = "simulator:commands"
+STRESS_TEST_CHANNEL = "stress_test_update"
+
+
+def publish_simulator_command(action: str, **fields):
+    # Commands go on a stream rather than pub/sub so none are lost while
+    # no worker is listening. Raises redis.RedisError to the caller.
+    _get_client().xadd(
+        SIMULATOR_COMMAND_STREAM,
+        {"action": action, **{key: str(value) for key, value in fields.items()}},
+        maxlen=10000,
+        approximate=True
+    )
+
+
+def publish_stress_test_update(event: str, **fields):
+    try:
+        _get_client().publish(STRESS_TEST_CHANNEL, json.dumps({"event": event, **fields}))
+    except redis.RedisError as e:
+        print(f"[WARN] Failed to publish stress test {event}: {e}")
+
+
+ALERTS_CHANNEL = "alerts_update"
+ALERTS_SEQUENCE_KEY = "alerts:sequence"
+
+# Numbers and publishes an alerts_update delta in one step, so frames
+# reach subscribers in sequence order whichever process sends them.
+PUBLISH_SEQUENCED = """
+local sequence = redis.call('INCR', KEYS[1])
+redis.call('PUBLISH', ARGV[1], '{"sequence":' .. sequence .. ',' .. string.sub(ARGV[2], 2))
+return sequence
+"""
+
+
+# Shared with the worker, which publishes on its own client: the channel,
+# sequence key and script must be the same for clients to spot gaps.
+# Returns the sequence number; raises redis.RedisError to the caller.
+def publish_sequenced(client: redis.Redis, payload: dict) -> int:
+    return client.eval(PUBLISH_SEQUENCED, 1, ALERTS_SEQUENCE_KEY, ALERTS_CHANNEL, json.dumps(payload))
+
+
+def alert_payload(alert) -> dict:
+    return {
+        "id": alert.id,
+        "title": alert.title,
+        "message": alert.message,
+        "level": alert.level.value,
+        "source": alert.source,
+        "target_role": alert.target_role.value if alert.target_role else None,
+        "is_read": alert.is_read,
+        "read_at": alert.read_at.isoformat() if alert.read_at else None,
+        "read_by_email": alert.read_by_email,
+        "created_at": alert.created_at.isoformat() if alert.created_at else None,
+        "member_count": alert.member_count,
+    }
+
+
+def publish_alerts_delta(alerts=(), read_ids=(), deleted_ids=()):
+    # Clients apply deltas in sequence order and ask the API for a full
+    # snapshot when they see a gap, so a lost frame only costs a resync.
+    payload = {
+        "kind": "delta",
+        "alerts": [alert_payload(alert) for alert in alerts],
+        "read_ids": list(read_ids),
+        "deleted_ids": list(deleted_ids),
+        "timestamp": time.time(),
+    }
+    try:
+        publish_sequenced(_get_client(), payload)
+    except redis.RedisError as e:
+        print(f"[WARN] Failed to publish alerts delta: {e}")
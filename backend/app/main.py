@@ -1,15 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import engine, Base
 from app.core.init_data import init_db
 from app.routes import (
     auth, users, servers, environment, alerts, scheduled_tasks,
     websocket, simulator, metrics_history, alert_thresholds
 )
 
-Base.metadata.create_all(bind=engine)
-
 app = FastAPI(
     title="Serwerownia API",
     description="API for server room management system",
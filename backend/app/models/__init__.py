@@ -3,6 +3,7 @@ from .server import Server, ServerStatus
 from .environment import Environment
 from .alert import Alert, AlertLevel
 from .alert_threshold import AlertThreshold
+from .alert_threshold_override import AlertThresholdOverride
 from .alert_deletion import AlertDeletion
 from .scheduled_task import ScheduledTask, TaskType, TaskStatus
 from .server_metrics_history import ServerMetricsHistory
@@ -19,6 +20,7 @@ __all__ = [
     "Alert",
     "AlertLevel",
     "AlertThreshold",
+    "AlertThresholdOverride",
     "AlertDeletion",
     "ScheduledTask",
     "TaskType",
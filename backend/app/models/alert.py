@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Boolean, ForeignKey, Index, text
 from sqlalchemy.sql import func
 import enum
 from app.core.database import Base
@@ -19,6 +19,12 @@ class UserRole(str, enum.Enum):
 
 class Alert(Base):
     __tablename__ = "alerts"
+    __table_args__ = (
+        Index("ix_alerts_unread_title_source_created", "title", "source", "created_at",
+              postgresql_where=text("is_read = false")),
+        Index("ix_alerts_unread_created", "created_at", postgresql_where=text("is_read = false")),
+        Index("ix_alerts_created_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -31,3 +37,5 @@ class Alert(Base):
     read_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     read_by_email = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Servers folded into a grouped alert during an alert storm
+    member_count = Column(Integer, nullable=False, default=1, server_default="1")
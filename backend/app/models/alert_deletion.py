@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, String
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 
 class AlertDeletion(Base):
     __tablename__ = "alert_deletions"
+    __table_args__ = (
+        Index("ix_alert_deletions_deleted_id", "deleted_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     alert_id = Column(Integer, nullable=False, index=True)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, Float, DateTime, String, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class AlertThresholdOverride(Base):
+    __tablename__ = "alert_threshold_overrides"
+    __table_args__ = (UniqueConstraint("server_id", "metric", name="uq_alert_threshold_override_server_metric"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    server_id = Column(Integer, ForeignKey("servers.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Metric prefix of an AlertThreshold column pair, e.g. "cpu"
+    metric = Column(String(50), nullable=False)
+
+    # NULL falls back to the global AlertThreshold value
+    warning_threshold = Column(Float, nullable=True)
+    critical_threshold = Column(Float, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    updated_by = Column(String, nullable=True)
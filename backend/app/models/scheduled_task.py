@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Boolean, ForeignKey, Index
 from sqlalchemy.sql import func
 import enum
 from app.core.database import Base
@@ -24,6 +24,9 @@ class TaskStatus(str, enum.Enum):
 
 class ScheduledTask(Base):
     __tablename__ = "scheduled_tasks"
+    __table_args__ = (
+        Index("ix_scheduled_tasks_role_time", "assigned_role", "scheduled_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, Float, DateTime, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, Float, DateTime, String, Boolean, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 
 class StressTestLog(Base):
     __tablename__ = "stress_test_logs"
+    __table_args__ = (
+        Index("ix_stress_test_logs_server_status", "server_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     server_id = Column(Integer, ForeignKey("servers.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 from app.core.database import get_db
 from app.routes.auth import get_current_active_user
-from app.models import AlertThreshold, User, UserRole
+from app.models import AlertThreshold, AlertThresholdOverride, Server, User, UserRole
+from app.core.worker_events import publish_config_change
+from app.core.alert_metrics import OVERRIDABLE_METRICS
 
 router = APIRouter()
 
@@ -48,6 +50,7 @@ def get_alert_thresholds(
         db.add(thresholds)
         db.commit()
         db.refresh(thresholds)
+        publish_config_change("thresholds")
 
     return {
         "id": thresholds.id,
@@ -86,5 +89,96 @@ def update_alert_thresholds(
 
     db.commit()
     db.refresh(thresholds)
+    publish_config_change("thresholds")
 
     return thresholds
+
+
+class ThresholdOverrideUpdate(BaseModel):
+    warning_threshold: Optional[float] = None
+    critical_threshold: Optional[float] = None
+
+
+class ThresholdOverrideResponse(BaseModel):
+    id: int
+    server_id: int
+    metric: str
+    warning_threshold: Optional[float] = None
+    critical_threshold: Optional[float] = None
+    updated_by: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+@router.get("/thresholds/overrides", response_model=List[ThresholdOverrideResponse])
+def list_threshold_overrides(
+    server_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    query = db.query(AlertThresholdOverride)
+    if server_id is not None:
+        query = query.filter(AlertThresholdOverride.server_id == server_id)
+    return query.order_by(AlertThresholdOverride.server_id, AlertThresholdOverride.metric).all()
+
+
+@router.put("/thresholds/overrides/{server_id}/{metric}", response_model=ThresholdOverrideResponse)
+def set_threshold_override(
+    server_id: int,
+    metric: str,
+    updates: ThresholdOverrideUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can update thresholds")
+
+    if metric not in OVERRIDABLE_METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric, expected one of: {', '.join(OVERRIDABLE_METRICS)}")
+
+    if not db.query(Server).filter(Server.id == server_id).first():
+        raise HTTPException(status_code=404, detail="Server not found")
+
+    override = db.query(AlertThresholdOverride).filter(
+        AlertThresholdOverride.server_id == server_id,
+        AlertThresholdOverride.metric == metric
+    ).first()
+
+    if not override:
+        override = AlertThresholdOverride(server_id=server_id, metric=metric)
+        db.add(override)
+
+    override.warning_threshold = updates.warning_threshold
+    override.critical_threshold = updates.critical_threshold
+    override.updated_by = current_user.email
+
+    db.commit()
+    db.refresh(override)
+    publish_config_change("threshold_overrides")
+
+    return override
+
+
+@router.delete("/thresholds/overrides/{server_id}/{metric}")
+def delete_threshold_override(
+    server_id: int,
+    metric: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can update thresholds")
+
+    deleted = db.query(AlertThresholdOverride).filter(
+        AlertThresholdOverride.server_id == server_id,
+        AlertThresholdOverride.metric == metric
+    ).delete()
+
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Override not found")
+
+    db.commit()
+    publish_config_change("threshold_overrides")
+
+    return {"message": f"Removed {metric} override for server {server_id}"}
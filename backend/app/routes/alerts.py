@@ -1,14 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, desc
-from typing import List
+from sqlalchemy import (
+    or_, select, update, delete, insert, union_all, literal, cast, func, tuple_, String, DateTime
+)
+from typing import List, Optional
+from datetime import datetime
+import base64
+import json
 from app.core.database import get_db
 from app.models.user import User, UserRole
 from app.models.alert import Alert
 from app.models.alert_deletion import AlertDeletion
-from app.schemas.alert import AlertResponse, AlertCreate, AlertLogResponse
+from app.schemas.alert import AlertResponse, AlertCreate, AlertLogResponse, AlertLogPage, AlertBulkFilter
 from app.routes.auth import get_current_active_user
 from app.core.timezone import now_warsaw
+from app.core.worker_events import publish_alerts_delta
 
 router = APIRouter()
 
@@ -66,35 +72,117 @@ def mark_alert_read(
     alert.read_by_email = current_user.email
     db.commit()
     db.refresh(alert)
+    publish_alerts_delta(read_ids=[alert.id])
     return alert
 
 
+def _visible_to(current_user: User):
+    if current_user.role == UserRole.ADMIN:
+        return []
+    return [or_(Alert.target_role == current_user.role, Alert.target_role == None)]
+
+
+def _filter_conditions(criteria: AlertBulkFilter) -> list:
+    conditions = []
+    if criteria.ids is not None:
+        conditions.append(Alert.id.in_(criteria.ids))
+    if criteria.level is not None:
+        conditions.append(Alert.level == criteria.level)
+    if criteria.source is not None:
+        conditions.append(Alert.source == criteria.source)
+    if criteria.title is not None:
+        conditions.append(Alert.title == criteria.title)
+    if criteria.is_read is not None:
+        conditions.append(Alert.is_read == criteria.is_read)
+    if criteria.created_before is not None:
+        conditions.append(Alert.created_at < criteria.created_before)
+    return conditions
+
+
+# One UPDATE ... RETURNING id: no rows are loaded into the session and the
+# row locks are held only for the statement.
+def _mark_read(db: Session, current_user: User, conditions: list) -> List[int]:
+    read_ids = db.execute(
+        update(Alert)
+        .where(Alert.is_read == False, *conditions, *_visible_to(current_user))
+        .values(
+            is_read=True,
+            read_at=now_warsaw(),
+            read_by_user_id=current_user.id,
+            read_by_email=current_user.email
+        )
+        .returning(Alert.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+    if read_ids:
+        publish_alerts_delta(read_ids=read_ids)
+    return read_ids
+
+
 @router.post("/mark-all-read")
 def mark_all_alerts_read(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    query = db.query(Alert).filter(Alert.is_read == False)
+    count = len(_mark_read(db, current_user, []))
+    return {"message": f"Marked {count} alerts as read"}
 
-    if current_user.role != UserRole.ADMIN:
-        query = query.filter(
-            or_(
-                Alert.target_role == current_user.role,
-                Alert.target_role == None
-            )
-        )
 
-    alerts = query.all()
-    count = len(alerts)
+@router.post("/bulk/read")
+def bulk_mark_read(
+    criteria: AlertBulkFilter,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    count = len(_mark_read(db, current_user, _filter_conditions(criteria)))
+    return {"updated": count}
+
 
-    for alert in alerts:
-        alert.is_read = True
-        alert.read_at = now_warsaw()
-        alert.read_by_user_id = current_user.id
-        alert.read_by_email = current_user.email
+@router.post("/bulk/delete")
+def bulk_delete(
+    criteria: AlertBulkFilter,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    conditions = _filter_conditions(criteria)
+    if not conditions:
+        raise HTTPException(status_code=400, detail="At least one filter is required")
 
+    # DELETE ... RETURNING feeds INSERT ... SELECT in the same statement, so
+    # every removed alert gets its audit row and nothing else can slip in
+    # between the two.
+    deleted = (
+        delete(Alert)
+        .where(*conditions, *_visible_to(current_user))
+        .returning(Alert.id, Alert.title, Alert.message, Alert.level, Alert.source)
+        .cte("deleted")
+    )
+    audit = (
+        insert(AlertDeletion)
+        .from_select(
+            ["alert_id", "deleted_by_user_id", "deleted_by_email", "deleted_at",
+             "alert_title", "alert_message", "alert_level", "alert_source"],
+            select(
+                deleted.c.id,
+                literal(current_user.id),
+                literal(current_user.email),
+                literal(now_warsaw(), DateTime(timezone=True)),
+                deleted.c.title,
+                deleted.c.message,
+                # AlertLevel is stored by name; audit rows keep its value
+                func.lower(cast(deleted.c.level, String)),
+                deleted.c.source
+            )
+        )
+        .add_cte(deleted)
+        .returning(AlertDeletion.alert_id)
+    )
+    deleted_ids = db.execute(audit).scalars().all()
     db.commit()
-    return {"message": f"Marked {count} alerts as read"}
+    if deleted_ids:
+        publish_alerts_delta(deleted_ids=deleted_ids)
+    return {"deleted": len(deleted_ids)}
 
 
 @router.delete("/{alert_id}")
@@ -121,57 +209,99 @@ def delete_alert(
 
     db.delete(alert)
     db.commit()
+    publish_alerts_delta(deleted_ids=[alert_id])
     return {"message": "Alert deleted successfully"}
 
 
-@router.get("/logs/history", response_model=List[AlertLogResponse])
+def _encode_log_cursor(row) -> str:
+    key = [row.timestamp.isoformat(), row.kind, row.key]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def _decode_log_cursor(cursor: str):
+    try:
+        timestamp, kind, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(timestamp), int(kind), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# The log is alerts and deletion records in one stream, newest first,
+# ordered by (timestamp, kind, id) with kind 1 (deletion) before kind 0
+# (alert) on equal timestamps. Each branch applies the keyset bound and
+# its own LIMIT, so both walk their (timestamp, id) index and a page
+# costs the same however deep it is.
+def _log_branch(timestamp, row_id, kind: int, cursor, limit: int, columns):
+    query = select(literal(kind).label("kind"), row_id.label("key"), timestamp.label("timestamp"), *columns)
+    if cursor:
+        cursor_time, cursor_kind, cursor_id = cursor
+        if cursor_kind == kind:
+            query = query.where(tuple_(timestamp, row_id) < tuple_(cursor_time, cursor_id))
+        elif cursor_kind > kind:
+            query = query.where(timestamp <= cursor_time)
+        else:
+            query = query.where(timestamp < cursor_time)
+    return query.order_by(timestamp.desc(), row_id.desc()).limit(limit)
+
+
+@router.get("/logs/history", response_model=AlertLogPage)
 def get_alert_logs(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Only admins can view alert logs")
 
-    alerts = db.query(Alert).order_by(desc(Alert.created_at)).offset(skip).limit(limit).all()
-
-    deleted_alerts = db.query(AlertDeletion).order_by(desc(AlertDeletion.deleted_at)).offset(skip).limit(limit).all()
-
-    result = []
-
-    for alert in alerts:
-        result.append(AlertLogResponse(
-            id=alert.id,
-            title=alert.title,
-            message=alert.message,
-            level=alert.level,
-            source=alert.source,
-            target_role=alert.target_role,
-            is_read=alert.is_read,
-            read_at=alert.read_at,
-            read_by_email=alert.read_by_email,
-            created_at=alert.created_at,
-            deleted_at=None,
-            deleted_by_email=None
-        ))
-
-    for deleted in deleted_alerts:
-        result.append(AlertLogResponse(
-            id=deleted.alert_id,
-            title=deleted.alert_title,
-            message=deleted.alert_message,
-            level=deleted.alert_level,
-            source=deleted.alert_source,
-            target_role=None,
-            is_read=True,
-            read_at=None,
-            read_by_email=None,
-            created_at=deleted.deleted_at,
-            deleted_at=deleted.deleted_at,
-            deleted_by_email=deleted.deleted_by_email
-        ))
+    keyset = _decode_log_cursor(cursor) if cursor else None
+
+    alerts = _log_branch(Alert.created_at, Alert.id, 0, keyset, limit + 1, [
+        Alert.id.label("alert_id"),
+        Alert.title, Alert.message,
+        func.lower(cast(Alert.level, String)).label("level"),
+        Alert.source,
+        func.lower(cast(Alert.target_role, String)).label("target_role"),
+        Alert.is_read, Alert.read_at, Alert.read_by_email,
+        literal(None, String).label("deleted_by_email"),
+    ]).subquery()
+    deletions = _log_branch(AlertDeletion.deleted_at, AlertDeletion.id, 1, keyset, limit + 1, [
+        AlertDeletion.alert_id,
+        AlertDeletion.alert_title.label("title"),
+        AlertDeletion.alert_message.label("message"),
+        AlertDeletion.alert_level.label("level"),
+        AlertDeletion.alert_source.label("source"),
+        literal(None, String).label("target_role"),
+        literal(True).label("is_read"),
+        literal(None, DateTime(timezone=True)).label("read_at"),
+        literal(None, String).label("read_by_email"),
+        AlertDeletion.deleted_by_email,
+    ]).subquery()
 
-    result.sort(key=lambda x: x.created_at, reverse=True)
+    log = union_all(select(alerts), select(deletions)).subquery()
+    rows = db.execute(
+        select(log).order_by(log.c.timestamp.desc(), log.c.kind.desc(), log.c.key.desc()).limit(limit + 1)
+    ).all()
 
-    return result[:limit]
+    items = [
+        AlertLogResponse(
+            id=row.alert_id,
+            title=row.title,
+            message=row.message,
+            level=row.level,
+            source=row.source,
+            target_role=row.target_role,
+            is_read=row.is_read,
+            read_at=row.read_at,
+            read_by_email=row.read_by_email,
+            created_at=row.timestamp,
+            deleted_at=row.timestamp if row.kind == 1 else None,
+            deleted_by_email=row.deleted_by_email
+        )
+        for row in rows[:limit]
+    ]
+
+    return AlertLogPage(
+        items=items,
+        next_cursor=_encode_log_cursor(rows[limit - 1]) if len(rows) > limit else None
+    )
@@ -5,6 +5,7 @@ from app.models.user import User, UserRole
 from app.models.environment import Environment
 from app.schemas.environment import EnvironmentResponse, EnvironmentUpdate
 from app.routes.auth import get_current_active_user
+from app.core.worker_events import publish_config_change
 
 router = APIRouter()
 
@@ -29,6 +30,7 @@ def get_environment(
         db.add(env)
         db.commit()
         db.refresh(env)
+        publish_config_change("environment")
     return env
 
 
@@ -49,4 +51,5 @@ def update_environment(
 
     db.commit()
     db.refresh(env)
+    publish_config_change("environment")
     return env
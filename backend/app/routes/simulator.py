@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.routes.auth import get_current_active_user
 from app.models import User, Server, UserRole, StressTestLog, ServerBaseline
 from app.core.timezone import now_warsaw
+from app.core.worker_events import publish_config_change, publish_simulator_command, publish_stress_test_update
 from pydantic import BaseModel
+import redis
 
 router = APIRouter()
 
@@ -90,6 +93,7 @@ def set_load_baseline(
 
     db.commit()
     db.refresh(baseline)
+    publish_config_change("baselines")
 
     return {
         "message": f"Load baseline set for {server.name}",
@@ -147,12 +151,89 @@ def trigger_stress_test(
     db.commit()
     db.refresh(stress_log)
 
+    try:
+        publish_simulator_command(
+            "start",
+            test_id=stress_log.id,
+            server_id=server_id,
+            duration_seconds=stress_log.duration_seconds,
+            intensity=stress_log.intensity,
+            started_at=stress_log.started_at.isoformat()
+        )
+    except redis.RedisError as e:
+        print(f"[ERROR] Failed to send stress test {stress_log.id} to the simulator: {e}")
+        stress_log.status = "failed"
+        stress_log.completed_at = now_warsaw()
+        db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Simulator is unavailable"
+        )
+
+    publish_stress_test_update(
+        "started",
+        test_id=stress_log.id,
+        server_id=server_id,
+        started_at=stress_log.started_at.isoformat(),
+        duration_seconds=stress_log.duration_seconds,
+        intensity=stress_log.intensity
+    )
+
     return {
         "message": f"Stress test initiated for {server.name}",
         "test_id": stress_log.id,
         "duration_seconds": request.duration_seconds,
-        "intensity": request.intensity,
-        "note": "Worker will execute stress test on next simulation tick"
+        "intensity": request.intensity
+    }
+
+
+@router.delete("/servers/{server_id}/stress-test", status_code=200)
+def cancel_stress_test(
+    server_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    if current_user.role not in [UserRole.ADMIN, UserRole.OPERATOR]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    # Claim the running test in one conditional UPDATE: a concurrent cancel
+    # or the worker completing it leaves nothing to match, and the row
+    # stays locked until the cancel command is out.
+    test_id = db.execute(
+        update(StressTestLog)
+        .where(StressTestLog.server_id == server_id, StressTestLog.status == "running")
+        .values(status="cancelled", completed_at=now_warsaw())
+        .returning(StressTestLog.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().first()
+
+    if test_id is None:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="No stress test running on this server"
+        )
+
+    try:
+        publish_simulator_command("cancel", test_id=test_id, server_id=server_id)
+    except redis.RedisError as e:
+        db.rollback()
+        print(f"[ERROR] Failed to cancel stress test {test_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Simulator is unavailable"
+        )
+
+    db.commit()
+
+    publish_stress_test_update("cancelled", test_id=test_id, server_id=server_id)
+
+    return {
+        "message": "Stress test cancelled",
+        "test_id": test_id
     }
 
 
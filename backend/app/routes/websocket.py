@@ -1,12 +1,30 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from typing import List
 import json
+import time
 import asyncio
 from app.core.security import decode_access_token
 from app.core.redis_pubsub import redis_pubsub
+from app.core.database import SessionLocal
+from app.core.worker_events import ALERTS_CHANNEL, ALERTS_SEQUENCE_KEY, alert_payload
+from app.models.alert import Alert
 
 router = APIRouter()
 
+KEYFRAME_REQUEST_KEY = "metrics:keyframe_requested"
+ALERTS_SNAPSHOT_SIZE = 50
+
+
+def _unread_alerts() -> list:
+    db = SessionLocal()
+    try:
+        alerts = db.query(Alert).filter(Alert.is_read == False).order_by(
+            Alert.created_at.desc()
+        ).limit(ALERTS_SNAPSHOT_SIZE).all()
+        return [alert_payload(alert) for alert in alerts]
+    finally:
+        db.close()
+
 
 class ConnectionManager:
     def __init__(self):
@@ -20,6 +38,15 @@ class ConnectionManager:
         if len(self.active_connections) == 1 and not self.redis_listener_task:
             await self.start_redis_listener()
 
+        # metrics_update carries deltas; ask the worker for a full frame so
+        # the new client does not wait for the next periodic keyframe.
+        try:
+            await redis_pubsub.set_flag(KEYFRAME_REQUEST_KEY)
+        except Exception as e:
+            print(f"[WebSocket] Failed to request metrics keyframe: {e}")
+
+        await self.send_alerts_snapshot(websocket)
+
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
@@ -31,6 +58,38 @@ class ConnectionManager:
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
+    # alerts_update only broadcasts deltas; a client gets the full unread
+    # list on connect and whenever it reports a sequence gap. The sequence
+    # is read first, so deltas racing the query are re-applied, which is
+    # harmless.
+    async def send_alerts_snapshot(self, websocket: WebSocket):
+        try:
+            sequence = await redis_pubsub.get(ALERTS_SEQUENCE_KEY)
+            alerts = await asyncio.to_thread(_unread_alerts)
+            await websocket.send_text(json.dumps({
+                "type": "alerts_update",
+                "data": {
+                    "kind": "snapshot",
+                    "sequence": int(sequence or 0),
+                    "alerts": alerts,
+                    "timestamp": time.time()
+                }
+            }))
+        except Exception as e:
+            print(f"[WebSocket] Failed to send alerts snapshot: {e}")
+
+    async def broadcast_bytes(self, payload: bytes):
+        disconnected = []
+
+        for connection in self.active_connections:
+            try:
+                await connection.send_bytes(payload)
+            except Exception:
+                disconnected.append(connection)
+
+        for connection in disconnected:
+            self.disconnect(connection)
+
     async def broadcast(self, message: dict):
         message_str = json.dumps(message)
         disconnected = []
@@ -46,7 +105,9 @@ class ConnectionManager:
 
     async def start_redis_listener(self):
         await redis_pubsub.subscribe("metrics_update", self.handle_metrics_update)
-        await redis_pubsub.subscribe("alerts_update", self.handle_alerts_update)
+        await redis_pubsub.subscribe("metrics_update:msgpack", self.broadcast_bytes, raw=True)
+        await redis_pubsub.subscribe(ALERTS_CHANNEL, self.handle_alerts_update)
+        await redis_pubsub.subscribe("stress_test_update", self.handle_stress_test_update)
         self.redis_listener_task = asyncio.create_task(redis_pubsub.listen())
 
     async def handle_metrics_update(self, data: dict):
@@ -61,6 +122,12 @@ class ConnectionManager:
             "data": data
         })
 
+    async def handle_stress_test_update(self, data: dict):
+        await self.broadcast({
+            "type": "stress_test_update",
+            "data": data
+        })
+
 
 manager = ConnectionManager()
 
@@ -81,6 +148,13 @@ async def websocket_endpoint(
         try:
             while True:
                 data = await websocket.receive_text()
+                try:
+                    message = json.loads(data)
+                except ValueError:
+                    continue
+
+                if isinstance(message, dict) and message.get("type") == "alerts_resync":
+                    await manager.send_alerts_snapshot(websocket)
 
         except WebSocketDisconnect:
             manager.disconnect(websocket)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from app.models.alert import AlertLevel
 from app.models.user import UserRole
@@ -24,6 +24,7 @@ class AlertResponse(BaseModel):
     read_at: Optional[datetime] = None
     read_by_email: Optional[str] = None
     created_at: datetime
+    member_count: int = 1
 
     class Config:
         from_attributes = True
@@ -45,3 +46,19 @@ class AlertLogResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class AlertLogPage(BaseModel):
+    items: List[AlertLogResponse]
+    # Opaque; pass back as ?cursor= for the next page. None on the last page.
+    next_cursor: Optional[str] = None
+
+
+# Selects alerts for the bulk endpoints; all given criteria must match.
+class AlertBulkFilter(BaseModel):
+    ids: Optional[List[int]] = None
+    level: Optional[AlertLevel] = None
+    source: Optional[str] = None
+    title: Optional[str] = None
+    is_read: Optional[bool] = None
+    created_before: Optional[datetime] = None
@@ -24,6 +24,9 @@ export const simulatorApi = {
   triggerStressTest: (serverId: number, duration_seconds: number, intensity: number) =>
     api.post(`/api/simulator/servers/${serverId}/stress-test`, { duration_seconds, intensity }),
 
+  cancelStressTest: (serverId: number) =>
+    api.delete(`/api/simulator/servers/${serverId}/stress-test`),
+
   getState: (serverId: number) =>
     api.get(`/api/simulator/servers/${serverId}/state`),
 };
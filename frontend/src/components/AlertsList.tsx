@@ -131,6 +131,11 @@ function AlertsList({ alerts }: AlertsListProps) {
                       {alert.source}
                     </span>
                   )}
+                  {alert.member_count > 1 && (
+                    <span style={{ fontSize: '0.75rem', color: '#64748b' }}>
+                      ×{alert.member_count}
+                    </span>
+                  )}
                 </div>
                 <h3 style={{ fontSize: '0.875rem', fontWeight: '600', marginBottom: '0.25rem' }}>
                   {alert.title}
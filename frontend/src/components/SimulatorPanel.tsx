@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react';
 import { Server, UserRole } from '../types';
 import { simulatorApi } from '../api/simulator';
-import { useQueryClient } from '@tanstack/react-query';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
 import { useServers } from '../hooks/useServers';
 import { useAuthStore } from '../store/authStore';
 
@@ -27,42 +27,41 @@ export default function SimulatorPanel({ server: initialServer, onClose }: Simul
   const [ramBaseline, setRamBaseline] = useState(50);
   const [stressDuration, setStressDuration] = useState(60);
   const [stressIntensity, setStressIntensity] = useState(1.0);
-  const [activeStressTest, setActiveStressTest] = useState<ActiveStressTest | null>(null);
   const [remainingSeconds, setRemainingSeconds] = useState(0);
 
   const { data: servers } = useServers({ refetchInterval: 5000 });
 
   const server = servers?.find(s => s.id === initialServer.id) || initialServer;
 
-  useEffect(() => {
-    const fetchStressTestStatus = async () => {
-      try {
-        const response = await simulatorApi.getState(server.id);
-        const state = response.data;
-        setActiveStressTest(state.active_stress_test);
+  // Refetched when the dashboard WebSocket reports a stress test starting,
+  // completing or being cancelled for this server.
+  const { data: simulatorState } = useQuery({
+    queryKey: ['simulatorState', server.id],
+    queryFn: async () => {
+      const response = await simulatorApi.getState(server.id);
+      return response.data;
+    },
+    refetchOnWindowFocus: false,
+  });
 
-        if (state.baseline) {
-          setCpuBaseline(Math.round(state.baseline.cpu_baseline));
-          setRamBaseline(Math.round(state.baseline.ram_baseline));
-        }
+  const activeStressTest: ActiveStressTest | null = simulatorState?.active_stress_test ?? null;
 
-        if (state.active_stress_test) {
-          const startedAt = new Date(state.active_stress_test.started_at).getTime();
-          const elapsed = (Date.now() - startedAt) / 1000;
-          const remaining = Math.max(0, state.active_stress_test.duration_seconds - elapsed);
-          setRemainingSeconds(Math.ceil(remaining));
-        } else {
-          setRemainingSeconds(0);
-        }
-      } catch (error) {
-        console.error('Failed to fetch stress test status:', error);
-      }
-    };
+  useEffect(() => {
+    if (simulatorState?.baseline) {
+      setCpuBaseline(Math.round(simulatorState.baseline.cpu_baseline));
+      setRamBaseline(Math.round(simulatorState.baseline.ram_baseline));
+    }
+  }, [simulatorState?.baseline?.cpu_baseline, simulatorState?.baseline?.ram_baseline]);
 
-    fetchStressTestStatus();
-    const interval = setInterval(fetchStressTestStatus, 2000);
-    return () => clearInterval(interval);
-  }, [server.id]);
+  useEffect(() => {
+    if (activeStressTest) {
+      const startedAt = new Date(activeStressTest.started_at).getTime();
+      const elapsed = (Date.now() - startedAt) / 1000;
+      setRemainingSeconds(Math.ceil(Math.max(0, activeStressTest.duration_seconds - elapsed)));
+    } else {
+      setRemainingSeconds(0);
+    }
+  }, [activeStressTest?.test_id]);
 
   useEffect(() => {
     if (!activeStressTest || remainingSeconds <= 0) return;
@@ -116,6 +115,7 @@ export default function SimulatorPanel({ server: initialServer, onClose }: Simul
     setIsLoading(true);
     try {
       await simulatorApi.triggerStressTest(server.id, stressDuration, stressIntensity);
+      await queryClient.invalidateQueries({ queryKey: ['simulatorState', server.id] });
       alert(`Stress test started for ${stressDuration}s at ${stressIntensity * 100}% intensity`);
     } catch (error) {
       console.error('Failed to trigger stress test:', error);
@@ -125,6 +125,19 @@ export default function SimulatorPanel({ server: initialServer, onClose }: Simul
     }
   };
 
+  const handleCancelStressTest = async () => {
+    setIsLoading(true);
+    try {
+      await simulatorApi.cancelStressTest(server.id);
+      await queryClient.invalidateQueries({ queryKey: ['simulatorState', server.id] });
+    } catch (error) {
+      console.error('Failed to cancel stress test:', error);
+      alert('Failed to cancel stress test');
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
   return (
     <div style={{
       position: 'fixed',
@@ -317,6 +330,26 @@ export default function SimulatorPanel({ server: initialServer, onClose }: Simul
                 </button>
               );
             })()}
+
+            {activeStressTest && (user?.role === UserRole.ADMIN || user?.role === UserRole.OPERATOR) && (
+              <button
+                onClick={handleCancelStressTest}
+                disabled={isLoading}
+                style={{
+                  width: '100%',
+                  marginTop: '0.5rem',
+                  padding: '0.75rem',
+                  background: '#ef4444',
+                  color: 'white',
+                  borderRadius: '4px',
+                  fontWeight: '500',
+                  opacity: isLoading ? 0.6 : 1,
+                  cursor: isLoading ? 'not-allowed' : 'pointer'
+                }}
+              >
+                Cancel Stress Test
+              </button>
+            )}
           </div>
         </div>
       </div>
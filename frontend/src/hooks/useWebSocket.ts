@@ -1,11 +1,40 @@
 import { useEffect, useRef, useCallback, useState } from 'react';
 import { useQueryClient } from '@tanstack/react-query';
+import { decode } from '@msgpack/msgpack';
+import { Alert, Server } from '../types';
 
 interface WebSocketMessage {
   type: string;
   data: any;
 }
 
+interface AlertsDelta {
+  alerts: Alert[];
+  read_ids: number[];
+  deleted_ids: number[];
+}
+
+// Applies an alerts_update delta to a cached alert list, newest first.
+function applyAlertsDelta(current: Alert[] | undefined, delta: AlertsDelta, unreadOnly: boolean) {
+  if (!current) {
+    return current;
+  }
+  const changed = new Map(delta.alerts.map((alert) => [alert.id, alert]));
+  const read = new Set(delta.read_ids);
+  const deleted = new Set(delta.deleted_ids);
+
+  const kept = current
+    .filter((alert) => !deleted.has(alert.id) && !(unreadOnly && read.has(alert.id)))
+    .map((alert) => {
+      const updated = changed.get(alert.id) ?? alert;
+      changed.delete(alert.id);
+      return read.has(alert.id) ? { ...updated, is_read: true } : updated;
+    });
+  const added = Array.from(changed.values()).filter((alert) => !(unreadOnly && alert.is_read));
+
+  return [...added, ...kept];
+}
+
 interface UseWebSocketOptions {
   onMessage?: (message: WebSocketMessage) => void;
   reconnectInterval?: number;
@@ -23,6 +52,8 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectAttemptsRef = useRef(0);
   const reconnectTimeoutRef = useRef<NodeJS.Timeout>();
+  const metricsSequenceRef = useRef<number | null>(null);
+  const alertsSequenceRef = useRef<number | null>(null);
   const [isConnected, setIsConnected] = useState(false);
   const [lastMessage, setLastMessage] = useState<WebSocketMessage | null>(null);
 
@@ -37,28 +68,80 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
 
     try {
       const ws = new WebSocket(wsUrl);
+      ws.binaryType = 'arraybuffer';
 
       ws.onopen = () => {
         console.log('[WebSocket] Connected');
         setIsConnected(true);
         reconnectAttemptsRef.current = 0;
+        // The server sends an alerts snapshot on connect
+        alertsSequenceRef.current = null;
       };
 
       ws.onmessage = (event) => {
         try {
-          const message: WebSocketMessage = JSON.parse(event.data);
+          const message: WebSocketMessage = typeof event.data === 'string'
+            ? JSON.parse(event.data)
+            : decode(new Uint8Array(event.data)) as WebSocketMessage;
           setLastMessage(message);
 
           if (message.type === 'metrics_update' && message.data) {
-            queryClient.setQueryData(['servers'], message.data.servers);
+            const { kind, sequence, servers } = message.data;
+            const lastSequence = metricsSequenceRef.current;
+
+            if (kind === 'delta') {
+              // A missed frame leaves some servers stale until the next
+              // keyframe; refetch the list instead of waiting for it.
+              if (lastSequence !== null && sequence !== lastSequence + 1) {
+                queryClient.invalidateQueries({ queryKey: ['servers'] });
+              }
+              const changed = new Map<number, Partial<Server>>(
+                servers.map((server: Partial<Server> & { id: number }) => [server.id, server])
+              );
+              queryClient.setQueryData<Server[]>(['servers'], (current) =>
+                current?.map((server) => changed.has(server.id) ? { ...server, ...changed.get(server.id) } : server)
+              );
+            } else {
+              queryClient.setQueryData(['servers'], servers);
+            }
+            metricsSequenceRef.current = sequence ?? null;
+
             if (message.data.environment) {
               queryClient.setQueryData(['environment'], message.data.environment);
             }
           }
 
           if (message.type === 'alerts_update' && message.data) {
-            queryClient.setQueryData(['alerts', true], message.data.alerts);
-            queryClient.setQueryData(['alerts', false], message.data.alerts);
+            const { kind, sequence } = message.data;
+            const lastSequence = alertsSequenceRef.current;
+
+            if (kind === 'snapshot') {
+              queryClient.setQueryData(['alerts', true], message.data.alerts);
+              queryClient.invalidateQueries({ queryKey: ['alerts', false] });
+              queryClient.invalidateQueries({ queryKey: ['alerts', 'all'] });
+              alertsSequenceRef.current = sequence;
+            } else if (lastSequence !== null && sequence > lastSequence) {
+              if (sequence !== lastSequence + 1) {
+                // A delta went missing: ask for the full list again.
+                alertsSequenceRef.current = null;
+                ws.send(JSON.stringify({ type: 'alerts_resync' }));
+              } else {
+                queryClient.setQueryData<Alert[]>(['alerts', true], (current) =>
+                  applyAlertsDelta(current, message.data, true)
+                );
+                queryClient.setQueryData<Alert[]>(['alerts', false], (current) =>
+                  applyAlertsDelta(current, message.data, false)
+                );
+                queryClient.setQueryData<Alert[]>(['alerts', 'all'], (current) =>
+                  applyAlertsDelta(current, message.data, false)
+                );
+                alertsSequenceRef.current = sequence;
+              }
+            }
+          }
+
+          if (message.type === 'stress_test_update' && message.data) {
+            queryClient.invalidateQueries({ queryKey: ['simulatorState', message.data.server_id] });
           }
 
           if (onMessage) {
@@ -24,17 +24,21 @@ export default function AlertSettingsPage() {
     },
   });
 
+  // Cursors of the pages visited so far; the log is keyset-paginated on
+  // the server, so Previous pops back to the cursor that loaded that page.
+  const [logCursors, setLogCursors] = useState<(string | null)[]>([null]);
+  const logsPage = logCursors.length;
+
   const { data: alertLogs } = useQuery({
-    queryKey: ['alert-logs'],
+    queryKey: ['alert-logs', logCursors[logsPage - 1]],
     queryFn: async () => {
-      const response = await alertsApi.getLogs();
+      const response = await alertsApi.getLogs(logCursors[logsPage - 1], LOGS_PER_PAGE);
       return response.data;
     },
   });
 
   const [formData, setFormData] = useState<AlertThreshold | null>(null);
   const [hasChanges, setHasChanges] = useState(false);
-  const [logsPage, setLogsPage] = useState(1);
 
   useEffect(() => {
     if (thresholds && !formData) {
@@ -424,7 +428,7 @@ export default function AlertSettingsPage() {
           Alert History / Logs
         </h2>
 
-        {alertLogs && alertLogs.length > 0 ? (
+        {alertLogs && alertLogs.items.length > 0 ? (
           <>
             <table style={{ width: '100%', borderCollapse: 'collapse', fontSize: '0.875rem', tableLayout: 'fixed' }}>
               <thead>
@@ -438,7 +442,7 @@ export default function AlertSettingsPage() {
                 </tr>
               </thead>
               <tbody>
-                {alertLogs.slice((logsPage - 1) * LOGS_PER_PAGE, logsPage * LOGS_PER_PAGE).map((log: AlertLog) => (
+                {alertLogs.items.map((log: AlertLog) => (
                   <tr key={`${log.id}-${log.deleted_at || ''}`} style={{ borderBottom: '1px solid #e2e8f0' }}>
                     <td style={{ padding: '0.5rem', overflow: 'hidden', textOverflow: 'ellipsis', whiteSpace: 'nowrap' }} title={log.title}>{log.title}</td>
                     <td style={{ padding: '0.5rem' }}>
@@ -470,10 +474,10 @@ export default function AlertSettingsPage() {
               </tbody>
             </table>
 
-            {alertLogs.length > LOGS_PER_PAGE && (
+            {(logsPage > 1 || alertLogs.next_cursor) && (
               <div style={{ display: 'flex', justifyContent: 'center', alignItems: 'center', gap: '1rem', marginTop: '1rem', paddingTop: '1rem', borderTop: '1px solid #e2e8f0' }}>
                 <button
-                  onClick={() => setLogsPage(p => Math.max(1, p - 1))}
+                  onClick={() => setLogCursors(cursors => cursors.slice(0, -1))}
                   disabled={logsPage === 1}
                   style={{
                     padding: '0.5rem 1rem',
@@ -488,17 +492,17 @@ export default function AlertSettingsPage() {
                   Previous
                 </button>
                 <span style={{ color: '#64748b', fontSize: '0.875rem' }}>
-                  Page {logsPage} of {Math.ceil(alertLogs.length / LOGS_PER_PAGE)}
+                  Page {logsPage}
                 </span>
                 <button
-                  onClick={() => setLogsPage(p => Math.min(Math.ceil(alertLogs.length / LOGS_PER_PAGE), p + 1))}
-                  disabled={logsPage >= Math.ceil(alertLogs.length / LOGS_PER_PAGE)}
+                  onClick={() => alertLogs.next_cursor && setLogCursors(cursors => [...cursors, alertLogs.next_cursor])}
+                  disabled={!alertLogs.next_cursor}
                   style={{
                     padding: '0.5rem 1rem',
-                    background: logsPage >= Math.ceil(alertLogs.length / LOGS_PER_PAGE) ? '#e2e8f0' : '#3b82f6',
-                    color: logsPage >= Math.ceil(alertLogs.length / LOGS_PER_PAGE) ? '#94a3b8' : 'white',
+                    background: !alertLogs.next_cursor ? '#e2e8f0' : '#3b82f6',
+                    color: !alertLogs.next_cursor ? '#94a3b8' : 'white',
                     borderRadius: '4px',
-                    cursor: logsPage >= Math.ceil(alertLogs.length / LOGS_PER_PAGE) ? 'not-allowed' : 'pointer',
+                    cursor: !alertLogs.next_cursor ? 'not-allowed' : 'pointer',
                     border: 'none',
                     fontSize: '0.875rem'
                   }}
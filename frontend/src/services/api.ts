@@ -4,7 +4,8 @@ import type {
   Server,
   Environment,
   Alert,
-  AlertLog,
+  AlertLogPage,
+  AlertBulkFilter,
   AlertThreshold,
   ScheduledTask,
   TaskCompletionHistory,
@@ -83,7 +84,10 @@ export const alertsApi = {
   markRead: (id: number) => api.patch<Alert>(`/api/alerts/${id}/read`),
   markAllRead: () => api.post('/api/alerts/mark-all-read'),
   delete: (id: number) => api.delete(`/api/alerts/${id}`),
-  getLogs: () => api.get<AlertLog[]>('/api/alerts/logs/history'),
+  bulkMarkRead: (filter: AlertBulkFilter) => api.post<{ updated: number }>('/api/alerts/bulk/read', filter),
+  bulkDelete: (filter: AlertBulkFilter) => api.post<{ deleted: number }>('/api/alerts/bulk/delete', filter),
+  getLogs: (cursor?: string | null, limit = 100) =>
+    api.get<AlertLogPage>('/api/alerts/logs/history', { params: { cursor: cursor || undefined, limit } }),
 };
 
 // Alert Thresholds API
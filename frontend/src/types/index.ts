@@ -81,6 +81,8 @@ export interface Alert {
   read_at?: string;
   read_by_email?: string;
   created_at: string;
+  // > 1 for a grouped alert covering that many servers
+  member_count: number;
 }
 
 export interface AlertLog {
@@ -98,6 +100,21 @@ export interface AlertLog {
   deleted_by_email?: string;
 }
 
+// All given criteria must match
+export interface AlertBulkFilter {
+  ids?: number[];
+  level?: AlertLevel;
+  source?: string;
+  title?: string;
+  is_read?: boolean;
+  created_before?: string;
+}
+
+export interface AlertLogPage {
+  items: AlertLog[];
+  next_cursor: string | null;
+}
+
 export interface AlertThreshold {
   id: number;
   cpu_warning_threshold: number;
@@ -0,0 +1,6 @@
+from .thresholds import AlertCandidate, evaluate_thresholds
+from .rules import RULE_SPECS, Band, FleetMetrics, RuleSpec, RuleTable, server_fields
+from .tracker import AlertTracker
+
+__all__ = ['AlertCandidate', 'evaluate_thresholds', 'RULE_SPECS', 'Band', 'FleetMetrics', 'RuleSpec',
+           'RuleTable', 'server_fields', 'AlertTracker']
@@ -0,0 +1,236 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .thresholds import AlertCandidate
+from .tracker import AlertTracker
+
+
+@dataclass(frozen=True, slots=True)
+class Band:
+    level: str
+    title: str
+    # None: read from AlertThreshold.<metric>_<level>_threshold
+    threshold: Optional[float] = None
+    message: Optional[str] = None
+
+
+# One metric checked against severity bands, most severe first; the
+# first band that matches wins. 'above' bands match value >= threshold,
+# 'below' bands match floor < value <= threshold. hysteresis, min_duration
+# (seconds) and storm_size only apply when evaluating with an AlertTracker.
+@dataclass(frozen=True, slots=True)
+class RuleSpec:
+    metric: str
+    field: str
+    scope: str
+    bands: Tuple[Band, ...]
+    message: str
+    target_role: Optional[str]
+    direction: str = 'above'
+    floor: float = float('-inf')
+    source: Optional[str] = None
+    dedup_minutes: int = 5
+    hysteresis: float = 0.0
+    min_duration: float = 0.0
+    storm_size: int = 0
+
+
+RULE_SPECS: Tuple[RuleSpec, ...] = (
+    RuleSpec('cpu', 'cpu_usage', 'server',
+             (Band('critical', "Critical CPU Usage"), Band('warning', "High CPU Usage")),
+             "{name} CPU at {value:.1f}%", 'operator',
+             hysteresis=5.0, min_duration=10.0, storm_size=10),
+    RuleSpec('temperature', 'temperature', 'server',
+             (Band('critical', "Critical Temperature"), Band('warning', "High Temperature")),
+             "{name} temperature at {value:.1f}°C", 'technician',
+             hysteresis=2.0, min_duration=10.0, storm_size=10),
+    RuleSpec('ram', 'ram_usage', 'server',
+             (Band('critical', "Critical RAM Usage"), Band('warning', "High RAM Usage")),
+             "{name} RAM at {value:.1f}%", 'operator',
+             hysteresis=5.0, min_duration=10.0, storm_size=10),
+    RuleSpec('humidity', 'humidity', 'environment',
+             (Band('critical', "Critical Humidity"), Band('warning', "High Humidity")),
+             "Room humidity at {value:.1f}%", 'technician', source="Environment",
+             hysteresis=3.0, min_duration=10.0),
+    RuleSpec('ups_on_battery', 'ups_on_battery', 'environment',
+             (Band('info', "Running on Battery", threshold=1.0),),
+             "UPS is running on battery power - AC power lost", None, source="UPS", dedup_minutes=10),
+    RuleSpec('ups_battery', 'ups_battery', 'environment',
+             (Band('critical', "Critical Battery Level", threshold=25.0,
+                   message="UPS battery at {value:.0f}% - immediate action required"),
+              Band('error', "Low Battery Level", threshold=50.0),
+              Band('warning', "Battery Warning", threshold=75.0)),
+             "UPS battery at {value:.0f}%", None, direction='below', floor=0.0, source="UPS",
+             hysteresis=2.0),
+)
+
+
+# Server attributes the rules read, i.e. the columns to load per server.
+def server_fields(specs: Iterable[RuleSpec] = RULE_SPECS) -> List[str]:
+    return list(dict.fromkeys(spec.field for spec in specs if spec.scope == 'server'))
+
+
+# Online servers as parallel arrays, one entry per server.
+@dataclass(slots=True)
+class FleetMetrics:
+    server_ids: np.ndarray
+    names: List[str]
+    values: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.server_ids)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable, fields: Iterable[str]) -> 'FleetMetrics':
+        rows = list(rows)
+        return cls(
+            server_ids=np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows)),
+            names=[row.name for row in rows],
+            values={
+                field: np.fromiter((getattr(row, field) for row in rows), dtype=np.float64, count=len(rows))
+                for field in fields
+            }
+        )
+
+
+# Room rules are evaluated as a single entity with this id
+ENVIRONMENT_ENTITY = np.zeros(1, dtype=np.int64)
+GROUP_SOURCE = "Fleet"
+GROUP_NAMES_SHOWN = 5
+
+
+@dataclass(slots=True)
+class CompiledRule:
+    spec: RuleSpec
+    # (bands,) for environment rules, (bands, servers) for server rules
+    thresholds: np.ndarray
+
+    def _columns(self) -> np.ndarray:
+        return self.thresholds if self.thresholds.ndim == 2 else self.thresholds[:, None]
+
+    # Index of the first matching band per entity, -1 where none matches.
+    def bands(self, values: np.ndarray) -> np.ndarray:
+        thresholds = self._columns()
+        if self.spec.direction == 'above':
+            hits = values[None, :] >= thresholds
+        else:
+            hits = (values[None, :] <= thresholds) & (values[None, :] > self.spec.floor)
+        return np.where(hits.any(axis=0), hits.argmax(axis=0), -1)
+
+    # Whether each entity is still within hysteresis of its band.
+    def held(self, values: np.ndarray, band: np.ndarray) -> np.ndarray:
+        thresholds = np.broadcast_to(self._columns(), (self.thresholds.shape[0], len(values)))
+        threshold = thresholds[np.maximum(band, 0), np.arange(len(values))]
+        if self.spec.direction == 'above':
+            held = values >= threshold - self.spec.hysteresis
+        else:
+            held = (values <= threshold + self.spec.hysteresis) & (values > self.spec.floor)
+        return held & (band >= 0)
+
+
+def _default_threshold(spec: RuleSpec, band: Band, thresholds) -> float:
+    if band.threshold is not None:
+        return band.threshold
+    return float(getattr(thresholds, f"{spec.metric}_{band.level}_threshold"))
+
+
+# The rule specs with concrete thresholds. Server rules get one threshold
+# column per server so per-server overrides cost nothing at evaluation.
+# overrides maps server_id -> metric -> level -> threshold; only the
+# backend's OVERRIDABLE_METRICS take them.
+class RuleTable:
+    def __init__(self, rules: List[CompiledRule], server_ids: np.ndarray):
+        self.rules = rules
+        self.server_ids = server_ids
+
+    @classmethod
+    def compile(
+        cls,
+        thresholds,
+        server_ids: np.ndarray,
+        overrides: Optional[Mapping[int, Mapping[str, Mapping[str, float]]]] = None,
+        specs: Iterable[RuleSpec] = RULE_SPECS
+    ) -> 'RuleTable':
+        from app.core.alert_metrics import OVERRIDABLE_METRICS
+
+        overrides = overrides or {}
+        position = {int(server_id): idx for idx, server_id in enumerate(server_ids.tolist())}
+        rules = []
+
+        for spec in specs:
+            defaults = np.array([_default_threshold(spec, band, thresholds) for band in spec.bands])
+            if spec.scope != 'server':
+                rules.append(CompiledRule(spec, defaults))
+                continue
+
+            matrix = np.repeat(defaults[:, None], len(server_ids), axis=1)
+            overridable = spec.metric in OVERRIDABLE_METRICS
+            for server_id, metrics in overrides.items():
+                idx = position.get(server_id)
+                levels = metrics.get(spec.metric) if overridable else None
+                if idx is None or not levels:
+                    continue
+                for band_idx, band in enumerate(spec.bands):
+                    if levels.get(band.level) is not None:
+                        matrix[band_idx, idx] = levels[band.level]
+            rules.append(CompiledRule(spec, matrix))
+
+        return cls(rules, server_ids)
+
+    @staticmethod
+    def _candidate(spec: RuleSpec, band: Band, name: str, value: float) -> AlertCandidate:
+        return AlertCandidate(
+            title=band.title,
+            message=(band.message or spec.message).format(name=name, value=value),
+            level=band.level,
+            source=spec.source or name,
+            target_role=spec.target_role,
+            dedup_minutes=spec.dedup_minutes
+        )
+
+    @staticmethod
+    def _group_candidate(spec: RuleSpec, band: Band, members: np.ndarray, names: List[str]) -> AlertCandidate:
+        shown = ', '.join(names[idx] for idx in members[:GROUP_NAMES_SHOWN].tolist())
+        more = len(members) - GROUP_NAMES_SHOWN
+        return AlertCandidate(
+            title=band.title,
+            message=f"{len(members)} servers: {shown}" + (f" and {more} more" if more > 0 else ""),
+            level=band.level,
+            source=GROUP_SOURCE,
+            target_role=spec.target_role,
+            dedup_minutes=spec.dedup_minutes,
+            member_count=len(members)
+        )
+
+    # Without a tracker every current match is a candidate; with one, only
+    # the matches the tracker lets through plus grouped storm alerts.
+    def evaluate(self, fleet: FleetMetrics, environment=None,
+                 tracker: Optional[AlertTracker] = None, now: Optional[float] = None) -> List[AlertCandidate]:
+        if not np.array_equal(fleet.server_ids, self.server_ids):
+            raise ValueError("RuleTable was compiled for a different fleet")
+
+        candidates = []
+        for rule in self.rules:
+            spec = rule.spec
+            if spec.scope == 'server':
+                entity_ids, names, values = fleet.server_ids, fleet.names, fleet.values[spec.field]
+            elif environment is not None:
+                entity_ids, names = ENVIRONMENT_ENTITY, [spec.source]
+                values = np.array([float(getattr(environment, spec.field))])
+            else:
+                continue
+
+            if tracker is None:
+                bands = rule.bands(values)
+                fired, groups = np.flatnonzero(bands >= 0), []
+            else:
+                fired, bands, groups = tracker.update(rule, entity_ids, values, now)
+
+            for idx in fired.tolist():
+                candidates.append(self._candidate(spec, spec.bands[bands[idx]], names[idx], float(values[idx])))
+            for band_idx, members in groups:
+                candidates.append(self._group_candidate(spec, spec.bands[band_idx], members, names))
+
+        return candidates
@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+
+@dataclass(slots=True)
+class AlertCandidate:
+    title: str
+    message: str
+    level: str
+    source: str
+    target_role: Optional[str]
+    dedup_minutes: int = 5
+    # > 1 for a grouped alert standing for that many servers
+    member_count: int = 1
+
+
+# Threshold checks for online servers and the room. Works on anything
+# exposing the Server/Environment/AlertThreshold attributes, so it runs
+# without a database; the checks themselves are the rules in rules.py.
+def evaluate_thresholds(servers: Iterable, environment, thresholds) -> List[AlertCandidate]:
+    from .rules import FleetMetrics, RuleTable, server_fields
+
+    fleet = FleetMetrics.from_rows(servers, server_fields())
+    return RuleTable.compile(thresholds, fleet.server_ids).evaluate(fleet, environment)
@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Share of spec.min_duration an evaluation may come early and still count.
+# min_duration is typically one evaluation period, and a run that lands
+# 9.9 s after the previous one must not push the alert out to the run
+# after that.
+DURATION_TOLERANCE = 0.2
+
+
+# Per-rule alert state, one entry per server (or a single entry for room
+# rules), aligned with entity_ids. -1 means no band.
+@dataclass(slots=True)
+class _RuleState:
+    entity_ids: np.ndarray
+    active: np.ndarray
+    pending: np.ndarray
+    since: np.ndarray
+    # per band: whether the band is in storm mode and the member count
+    # last reported in its grouped alert
+    storm: np.ndarray
+    storm_members: np.ndarray
+
+    @classmethod
+    def empty(cls, bands: int) -> '_RuleState':
+        return cls(
+            entity_ids=np.empty(0, dtype=np.int64),
+            active=np.empty(0, dtype=np.int8),
+            pending=np.empty(0, dtype=np.int8),
+            since=np.empty(0, dtype=np.float64),
+            storm=np.zeros(bands, dtype=bool),
+            storm_members=np.zeros(bands, dtype=np.int64)
+        )
+
+    def aligned(self, entity_ids: np.ndarray) -> '_RuleState':
+        if np.array_equal(entity_ids, self.entity_ids):
+            return self
+
+        order = np.argsort(self.entity_ids, kind='stable')
+        known = self.entity_ids[order]
+        pos = np.searchsorted(known, entity_ids)
+        found = pos < len(known)
+        found[found] = known[pos[found]] == entity_ids[found]
+        src = order[pos[found]]
+
+        def take(values, missing):
+            out = np.full(len(entity_ids), missing, dtype=values.dtype)
+            out[found] = values[src]
+            return out
+
+        return _RuleState(
+            entity_ids=entity_ids.copy(),
+            active=take(self.active, -1),
+            pending=take(self.pending, -1),
+            since=take(self.since, 0.0),
+            storm=self.storm,
+            storm_members=self.storm_members
+        )
+
+
+# Turns raw threshold matches into alerts worth writing:
+#   - hysteresis: a firing band stays active until the value falls back
+#     past threshold - spec.hysteresis (threshold + for 'below' rules),
+#     so oscillating around a threshold alerts once;
+#   - minimum duration: a band must match for spec.min_duration seconds
+#     (less DURATION_TOLERANCE) before it fires; escalations to a more
+#     severe band fire again;
+#   - storms: once spec.storm_size servers are active in one band, their
+#     individual alerts are replaced by one grouped alert that is re-sent
+#     as membership grows, until fewer than half that many remain.
+# Keyed by RuleSpec.metric; state round-trips through to_buffers() so it
+# can live in Redis next to the simulator state.
+class AlertTracker:
+    def __init__(self):
+        self._states: Dict[str, _RuleState] = {}
+
+    def update(self, rule, entity_ids: np.ndarray, values: np.ndarray,
+               now: float) -> Tuple[np.ndarray, np.ndarray, List[Tuple[int, np.ndarray]]]:
+        spec = rule.spec
+        state = self._states.get(spec.metric) or _RuleState.empty(len(spec.bands))
+        state = state.aligned(entity_ids)
+
+        raw = rule.bands(values)
+        active = state.active.astype(np.int64)
+        held = rule.held(values, active)
+
+        # A match at least as severe as the active band wins; otherwise the
+        # active band is kept while it is held.
+        target = np.where((raw >= 0) & ((active < 0) | (raw <= active)), raw, np.where(held, active, raw))
+        rising = (target >= 0) & ((active < 0) | (target < active))
+        since = np.where(rising & (state.pending != target), now, state.since)
+        fire = rising & (now - since >= spec.min_duration * (1 - DURATION_TOLERANCE))
+
+        state.active = np.where(rising & ~fire, active, target).astype(np.int8)
+        state.pending = np.where(rising & ~fire, target, -1).astype(np.int8)
+        state.since = since
+
+        groups = []
+        if spec.storm_size:
+            for band_idx in range(len(spec.bands)):
+                members = np.flatnonzero(state.active == band_idx)
+                if state.storm[band_idx] and len(members) < spec.storm_size / 2:
+                    state.storm[band_idx] = False
+                    state.storm_members[band_idx] = 0
+                elif not state.storm[band_idx] and len(members) >= spec.storm_size:
+                    state.storm[band_idx] = True
+
+                if state.storm[band_idx]:
+                    fire &= target != band_idx
+                    if len(members) > state.storm_members[band_idx]:
+                        state.storm_members[band_idx] = len(members)
+                        groups.append((band_idx, members))
+
+        self._states[spec.metric] = state
+        return np.flatnonzero(fire), target, groups
+
+    def to_buffers(self) -> Dict[str, bytes]:
+        buffers = {}
+        for metric, state in self._states.items():
+            buffers.update({
+                f"{metric}.entity_ids": state.entity_ids.tobytes(),
+                f"{metric}.active": state.active.tobytes(),
+                f"{metric}.pending": state.pending.tobytes(),
+                f"{metric}.since": state.since.tobytes(),
+                f"{metric}.storm": state.storm.tobytes(),
+                f"{metric}.storm_members": state.storm_members.tobytes(),
+            })
+        return buffers
+
+    def restore(self, buffers: Dict[str, bytes]):
+        metrics = {name.rsplit('.', 1)[0] for name in buffers if name.endswith('.entity_ids')}
+        self._states = {
+            metric: _RuleState(
+                entity_ids=np.frombuffer(buffers[f"{metric}.entity_ids"], dtype=np.int64).copy(),
+                active=np.frombuffer(buffers[f"{metric}.active"], dtype=np.int8).copy(),
+                pending=np.frombuffer(buffers[f"{metric}.pending"], dtype=np.int8).copy(),
+                since=np.frombuffer(buffers[f"{metric}.since"], dtype=np.float64).copy(),
+                storm=np.frombuffer(buffers[f"{metric}.storm"], dtype=bool).copy(),
+                storm_members=np.frombuffer(buffers[f"{metric}.storm_members"], dtype=np.int64).copy()
+            )
+            for metric in metrics
+        }
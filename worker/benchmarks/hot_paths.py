@@ -0,0 +1,284 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+import numpy as np
+
+# Rule compilation reads the overridable metrics from the backend tree,
+# /backend next to the worker's /app in the image
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'backend'))
+
+from simulator.engine import SimulationEngine
+from simulator.physics import ThermalModel, LoadSimulator
+from simulator.room import step_room
+from simulator.deltas import MetricsDeltaEncoder
+from alerting.thresholds import evaluate_thresholds
+from alerting.rules import FleetMetrics, RuleTable, server_fields
+from core.timezone import TIMEZONE
+
+# Committed reference timings; refresh with --save benchmarks/baseline.json
+# after an intended change. `python -m benchmarks.hot_paths --check`
+# fails on a slowdown past --tolerance. Timings are machine-specific:
+# the file records where it was made, compare on similar hardware.
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+DEFAULT_SIZES = (100, 1_000, 10_000)
+DEFAULT_EVENTS = (0, 100, 1_000)
+START_TIME = TIMEZONE.localize(datetime(2024, 1, 15, 12, 0, 0))
+
+BENCHMARKS: Dict[str, Callable[[int, int], Callable[[], object]]] = {}
+
+
+def benchmark(name: str, uses_events: bool = False):
+    def register(setup):
+        setup.uses_events = uses_events
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class SteppingClock:
+    def __init__(self, start: datetime = START_TIME, step_seconds: float = 5.0):
+        self.now = start
+        self.step = timedelta(seconds=step_seconds)
+
+    def __call__(self) -> datetime:
+        self.now = self.now + self.step
+        return self.now
+
+
+def build_engine(servers: int, events: int) -> SimulationEngine:
+    engine = SimulationEngine(seed=0, clock=SteppingClock())
+    for server_id in range(1, servers + 1):
+        engine.register_server(server_id, is_online=server_id % 10 != 0, current_cpu=40.0,
+                               current_ram=50.0, current_temp=45.0, uptime=3600)
+    for server_id in range(1, min(events, servers) + 1):
+        engine.trigger_stress_test(server_id, duration_seconds=10 ** 7, intensity=1.0)
+    return engine
+
+
+def build_thresholds():
+    return SimpleNamespace(
+        cpu_warning_threshold=85.0, cpu_critical_threshold=95.0,
+        temperature_warning_threshold=70.0, temperature_critical_threshold=80.0,
+        ram_warning_threshold=85.0, ram_critical_threshold=95.0,
+        humidity_warning_threshold=60.0, humidity_critical_threshold=75.0
+    )
+
+
+def build_environment():
+    return SimpleNamespace(
+        room_temperature=24.0, humidity=65.0, ac_status=True, ac_target_temp=20.0,
+        ups_battery=60.0, ups_on_battery=True, power_consumption=0.0
+    )
+
+
+@benchmark('simulate_tick', uses_events=True)
+def bench_simulate_tick(servers: int, events: int):
+    engine = build_engine(servers, events)
+    server_ids = list(engine.fleet.index)
+    return lambda: [engine.simulate_tick(server_id) for server_id in server_ids]
+
+
+@benchmark('simulate_fleet_tick', uses_events=True)
+def bench_simulate_fleet_tick(servers: int, events: int):
+    engine = build_engine(servers, events)
+    return engine.simulate_fleet_tick
+
+
+@benchmark('simulate_fleet_tick_coupled', uses_events=True)
+def bench_simulate_fleet_tick_coupled(servers: int, events: int):
+    engine = build_engine(servers, events)
+    return lambda: engine.simulate_fleet_tick(room_temperature=24.0)
+
+
+@benchmark('fleet_event_processing', uses_events=True)
+def bench_fleet_event_processing(servers: int, events: int):
+    engine = build_engine(servers, events)
+    now = START_TIME + timedelta(seconds=30)
+    return lambda: engine._process_fleet_events(now)
+
+
+@benchmark('thermal_scalar')
+def bench_thermal_scalar(servers: int, events: int):
+    rng = np.random.default_rng(0)
+    current = rng.uniform(25, 80, servers).tolist()
+    target = rng.uniform(25, 80, servers).tolist()
+
+    def run():
+        for c, t in zip(current, target):
+            if c < t:
+                ThermalModel.apply_heating(c, t, 0.15, 5.0)
+            else:
+                ThermalModel.apply_cooling(c, t, 0.05, 5.0)
+    return run
+
+
+@benchmark('thermal_array')
+def bench_thermal_array(servers: int, events: int):
+    rng = np.random.default_rng(0)
+    current = rng.uniform(25, 80, servers)
+    target = rng.uniform(25, 80, servers)
+    heating = np.full(servers, 0.15)
+    cooling = np.full(servers, 0.05)
+    dt = np.full(servers, 5.0)
+    return lambda: ThermalModel.step_temperature_array(current, target, heating, cooling, dt)
+
+
+@benchmark('load_scalar')
+def bench_load_scalar(servers: int, events: int):
+    def run():
+        for _ in range(servers):
+            cpu = LoadSimulator.generate_realistic_cpu(35.0, 15.0, START_TIME)
+            LoadSimulator.generate_realistic_ram(45.0, 10.0, cpu)
+    return run
+
+
+@benchmark('load_array')
+def bench_load_array(servers: int, events: int):
+    rng = np.random.default_rng(0)
+    baseline = np.full(servers, 35.0)
+    variance = np.full(servers, 15.0)
+
+    def run():
+        cpu = LoadSimulator.generate_realistic_cpu_array(baseline, variance, START_TIME, rng)
+        LoadSimulator.generate_realistic_ram_array(baseline, variance, cpu, rng)
+    return run
+
+
+@benchmark('room_step')
+def bench_room_step(servers: int, events: int):
+    rng = np.random.default_rng(0)
+    temperature = rng.uniform(30, 70, servers)
+    cpu = rng.uniform(10, 90, servers)
+    ram = rng.uniform(20, 80, servers)
+    environment = build_environment()
+
+    def run():
+        environment.ups_battery = 60.0
+        step_room(environment, temperature, cpu, ram)
+    return run
+
+
+@benchmark('metrics_delta_encode')
+def bench_metrics_delta_encode(servers: int, events: int):
+    engine = build_engine(servers, events)
+    encoder = MetricsDeltaEncoder(keyframe_interval=10 ** 9)
+    encoder.encode(engine.simulate_fleet_tick())
+    snapshot = engine.simulate_fleet_tick()
+    return lambda: encoder.encode(snapshot)
+
+
+@benchmark('alert_thresholds')
+def bench_alert_thresholds(servers: int, events: int):
+    rng = np.random.default_rng(0)
+    fleet = [
+        SimpleNamespace(id=i, name=f"Server-{i}", cpu_usage=float(cpu), ram_usage=float(ram), temperature=float(temp))
+        for i, (cpu, ram, temp) in enumerate(zip(rng.uniform(10, 100, servers),
+                                                 rng.uniform(20, 100, servers),
+                                                 rng.uniform(30, 90, servers)))
+    ]
+    environment = build_environment()
+    thresholds = build_thresholds()
+    return lambda: evaluate_thresholds(fleet, environment, thresholds)
+
+
+@benchmark('alert_rules')
+def bench_alert_rules(servers: int, events: int):
+    engine = build_engine(servers, events)
+    snapshot = engine.simulate_fleet_tick()
+    fleet = FleetMetrics(
+        server_ids=snapshot.server_ids,
+        names=[f"Server-{i}" for i in snapshot.server_ids.tolist()],
+        values={field: getattr(snapshot, field) for field in server_fields()}
+    )
+    overrides = {int(server_id): {'cpu': {'warning': 50.0}} for server_id in snapshot.server_ids[::10].tolist()}
+    environment = build_environment()
+    thresholds = build_thresholds()
+    return lambda: RuleTable.compile(thresholds, fleet.server_ids, overrides).evaluate(fleet, environment)
+
+
+def measure(fn: Callable[[], object], repeat: int, min_time: float) -> float:
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    while elapsed < min_time:
+        number *= 2
+        elapsed = timer.timeit(number)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(names: List[str], sizes: List[int], event_counts: List[int], repeat: int = 5, min_time: float = 0.2) -> List[dict]:
+    results = []
+    for name in names:
+        setup = BENCHMARKS[name]
+        for servers in sizes:
+            for events in (event_counts if setup.uses_events else [0]):
+                if events > servers:
+                    continue
+                seconds = measure(setup(servers, events), repeat, min_time)
+                results.append({'name': name, 'servers': servers, 'events': events, 'seconds': seconds})
+                print(f"{name:<30} servers={servers:<7} events={events:<6} {seconds * 1e3:10.3f} ms", file=sys.stderr)
+    return results
+
+
+# Slowdowns under min_delta seconds are timer noise, whatever the ratio.
+def compare(results: List[dict], baseline: List[dict], tolerance: float, min_delta: float = 1e-4) -> List[str]:
+    previous = {(r['name'], r['servers'], r['events']): r['seconds'] for r in baseline}
+    regressions = []
+    for result in results:
+        key = (result['name'], result['servers'], result['events'])
+        if (key in previous and result['seconds'] > previous[key] * (1 + tolerance)
+                and result['seconds'] - previous[key] > min_delta):
+            regressions.append(
+                f"{key[0]} servers={key[1]} events={key[2]}: "
+                f"{previous[key] * 1e3:.3f} ms -> {result['seconds'] * 1e3:.3f} ms"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the simulator and worker hot paths")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=sorted(BENCHMARKS))
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--events', type=int, nargs='+', default=list(DEFAULT_EVENTS))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', type=str, default=None, help="write results as a JSON baseline")
+    parser.add_argument('--compare', type=str, default=None, help="fail when slower than this JSON baseline")
+    parser.add_argument('--check', action='store_true', help="compare against the committed baseline")
+    parser.add_argument('--min-delta', type=float, default=1e-4, help="ignore slowdowns below this many seconds")
+    parser.add_argument('--tolerance', type=float, default=0.5, help="allowed slowdown vs baseline (0.5 = 50%%)")
+    args = parser.parse_args()
+    if args.check:
+        args.compare = args.compare or BASELINE_PATH
+
+    results = run(args.only, args.sizes, args.events, args.repeat)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'generated_at': datetime.utcnow().isoformat(),
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'numpy': np.__version__,
+                'results': results,
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f)['results'], args.tolerance, args.min_delta)
+        if regressions:
+            print("[BENCH] Regressions against baseline:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print("[BENCH] No regressions against baseline", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
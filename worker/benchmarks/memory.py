@@ -0,0 +1,127 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from simulator.engine import SimulationEngine
+from simulator.models import ServerState, MetricsSnapshot
+from core.timezone import now_warsaw
+
+# Committed reference; refresh with --json benchmarks/memory_baseline.json.
+# `python -m benchmarks.memory --check` fails when any structure grows
+# past --tolerance bytes per server.
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'memory_baseline.json')
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def traced_bytes(build: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        keep = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del keep
+    return size
+
+
+def build_state_dict(count: int) -> Dict[int, ServerState]:
+    now = now_warsaw()
+    return {
+        server_id: ServerState(server_id=server_id, is_online=True, last_update=now.replace(microsecond=server_id % 1_000_000))
+        for server_id in range(count)
+    }
+
+
+def build_engine(count: int) -> SimulationEngine:
+    engine = SimulationEngine(seed=0)
+    for server_id in range(count):
+        engine.register_server(server_id, is_online=True)
+    engine.fleet.shrink_to_fit()
+    return engine
+
+
+def build_snapshot_list(count: int) -> List[MetricsSnapshot]:
+    now = now_warsaw()
+    return [
+        MetricsSnapshot(server_id=server_id, timestamp=now, cpu_usage=float(server_id), ram_usage=1.0,
+                        temperature=22.0, uptime=server_id, status='online')
+        for server_id in range(count)
+    ]
+
+
+def build_fleet_snapshot(engine: SimulationEngine):
+    return lambda: engine.simulate_fleet_tick()
+
+
+def run(sizes=DEFAULT_SIZES) -> List[dict]:
+    results = []
+    for count in sizes:
+        engine = build_engine(count)
+        row = {
+            'servers': count,
+            'server_state_objects': traced_bytes(lambda: build_state_dict(count)) / count,
+            'fleet_state_arrays': traced_bytes(lambda: build_engine(count)) / count,
+            'metrics_snapshot_objects': traced_bytes(lambda: build_snapshot_list(count)) / count,
+            'fleet_snapshot_arrays': traced_bytes(build_fleet_snapshot(engine)) / count,
+        }
+        results.append(row)
+    return results
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float) -> List[str]:
+    previous = {row['servers']: row for row in baseline}
+    regressions = []
+    for row in results:
+        reference = previous.get(row['servers'])
+        if not reference:
+            continue
+        for column, value in row.items():
+            if column != 'servers' and column in reference and value > reference[column] * (1 + tolerance):
+                regressions.append(
+                    f"{column} servers={row['servers']}: {reference[column]:.1f} -> {value:.1f} bytes/server"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report simulator memory per server")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--json', type=str, default=None, help="also write results to this file")
+    parser.add_argument('--compare', type=str, default=None, help="fail when larger than this JSON baseline")
+    parser.add_argument('--check', action='store_true', help="compare against the committed baseline")
+    parser.add_argument('--tolerance', type=float, default=0.10, help="allowed growth vs baseline (0.10 = 10%%)")
+    args = parser.parse_args()
+    if args.check:
+        args.compare = args.compare or BASELINE_PATH
+
+    results = run(args.sizes)
+
+    columns = list(results[0].keys())
+    print(' '.join(f"{c:>24}" for c in columns))
+    for row in results:
+        print(' '.join(f"{row[c]:>24.1f}" if isinstance(row[c], float) else f"{row[c]:>24}" for c in columns))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'generated_at': datetime.utcnow().isoformat(), 'bytes_per_server': results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f)['bytes_per_server'], args.tolerance)
+        if regressions:
+            print("[BENCH] Memory regressions against baseline:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print("[BENCH] No memory regressions against baseline", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
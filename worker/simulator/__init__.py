@@ -1,4 +1,16 @@
 from .engine import SimulationEngine
 from .models import ServerState, MetricsSnapshot
+from .fleet import FleetState, FleetSnapshot
+from .store import RedisStateStore
+from .replay import Recording, RecordingEngine
 
-__all__ = ['SimulationEngine', 'ServerState', 'MetricsSnapshot']
+__all__ = [
+    'SimulationEngine',
+    'ServerState',
+    'MetricsSnapshot',
+    'FleetState',
+    'FleetSnapshot',
+    'RedisStateStore',
+    'Recording',
+    'RecordingEngine',
+]
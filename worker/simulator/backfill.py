@@ -0,0 +1,156 @@
+import argparse
+import io
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from .engine import SimulationEngine
+from .fleet import FleetSnapshot
+from .persistence import HISTORY_COLUMNS, COPY_HISTORY_SQL, snapshot_to_csv
+from core.timezone import TIMEZONE, now_warsaw
+
+
+# Runs the engine over simulated time as fast as the CPU allows. Each
+# yielded snapshot is one tick; time only moves by interval_seconds.
+def run_backfill(
+    engine: SimulationEngine,
+    start: datetime,
+    hours: float,
+    interval_seconds: float = 5.0
+) -> Iterator[FleetSnapshot]:
+    start_ts = start.timestamp()
+    engine.fleet.last_update[:] = start_ts
+    steps = int(hours * 3600 / interval_seconds)
+
+    for step in range(1, steps + 1):
+        # fromtimestamp keeps the Warsaw offset correct across DST changes
+        now = datetime.fromtimestamp(start_ts + step * interval_seconds, TIMEZONE)
+        yield engine.simulate_fleet_tick(now=now)
+
+
+def write_csv(snapshots: Iterator[FleetSnapshot], output: TextIO, header: bool = True) -> int:
+    if header:
+        output.write(','.join(HISTORY_COLUMNS) + '\n')
+
+    rows = 0
+    for snapshot in snapshots:
+        output.write(snapshot_to_csv(snapshot))
+        rows += len(snapshot)
+    return rows
+
+
+def copy_to_database(snapshots: Iterator[FleetSnapshot], db_engine, batch_rows: int = 200_000) -> int:
+    connection = db_engine.raw_connection()
+    rows = 0
+
+    try:
+        cursor = connection.cursor()
+        buffer = io.StringIO()
+        buffered = 0
+
+        for snapshot in snapshots:
+            buffer.write(snapshot_to_csv(snapshot))
+            buffered += len(snapshot)
+
+            if buffered >= batch_rows:
+                buffer.seek(0)
+                cursor.copy_expert(COPY_HISTORY_SQL, buffer)
+                rows += buffered
+                buffer = io.StringIO()
+                buffered = 0
+
+        if buffered:
+            buffer.seek(0)
+            cursor.copy_expert(COPY_HISTORY_SQL, buffer)
+            rows += buffered
+
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+    return rows
+
+
+# (id, is_online) pairs; status is stored as the ServerStatus name.
+def load_servers(db_engine, limit: Optional[int] = None, from_id: Optional[int] = None) -> List[Tuple[int, bool]]:
+    from sqlalchemy import text
+
+    query = "SELECT id, status = 'ONLINE' FROM servers"
+    if from_id:
+        query += f" WHERE id >= {int(from_id)}"
+    query += " ORDER BY id"
+    if limit:
+        query += f" LIMIT {int(limit)}"
+
+    with db_engine.connect() as connection:
+        return [(server_id, bool(online)) for server_id, online in connection.execute(text(query))]
+
+
+# Per-server load baselines as the live simulator applies them, so the
+# history leads into what the worker produces for the same servers.
+def load_baselines(db_engine) -> Dict[int, Tuple[float, float]]:
+    from sqlalchemy import text
+
+    with db_engine.connect() as connection:
+        rows = connection.execute(text("SELECT server_id, cpu_baseline, ram_baseline FROM server_baselines"))
+        return {server_id: (cpu, ram) for server_id, cpu, ram in rows}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Fast-forward the simulator and backfill server_metrics_history")
+    parser.add_argument('--hours', type=float, default=168.0, help="simulated hours to generate")
+    parser.add_argument('--servers', type=int, default=None, help="number of servers (default: all servers in the DB, or 12 for --output)")
+    parser.add_argument('--from-id', type=int, default=None, help="only servers with this id or above (e.g. a freshly generated fleet)")
+    parser.add_argument('--interval', type=float, default=5.0, help="simulated seconds between ticks")
+    parser.add_argument('--end', type=str, default=None, help="ISO timestamp of the last tick (default: now)")
+    parser.add_argument('--seed', type=int, default=None, help="seed for a reproducible run")
+    parser.add_argument('--output', type=str, default=None, help="write CSV to this path ('-' for stdout) instead of the database")
+    args = parser.parse_args(argv)
+
+    end = datetime.fromisoformat(args.end) if args.end else now_warsaw()
+    if end.tzinfo is None:
+        end = TIMEZONE.localize(end)
+    start = end - timedelta(hours=args.hours)
+
+    db_engine = None
+    baselines = {}
+    if args.output:
+        servers = [(server_id, True) for server_id in range(1, (args.servers or 12) + 1)]
+    else:
+        from sqlalchemy import create_engine
+
+        database_url = os.getenv('DATABASE_URL')
+        if not database_url:
+            parser.error("DATABASE_URL is not set; use --output to write a file instead")
+        db_engine = create_engine(database_url)
+        servers = load_servers(db_engine, args.servers, args.from_id)
+        baselines = load_baselines(db_engine)
+
+    engine = SimulationEngine(seed=args.seed)
+    for server_id, is_online in servers:
+        engine.register_server(server_id, is_online=is_online, current_temp=35.0)
+        if server_id in baselines:
+            engine.set_load_baseline(server_id, *baselines[server_id])
+
+    started = time.perf_counter()
+    snapshots = run_backfill(engine, start, args.hours, args.interval)
+
+    if args.output == '-':
+        rows = write_csv(snapshots, sys.stdout)
+    elif args.output:
+        with open(args.output, 'w') as output:
+            rows = write_csv(snapshots, output)
+    else:
+        rows = copy_to_database(snapshots, db_engine)
+
+    elapsed = time.perf_counter() - started
+    print(f"[BACKFILL] Wrote {rows} rows for {len(servers)} servers over {args.hours}h in {elapsed:.1f}s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
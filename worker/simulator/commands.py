@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from .engine import SimulationEngine
+
+COMMAND_STREAM = 'simulator:commands'
+
+
+# Stress-test start/cancel commands published by the API on a Redis
+# stream. Entries are read after the last applied stream id, which the
+# caller saves alongside the simulator checkpoint so whichever process
+# runs the next tick resumes from the same position. The client must be
+# created with decode_responses=True.
+def read_commands(redis_client, cursor: str, count: int = 1000) -> Tuple[List[dict], str]:
+    entries = redis_client.xrange(COMMAND_STREAM, min=f'({cursor}', count=count)
+    if not entries:
+        return [], cursor
+    return [fields for _, fields in entries], entries[-1][0]
+
+
+def latest_command_id(redis_client) -> str:
+    entries = redis_client.xrevrange(COMMAND_STREAM, count=1)
+    return entries[0][0] if entries else '0-0'
+
+
+def apply_command(engine: SimulationEngine, command: dict) -> Optional[str]:
+    action = command.get('action')
+    server_id = int(command['server_id'])
+    test_id = int(command['test_id']) if command.get('test_id') else None
+
+    if action == 'start':
+        if engine.has_active_stress_test(server_id):
+            return None
+        engine.trigger_stress_test(
+            server_id,
+            int(command['duration_seconds']),
+            float(command.get('intensity', 1.0)),
+            test_id=test_id,
+            start_time=datetime.fromisoformat(command['started_at']) if command.get('started_at') else None
+        )
+        return f"Activated test {test_id} for server {server_id}"
+
+    if action == 'cancel':
+        if engine.cancel_stress_test(server_id, test_id):
+            return f"Cancelled test {test_id} for server {server_id}"
+        return None
+
+    print(f"[WARN] Ignoring unknown simulator command: {command}")
+    return None
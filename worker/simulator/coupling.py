@@ -0,0 +1,79 @@
+from typing import Tuple
+
+import numpy as np
+
+SERVERS_PER_RACK = 20
+DEFAULT_AMBIENT = 22.0
+
+
+def default_position(server_id: int) -> Tuple[int, int]:
+    # Servers fill racks bottom-up in id order until placed explicitly.
+    return (server_id - 1) // SERVERS_PER_RACK, (server_id - 1) % SERVERS_PER_RACK
+
+
+# Heat exchange between servers in the same rack. Each server's inlet
+# temperature is the room temperature plus a weighted share of its
+# neighbours' excess heat: the unit directly below (hot air rises), the
+# unit directly above, and the rack average (recirculation behind the
+# rack). The neighbour term is a sparse matrix-vector product kept in
+# COO form and evaluated with np.bincount, so a tick is O(servers).
+class RackThermalCoupling:
+    def __init__(self, rise_weight: float = 0.08, sink_weight: float = 0.02, rack_weight: float = 0.05):
+        self.rise_weight = rise_weight
+        self.sink_weight = sink_weight
+        self.rack_weight = rack_weight
+
+        self._dirty = True
+        self._size = 0
+        self._rows = np.empty(0, dtype=np.int64)
+        self._cols = np.empty(0, dtype=np.int64)
+        self._weights = np.empty(0, dtype=np.float64)
+        self._rack_index = np.empty(0, dtype=np.int64)
+        self._rack_counts = np.empty(0, dtype=np.float64)
+
+    def invalidate(self):
+        self._dirty = True
+
+    def build(self, rack: np.ndarray, slot: np.ndarray):
+        size = len(rack)
+        order = np.lexsort((slot, rack))
+        lower, upper = order[:-1], order[1:]
+        same_rack = rack[lower] == rack[upper]
+        lower, upper = lower[same_rack], upper[same_rack]
+
+        # (row <- col): the upper unit takes heat from the one below it and
+        # the lower unit a smaller share from the one above it.
+        self._rows = np.concatenate((upper, lower))
+        self._cols = np.concatenate((lower, upper))
+        self._weights = np.concatenate((
+            np.full(len(upper), self.rise_weight),
+            np.full(len(lower), self.sink_weight)
+        ))
+
+        _, self._rack_index = np.unique(rack, return_inverse=True)
+        self._rack_counts = np.bincount(self._rack_index).astype(np.float64)
+        self._size = size
+        self._dirty = False
+
+    def inlet_temperature(
+        self,
+        temperature: np.ndarray,
+        rack: np.ndarray,
+        slot: np.ndarray,
+        room_temperature: float
+    ) -> np.ndarray:
+        if self._dirty or self._size != len(temperature):
+            self.build(rack, slot)
+
+        if len(temperature) == 0:
+            return np.empty(0, dtype=np.float64)
+
+        excess = np.maximum(temperature - room_temperature, 0.0)
+        neighbour_heat = np.bincount(
+            self._rows,
+            weights=self._weights * excess[self._cols],
+            minlength=self._size
+        )
+        rack_mean = np.bincount(self._rack_index, weights=excess) / self._rack_counts
+
+        return room_temperature + neighbour_heat + self.rack_weight * rack_mean[self._rack_index]
@@ -0,0 +1,95 @@
+import json
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from .fleet import FleetSnapshot
+
+
+@dataclass(slots=True)
+class MetricsFrame:
+    sequence: int
+    keyframe: bool
+    indices: np.ndarray
+    environment: Optional[dict]
+
+
+# Decides what each metrics_update carries. The encoder remembers the
+# values clients were last sent; a delta frame holds only the servers
+# whose status flipped, whose cpu/ram/temperature moved by more than
+# epsilon, or whose uptime drifted by more than uptime_epsilon seconds.
+# A keyframe holds the whole fleet and is sent every keyframe_interval
+# frames, whenever the set of servers changes, and on request.
+class MetricsDeltaEncoder:
+    def __init__(self, epsilon: float = 0.5, uptime_epsilon: int = 60, keyframe_interval: int = 12):
+        self.epsilon = epsilon
+        self.uptime_epsilon = uptime_epsilon
+        self.keyframe_interval = keyframe_interval
+
+        self.sequence = 0
+        self._since_keyframe = 0
+        self._server_ids = np.empty(0, dtype=np.int64)
+        self._metrics = np.empty((0, 3), dtype=np.float64)
+        self._uptime = np.empty(0, dtype=np.int64)
+        self._online = np.empty(0, dtype=bool)
+        self._environment: Optional[dict] = None
+
+    def encode(self, snapshot: FleetSnapshot, environment: Optional[dict] = None,
+               force_keyframe: bool = False) -> MetricsFrame:
+        metrics = np.column_stack((snapshot.cpu_usage, snapshot.ram_usage, snapshot.temperature))
+        keyframe = (
+            force_keyframe
+            or self._since_keyframe + 1 >= self.keyframe_interval
+            or not np.array_equal(snapshot.server_ids, self._server_ids)
+        )
+
+        if keyframe:
+            indices = np.arange(len(snapshot), dtype=np.int64)
+            self._server_ids = snapshot.server_ids.copy()
+            self._metrics = metrics
+            self._uptime = snapshot.uptime.copy()
+            self._online = snapshot.is_online.copy()
+            self._since_keyframe = 0
+        else:
+            changed = (
+                (snapshot.is_online != self._online)
+                | (np.abs(metrics - self._metrics) > self.epsilon).any(axis=1)
+                | (np.abs(snapshot.uptime - self._uptime) > self.uptime_epsilon)
+            )
+            indices = np.flatnonzero(changed)
+            self._metrics[indices] = metrics[indices]
+            self._uptime[indices] = snapshot.uptime[indices]
+            self._online[indices] = snapshot.is_online[indices]
+            self._since_keyframe += 1
+
+        if not keyframe and environment == self._environment:
+            environment_out = None
+        else:
+            environment_out = environment
+            self._environment = environment
+
+        self.sequence += 1
+        return MetricsFrame(sequence=self.sequence, keyframe=keyframe, indices=indices, environment=environment_out)
+
+    def to_buffers(self) -> Dict[str, bytes]:
+        return {
+            'sequence': str(self.sequence).encode(),
+            'since_keyframe': str(self._since_keyframe).encode(),
+            'server_ids': self._server_ids.tobytes(),
+            'metrics': self._metrics.tobytes(),
+            'uptime': self._uptime.tobytes(),
+            'online': self._online.tobytes(),
+            'environment': json.dumps(self._environment).encode(),
+        }
+
+    def restore(self, buffers: Dict[str, bytes]):
+        if 'server_ids' not in buffers:
+            return
+        self.sequence = int(buffers['sequence'])
+        self._since_keyframe = int(buffers['since_keyframe'])
+        self._server_ids = np.frombuffer(buffers['server_ids'], dtype=np.int64).copy()
+        self._metrics = np.frombuffer(buffers['metrics'], dtype=np.float64).reshape(-1, 3).copy()
+        self._uptime = np.frombuffer(buffers['uptime'], dtype=np.int64).copy()
+        self._online = np.frombuffer(buffers['online'], dtype=bool).copy()
+        self._environment = json.loads(buffers['environment'])
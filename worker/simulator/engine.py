@@ -1,15 +1,38 @@
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from .models import ServerState, MetricsSnapshot, SimulationEvent
+from .fleet import FleetState, FleetSnapshot
+from .events import EventScheduler
+from .coupling import RackThermalCoupling, default_position
 from .physics import ThermalModel, LoadSimulator
 from core.timezone import now_warsaw
+import numpy as np
 import random
+import json
+import time
 
 
 class SimulationEngine:
-    def __init__(self):
-        self.server_states: Dict[int, ServerState] = {}
-        self.pending_events: List[SimulationEvent] = []
+    def __init__(self, seed: Optional[int] = None, clock: Callable[[], datetime] = now_warsaw):
+        self.fleet = FleetState()
+        self.events = EventScheduler()
+        self.coupling = RackThermalCoupling()
+        self.finished_events: List[SimulationEvent] = []
+        self.clock = clock
+        self.seed_streams(seed)
+
+    def seed_streams(self, seed: Optional[int] = None):
+        # Independent streams so e.g. an extra stress test does not shift
+        # the load noise of every other server. An unseeded engine keeps
+        # its generated entropy in self.seed so the run can be reproduced.
+        sequence = np.random.SeedSequence(seed)
+        self.seed = sequence.entropy
+        load_seq, scalar_seq, baseline_seq, event_seq = sequence.spawn(4)
+
+        self.rng = np.random.default_rng(load_seq)
+        self.load_random = random.Random(int(scalar_seq.generate_state(1)[0]))
+        self.baseline_random = random.Random(int(baseline_seq.generate_state(1)[0]))
+        self.event_random = random.Random(int(event_seq.generate_state(1)[0]))
 
     def register_server(
         self,
@@ -20,6 +43,7 @@ class SimulationEngine:
         current_temp: float = 22.0,
         uptime: int = 0
     ) -> ServerState:
+        rack, slot = default_position(server_id)
         state = ServerState(
             server_id=server_id,
             is_online=is_online,
@@ -27,38 +51,70 @@ class SimulationEngine:
             ram_current=current_ram,
             temperature_current=current_temp,
             uptime_seconds=uptime,
-            last_update=now_warsaw()
+            rack=rack,
+            slot=slot,
+            last_update=self.clock()
         )
 
         if is_online:
-            state.cpu_baseline = 25.0 + random.uniform(0, 20)
-            state.ram_baseline = 35.0 + random.uniform(0, 15)
+            state.cpu_baseline = 25.0 + self.baseline_random.uniform(0, 20)
+            state.ram_baseline = 35.0 + self.baseline_random.uniform(0, 15)
 
-        self.server_states[server_id] = state
+        self.fleet.put_state(state)
+        self.coupling.invalidate()
         return state
 
+    def has_server(self, server_id: int) -> bool:
+        return server_id in self.fleet
+
+    def remove_server(self, server_id: int) -> bool:
+        self.events.evict_server(server_id)
+        self.coupling.invalidate()
+        return self.fleet.remove(server_id)
+
+    def set_server_position(self, server_id: int, rack: int, slot: int):
+        if server_id in self.fleet:
+            idx = self.fleet.index[server_id]
+            self.fleet.rack[idx] = rack
+            self.fleet.slot[idx] = slot
+            self.coupling.invalidate()
+
+    def prune_servers(self, active_server_ids: Iterable[int]) -> int:
+        if not isinstance(active_server_ids, np.ndarray):
+            active_server_ids = np.fromiter(active_server_ids, dtype=np.int64)
+        fleet_ids = self.fleet.server_id
+        stale = fleet_ids[~np.isin(fleet_ids, active_server_ids)].tolist()
+        for server_id in stale:
+            self.remove_server(server_id)
+        return len(stale)
+
+    def has_active_stress_test(self, server_id: int) -> bool:
+        return self.events.has_active(server_id, 'stress_test')
+
     def simulate_tick(self, server_id: int, interval_seconds: int = 10) -> MetricsSnapshot:
-        if server_id not in self.server_states:
+        if server_id not in self.fleet:
             raise ValueError(f"Server {server_id} not registered")
 
-        state = self.server_states[server_id]
-        now = now_warsaw()
+        state = self.fleet.get_state(server_id)
+        now = self.clock()
         time_delta = (now - state.last_update).total_seconds()
 
         if state.is_online:
             state.cpu_current = LoadSimulator.generate_realistic_cpu(
                 state.cpu_baseline,
                 state.cpu_variance,
-                now
+                now,
+                self.load_random
             )
 
             state.ram_current = LoadSimulator.generate_realistic_ram(
                 state.ram_baseline,
                 state.ram_variance,
-                state.cpu_current
+                state.cpu_current,
+                self.load_random
             )
 
-        self._process_pending_events(server_id, now)
+        self._process_pending_events(state, now)
 
         if state.is_online:
 
@@ -98,6 +154,7 @@ class SimulationEngine:
             state.uptime_seconds = 0
 
         state.last_update = now
+        self.fleet.put_state(state)
 
         return MetricsSnapshot(
             server_id=server_id,
@@ -109,30 +166,124 @@ class SimulationEngine:
             status='online' if state.is_online else 'offline'
         )
 
+    def simulate_fleet_tick(
+        self,
+        now: Optional[datetime] = None,
+        room_temperature: Optional[float] = None
+    ) -> FleetSnapshot:
+        fleet = self.fleet
+        now = now or self.clock()
+        time_delta = now.timestamp() - fleet.last_update
+        online = fleet.is_online
+
+        cpu = LoadSimulator.generate_realistic_cpu_array(fleet.cpu_baseline, fleet.cpu_variance, now, self.rng)
+        ram = LoadSimulator.generate_realistic_ram_array(fleet.ram_baseline, fleet.ram_variance, cpu, self.rng)
+        fleet.cpu_current[:] = np.where(online, cpu, fleet.cpu_current)
+        fleet.ram_current[:] = np.where(online, ram, fleet.ram_current)
+
+        self._process_fleet_events(now)
+
+        if room_temperature is None:
+            inlet_temp = 22.0
+        else:
+            inlet_temp = self.coupling.inlet_temperature(
+                fleet.temperature_current,
+                fleet.rack,
+                fleet.slot,
+                room_temperature
+            )
+
+        target_temp = ThermalModel.calculate_target_temperature(
+            np.where(online, fleet.cpu_current, 0.0),
+            fleet.temperature_idle,
+            np.where(online, fleet.temperature_max, fleet.temperature_idle),
+            inlet_temp
+        )
+        fleet.temperature_current[:] = ThermalModel.step_temperature_array(
+            fleet.temperature_current,
+            target_temp,
+            np.where(online, fleet.heating_rate, 0.0),
+            fleet.cooling_rate,
+            time_delta
+        )
+
+        fleet.cpu_current[~online] = 0.0
+        fleet.ram_current[~online] = 0.0
+        fleet.uptime_seconds[:] = np.where(online, fleet.uptime_seconds + time_delta.astype(np.int64), 0)
+        fleet.last_update[:] = now.timestamp()
+
+        return FleetSnapshot(
+            timestamp=now,
+            server_ids=fleet.server_id.copy(),
+            cpu_usage=fleet.cpu_current.copy(),
+            ram_usage=fleet.ram_current.copy(),
+            temperature=fleet.temperature_current.copy(),
+            uptime=fleet.uptime_seconds.copy(),
+            is_online=online.copy()
+        )
+
     def set_server_status(self, server_id: int, online: bool):
-        if server_id in self.server_states:
-            state = self.server_states[server_id]
-            was_offline = not state.is_online
-            state.is_online = online
+        if server_id in self.fleet:
+            idx = self.fleet.index[server_id]
+            was_offline = not self.fleet.is_online[idx]
+            self.fleet.is_online[idx] = online
 
             if online and was_offline:
-                state.cpu_baseline = 25.0 + random.uniform(0, 20)
-                state.ram_baseline = 35.0 + random.uniform(0, 15)
-                state.uptime_seconds = 0
+                self.fleet.cpu_baseline[idx] = 25.0 + self.baseline_random.uniform(0, 20)
+                self.fleet.ram_baseline[idx] = 35.0 + self.baseline_random.uniform(0, 15)
+                self.fleet.uptime_seconds[idx] = 0
             elif not online:
-                state.uptime_seconds = 0
+                self.fleet.uptime_seconds[idx] = 0
+
+    # Fleet rows of server_ids, -1 for servers the engine does not know.
+    def _rows(self, server_ids: np.ndarray) -> np.ndarray:
+        known = self.fleet.server_id
+        if not len(known):
+            return np.full(len(server_ids), -1, dtype=np.int64)
+        order = np.argsort(known, kind='stable')
+        rows = order[np.minimum(np.searchsorted(known[order], server_ids), len(known) - 1)]
+        return np.where(known[rows] == server_ids, rows, -1)
+
+    # set_server_status for many servers at once. Only servers coming back
+    # online take the per-server path: they draw fresh baselines from
+    # baseline_random, in id order, exactly as one call each would.
+    def set_fleet_status(self, server_ids: np.ndarray, online: np.ndarray):
+        server_ids = np.asarray(server_ids, dtype=np.int64)
+        online = np.asarray(online, dtype=bool)
+        rows = self._rows(server_ids)
+        known = rows >= 0
+        rows, online, server_ids = rows[known], online[known], server_ids[known]
+
+        fleet = self.fleet
+        for server_id in server_ids[online & ~fleet.is_online[rows]].tolist():
+            self.set_server_status(server_id, True)
+        fleet.is_online[rows] = online
+        fleet.uptime_seconds[rows[~online]] = 0
 
     def trigger_event(self, event: SimulationEvent):
-        self.pending_events.append(event)
+        self.events.add(event)
 
     def set_load_baseline(self, server_id: int, cpu_baseline: float, ram_baseline: float):
-        if server_id in self.server_states:
-            state = self.server_states[server_id]
-            state.cpu_baseline = max(0.0, min(100.0, cpu_baseline))
-            state.ram_baseline = max(0.0, min(100.0, ram_baseline))
-
-    def trigger_stress_test(self, server_id: int, duration_seconds: int, intensity: float = 1.0):
-        start_time = now_warsaw()
+        if server_id in self.fleet:
+            idx = self.fleet.index[server_id]
+            self.fleet.cpu_baseline[idx] = max(0.0, min(100.0, cpu_baseline))
+            self.fleet.ram_baseline[idx] = max(0.0, min(100.0, ram_baseline))
+
+    def set_load_baselines(self, server_ids: np.ndarray, cpu_baselines: np.ndarray, ram_baselines: np.ndarray):
+        rows = self._rows(np.asarray(server_ids, dtype=np.int64))
+        known = rows >= 0
+        self.fleet.cpu_baseline[rows[known]] = np.clip(np.asarray(cpu_baselines, dtype=np.float64)[known], 0.0, 100.0)
+        self.fleet.ram_baseline[rows[known]] = np.clip(np.asarray(ram_baselines, dtype=np.float64)[known], 0.0, 100.0)
+
+    def trigger_stress_test(
+        self,
+        server_id: int,
+        duration_seconds: int,
+        intensity: float = 1.0,
+        test_id: Optional[int] = None,
+        start_time: Optional[datetime] = None
+    ):
+        start_time = start_time or self.clock()
         warmup_duration = int(duration_seconds * 0.15)
         cooldown_duration = int(duration_seconds * 0.15)
         plateau_duration = duration_seconds - warmup_duration - cooldown_duration
@@ -143,66 +294,118 @@ class SimulationEngine:
             event_type='stress_test',
             server_id=server_id,
             params={
+                'test_id': test_id,
                 'duration': duration_seconds,
                 'intensity': intensity,
                 'start_time': start_time,
                 'end_time': start_time + timedelta(seconds=duration_seconds),
                 'warmup_end': start_time + timedelta(seconds=warmup_duration),
                 'plateau_end': start_time + timedelta(seconds=warmup_duration + plateau_duration),
-                'baseline_cpu': self.server_states[server_id].cpu_baseline if server_id in self.server_states else 30.0,
-                'baseline_ram': self.server_states[server_id].ram_baseline if server_id in self.server_states else 40.0
+                'baseline_cpu': float(self.fleet.cpu_baseline[self.fleet.index[server_id]]) if server_id in self.fleet else 30.0,
+                'baseline_ram': float(self.fleet.ram_baseline[self.fleet.index[server_id]]) if server_id in self.fleet else 40.0
             }
         )
         self.trigger_event(event)
-        print(f"[STRESS TEST] Event triggered, total pending events: {len(self.pending_events)}")
-
-    def _process_pending_events(self, server_id: int, current_time: datetime):
-        active_events = [e for e in self.pending_events if e.server_id == server_id]
+        print(f"[STRESS TEST] Event triggered, total pending events: {len(self.events)}")
+
+    def cancel_stress_test(self, server_id: int, test_id: Optional[int] = None) -> List[SimulationEvent]:
+        cancelled = [
+            e for e in self.events.for_server(server_id)
+            if e.event_type == 'stress_test' and (test_id is None or e.params.get('test_id') == test_id)
+        ]
+        for event in cancelled:
+            self.events.remove(event)
+        return cancelled
+
+    # Events that ran to completion since the last call, oldest first.
+    def drain_finished_events(self) -> List[SimulationEvent]:
+        finished, self.finished_events = self.finished_events, []
+        return finished
+
+    def _process_pending_events(self, state: ServerState, current_time: datetime):
+        self.finished_events.extend(self.events.expire(current_time))
+        active_events = self.events.for_server(state.server_id)
 
         if active_events:
-            print(f"[STRESS TEST] Processing {len(active_events)} events for server {server_id}")
+            print(f"[STRESS TEST] Processing {len(active_events)} events for server {state.server_id}")
 
         for event in active_events:
             if event.event_type == 'stress_test':
-                end_time = event.params.get('end_time')
-                if current_time < end_time:
-                    state = self.server_states[server_id]
-                    intensity = event.params.get('intensity', 1.0)
-                    start_time = event.params.get('start_time')
-                    warmup_end = event.params.get('warmup_end')
-                    plateau_end = event.params.get('plateau_end')
-                    baseline_cpu = event.params.get('baseline_cpu', 30.0)
-                    baseline_ram = event.params.get('baseline_ram', 40.0)
-
-                    target_cpu = min(95.0, baseline_cpu + (intensity * 60))
-                    target_ram = min(90.0, baseline_ram + (intensity * 35))
-
-                    if current_time < warmup_end:
-                        elapsed = (current_time - start_time).total_seconds()
-                        warmup_duration = (warmup_end - start_time).total_seconds()
-                        progress = elapsed / warmup_duration if warmup_duration > 0 else 1.0
-
-                        state.cpu_current = baseline_cpu + (target_cpu - baseline_cpu) * progress
-                        state.ram_current = baseline_ram + (target_ram - baseline_ram) * progress
-
-                    elif current_time < plateau_end:
-                        noise_cpu = random.uniform(-3, 3)
-                        noise_ram = random.uniform(-2, 2)
-                        state.cpu_current = min(100.0, max(0.0, target_cpu + noise_cpu))
-                        state.ram_current = min(100.0, max(0.0, target_ram + noise_ram))
-
-                    else:
-                        elapsed = (current_time - plateau_end).total_seconds()
-                        cooldown_duration = (end_time - plateau_end).total_seconds()
-                        progress = elapsed / cooldown_duration if cooldown_duration > 0 else 1.0
-
-                        state.cpu_current = target_cpu - (target_cpu - baseline_cpu) * progress
-                        state.ram_current = target_ram - (target_ram - baseline_ram) * progress
-                else:
-                    self.pending_events.remove(event)
+                load = self._stress_test_load(event, current_time)
+                if load is not None:
+                    state.cpu_current, state.ram_current = load
+
+    def _process_fleet_events(self, current_time: datetime):
+        self.finished_events.extend(self.events.expire(current_time))
+
+        for event in self.events:
+            if event.event_type != 'stress_test':
+                continue
+
+            load = self._stress_test_load(event, current_time)
+            if load is not None and event.server_id in self.fleet:
+                idx = self.fleet.index[event.server_id]
+                self.fleet.cpu_current[idx], self.fleet.ram_current[idx] = load
+
+    def _stress_test_load(self, event: SimulationEvent, current_time: datetime) -> Optional[Tuple[float, float]]:
+        end_time = event.params.get('end_time')
+        if current_time >= end_time:
+            return None
+
+        intensity = event.params.get('intensity', 1.0)
+        start_time = event.params.get('start_time')
+        warmup_end = event.params.get('warmup_end')
+        plateau_end = event.params.get('plateau_end')
+        baseline_cpu = event.params.get('baseline_cpu', 30.0)
+        baseline_ram = event.params.get('baseline_ram', 40.0)
+
+        target_cpu = min(95.0, baseline_cpu + (intensity * 60))
+        target_ram = min(90.0, baseline_ram + (intensity * 35))
+
+        if current_time < warmup_end:
+            elapsed = (current_time - start_time).total_seconds()
+            warmup_duration = (warmup_end - start_time).total_seconds()
+            progress = elapsed / warmup_duration if warmup_duration > 0 else 1.0
+
+            return (
+                baseline_cpu + (target_cpu - baseline_cpu) * progress,
+                baseline_ram + (target_ram - baseline_ram) * progress
+            )
+
+        elif current_time < plateau_end:
+            noise_cpu = self.event_random.uniform(-3, 3)
+            noise_ram = self.event_random.uniform(-2, 2)
+            return (
+                min(100.0, max(0.0, target_cpu + noise_cpu)),
+                min(100.0, max(0.0, target_ram + noise_ram))
+            )
+
+        elapsed = (current_time - plateau_end).total_seconds()
+        cooldown_duration = (end_time - plateau_end).total_seconds()
+        progress = elapsed / cooldown_duration if cooldown_duration > 0 else 1.0
+
+        return (
+            target_cpu - (target_cpu - baseline_cpu) * progress,
+            target_ram - (target_ram - baseline_ram) * progress
+        )
+
+    def checkpoint(self) -> Dict[str, bytes]:
+        checkpoint = self.fleet.to_buffers()
+        checkpoint['events'] = json.dumps([e.to_dict() for e in self.events]).encode()
+        checkpoint['saved_at'] = str(time.time()).encode()
+        return checkpoint
+
+    def restore(self, checkpoint: Dict[str, bytes]):
+        self.fleet = FleetState.from_buffers(checkpoint)
+        self.coupling.invalidate()
+        self.events = EventScheduler()
+        for item in json.loads(checkpoint.get('events') or b'[]'):
+            self.events.add(SimulationEvent.from_dict(item))
 
     def get_state(self, server_id: int) -> Optional[ServerState]:
-        return self.server_states.get(server_id)
+        if server_id not in self.fleet:
+            return None
+        return self.fleet.get_state(server_id)
 
     def get_all_states(self) -> Dict[int, ServerState]:
-        return self.server_states
+        return {server_id: self.fleet.get_state(server_id) for server_id in self.fleet.index}
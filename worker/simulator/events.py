@@ -0,0 +1,70 @@
+import heapq
+import itertools
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .models import SimulationEvent
+
+
+# Pending events indexed by server, with a min-heap on end_time so expiry
+# only touches the events that actually ended. Evicted events are removed
+# from the per-server index right away and dropped lazily from the heap.
+class EventScheduler:
+    def __init__(self):
+        self._by_server: Dict[int, List[SimulationEvent]] = {}
+        self._expiry: List[Tuple[float, int, SimulationEvent]] = []
+        self._counter = itertools.count()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[SimulationEvent]:
+        for events in self._by_server.values():
+            yield from events
+
+    def add(self, event: SimulationEvent):
+        self._by_server.setdefault(event.server_id, []).append(event)
+        self._size += 1
+
+        end_time = self._end_time(event)
+        if end_time is not None:
+            heapq.heappush(self._expiry, (end_time.timestamp(), next(self._counter), event))
+
+    def for_server(self, server_id: int) -> List[SimulationEvent]:
+        return self._by_server.get(server_id, [])
+
+    def has_active(self, server_id: int, event_type: str) -> bool:
+        return any(e.event_type == event_type for e in self._by_server.get(server_id, ()))
+
+    def remove(self, event: SimulationEvent) -> bool:
+        events = self._by_server.get(event.server_id)
+        position = next((i for i, e in enumerate(events or ()) if e is event), None)
+        if position is None:
+            return False
+
+        del events[position]
+        if not events:
+            del self._by_server[event.server_id]
+        self._size -= 1
+        return True
+
+    def expire(self, current_time: datetime) -> List[SimulationEvent]:
+        now_ts = current_time.timestamp()
+        expired = []
+
+        while self._expiry and self._expiry[0][0] <= now_ts:
+            _, _, event = heapq.heappop(self._expiry)
+            if self.remove(event):
+                expired.append(event)
+
+        return expired
+
+    def evict_server(self, server_id: int) -> int:
+        events = self._by_server.pop(server_id, [])
+        self._size -= len(events)
+        return len(events)
+
+    @staticmethod
+    def _end_time(event: SimulationEvent) -> Optional[datetime]:
+        return event.params.get('end_time')
@@ -0,0 +1,170 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from .models import ServerState, MetricsSnapshot
+from .coupling import default_position
+from core.timezone import TIMEZONE
+
+
+FLOAT_FIELDS = (
+    'cpu_baseline', 'cpu_variance', 'cpu_current',
+    'ram_baseline', 'ram_variance', 'ram_current',
+    'temperature_current', 'temperature_idle', 'temperature_max',
+    'cooling_rate', 'heating_rate',
+    'last_update',
+)
+INT_FIELDS = ('server_id', 'uptime_seconds', 'rack', 'slot')
+BOOL_FIELDS = ('is_online',)
+
+
+# Struct-of-arrays storage: row i of every array belongs to server_id[i],
+# index maps a server id back to its row, last_update is epoch seconds.
+class FleetState:
+    def __init__(self, capacity: int = 64):
+        self.capacity = max(1, capacity)
+        self.size = 0
+        self.index: Dict[int, int] = {}
+
+        for name in FLOAT_FIELDS:
+            setattr(self, '_' + name, np.zeros(self.capacity, dtype=np.float64))
+        for name in INT_FIELDS:
+            setattr(self, '_' + name, np.zeros(self.capacity, dtype=np.int64))
+        for name in BOOL_FIELDS:
+            setattr(self, '_' + name, np.zeros(self.capacity, dtype=bool))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, server_id: int) -> bool:
+        return server_id in self.index
+
+    def __getattr__(self, name: str):
+        # Public field names return views trimmed to the live rows.
+        if name in FLOAT_FIELDS or name in INT_FIELDS or name in BOOL_FIELDS:
+            return self.__dict__['_' + name][:self.__dict__['size']]
+        raise AttributeError(name)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, '_' + name).nbytes for name in FLOAT_FIELDS + INT_FIELDS + BOOL_FIELDS)
+
+    def shrink_to_fit(self):
+        self._resize(max(1, self.size))
+
+    def _grow(self, min_capacity: int):
+        new_capacity = self.capacity
+        while new_capacity < min_capacity:
+            new_capacity *= 2
+        self._resize(new_capacity)
+
+    def _resize(self, new_capacity: int):
+        for name in FLOAT_FIELDS + INT_FIELDS + BOOL_FIELDS:
+            old = getattr(self, '_' + name)
+            new = np.zeros(new_capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, '_' + name, new)
+
+        self.capacity = new_capacity
+
+    def put_state(self, state: ServerState) -> int:
+        idx = self.index.get(state.server_id)
+        if idx is None:
+            if self.size == self.capacity:
+                self._grow(self.size + 1)
+            idx = self.size
+            self.size += 1
+            self.index[state.server_id] = idx
+
+        for name in FLOAT_FIELDS:
+            value = getattr(state, name)
+            if name == 'last_update':
+                value = value.timestamp()
+            getattr(self, '_' + name)[idx] = value
+        for name in INT_FIELDS + BOOL_FIELDS:
+            getattr(self, '_' + name)[idx] = getattr(state, name)
+
+        return idx
+
+    def remove(self, server_id: int) -> bool:
+        idx = self.index.pop(server_id, None)
+        if idx is None:
+            return False
+
+        last = self.size - 1
+        if idx != last:
+            for name in FLOAT_FIELDS + INT_FIELDS + BOOL_FIELDS:
+                array = getattr(self, '_' + name)
+                array[idx] = array[last]
+            self.index[int(self._server_id[idx])] = idx
+
+        self.size = last
+        return True
+
+    def to_buffers(self) -> Dict[str, bytes]:
+        buffers = {'size': str(self.size).encode()}
+        for name in FLOAT_FIELDS + INT_FIELDS + BOOL_FIELDS:
+            buffers[name] = getattr(self, '_' + name)[:self.size].tobytes()
+        return buffers
+
+    @classmethod
+    def from_buffers(cls, buffers: Dict[str, bytes]) -> 'FleetState':
+        size = int(buffers['size'])
+        fleet = cls(capacity=max(64, size))
+
+        for name in FLOAT_FIELDS + INT_FIELDS + BOOL_FIELDS:
+            if name in buffers:
+                array = getattr(fleet, '_' + name)
+                array[:size] = np.frombuffer(buffers[name], dtype=array.dtype, count=size)
+
+        if 'rack' not in buffers:
+            for idx in range(size):
+                fleet._rack[idx], fleet._slot[idx] = default_position(int(fleet._server_id[idx]))
+
+        fleet.size = size
+        fleet.index = {int(server_id): idx for idx, server_id in enumerate(fleet._server_id[:size])}
+        return fleet
+
+    def get_state(self, server_id: int) -> ServerState:
+        idx = self.index[server_id]
+        values = {}
+        for name in FLOAT_FIELDS:
+            value = float(getattr(self, '_' + name)[idx])
+            if name == 'last_update':
+                value = datetime.fromtimestamp(value, TIMEZONE)
+            values[name] = value
+        for name in INT_FIELDS:
+            values[name] = int(getattr(self, '_' + name)[idx])
+        for name in BOOL_FIELDS:
+            values[name] = bool(getattr(self, '_' + name)[idx])
+        return ServerState(**values)
+
+
+@dataclass(slots=True)
+class FleetSnapshot:
+    timestamp: datetime
+    server_ids: np.ndarray
+    cpu_usage: np.ndarray
+    ram_usage: np.ndarray
+    temperature: np.ndarray
+    uptime: np.ndarray
+    is_online: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.server_ids)
+
+    def snapshot(self, idx: int) -> MetricsSnapshot:
+        return MetricsSnapshot(
+            server_id=int(self.server_ids[idx]),
+            timestamp=self.timestamp,
+            cpu_usage=float(self.cpu_usage[idx]),
+            ram_usage=float(self.ram_usage[idx]),
+            temperature=float(self.temperature[idx]),
+            uptime=int(self.uptime[idx]),
+            status='online' if self.is_online[idx] else 'offline'
+        )
+
+    def snapshots(self) -> List[MetricsSnapshot]:
+        return [self.snapshot(i) for i in range(len(self))]
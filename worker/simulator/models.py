@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerState:
     server_id: int
     is_online: bool
@@ -24,6 +24,8 @@ class ServerState:
     heating_rate: float = 0.15
 
     uptime_seconds: int = 0
+    rack: int = 0
+    slot: int = 0
     last_update: datetime = field(default_factory=datetime.utcnow)
 
     def initialize_from_load(self, cpu: float, ram: float):
@@ -33,7 +35,7 @@ class ServerState:
         self.temperature_current = target_temp
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricsSnapshot:
     server_id: int
     timestamp: datetime
@@ -55,9 +57,32 @@ class MetricsSnapshot:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationEvent:
     event_type: str
     server_id: int
     params: dict = field(default_factory=dict)
     timestamp: datetime = field(default_factory=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'event_type': self.event_type,
+            'server_id': self.server_id,
+            'params': {
+                key: {'$dt': value.isoformat()} if isinstance(value, datetime) else value
+                for key, value in self.params.items()
+            },
+            'timestamp': self.timestamp.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SimulationEvent':
+        return cls(
+            event_type=data['event_type'],
+            server_id=data['server_id'],
+            params={
+                key: datetime.fromisoformat(value['$dt']) if isinstance(value, dict) and '$dt' in value else value
+                for key, value in data['params'].items()
+            },
+            timestamp=datetime.fromisoformat(data['timestamp'])
+        )
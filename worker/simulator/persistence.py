@@ -0,0 +1,67 @@
+import io
+
+import numpy as np
+
+from .fleet import FleetSnapshot
+
+HISTORY_COLUMNS = ('server_id', 'timestamp', 'cpu_usage', 'ram_usage', 'temperature', 'uptime', 'status')
+
+COPY_HISTORY_SQL = (
+    f"COPY server_metrics_history ({', '.join(HISTORY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+)
+
+UPDATE_SERVERS_SQL = """
+    UPDATE servers AS s SET
+        cpu_usage = v.cpu_usage,
+        ram_usage = v.ram_usage,
+        temperature = v.temperature,
+        uptime = v.uptime,
+        status = v.status::serverstatus,
+        updated_at = now()
+    FROM (VALUES %s) AS v(id, cpu_usage, ram_usage, temperature, uptime, status)
+    WHERE s.id = v.id
+"""
+
+
+def snapshot_to_csv(snapshot: FleetSnapshot) -> str:
+    # server_metrics_history.timestamp is a naive column holding Warsaw local time
+    timestamp = snapshot.timestamp.replace(tzinfo=None).isoformat(sep=' ')
+    rows = zip(
+        snapshot.server_ids.tolist(),
+        snapshot.cpu_usage.tolist(),
+        snapshot.ram_usage.tolist(),
+        snapshot.temperature.tolist(),
+        snapshot.uptime.tolist(),
+        snapshot.is_online.tolist()
+    )
+    return ''.join(
+        f"{server_id},{timestamp},{cpu:.2f},{ram:.2f},{temp:.2f},{uptime},{'online' if online else 'offline'}\n"
+        for server_id, cpu, ram, temp, uptime, online in rows
+    )
+
+
+def copy_history(cursor, snapshot: FleetSnapshot) -> int:
+    if len(snapshot) == 0:
+        return 0
+    cursor.copy_expert(COPY_HISTORY_SQL, io.StringIO(snapshot_to_csv(snapshot)))
+    return len(snapshot)
+
+
+# One UPDATE ... FROM (VALUES ...) statement for the whole fleet. The
+# status enum is stored by name, as SQLAlchemy's Enum type does.
+def update_servers(cursor, snapshot: FleetSnapshot) -> int:
+    from psycopg2.extras import execute_values
+
+    if len(snapshot) == 0:
+        return 0
+
+    rows = list(zip(
+        snapshot.server_ids.tolist(),
+        snapshot.cpu_usage.tolist(),
+        snapshot.ram_usage.tolist(),
+        snapshot.temperature.tolist(),
+        snapshot.uptime.tolist(),
+        np.where(snapshot.is_online, 'ONLINE', 'OFFLINE').tolist()
+    ))
+    execute_values(cursor, UPDATE_SERVERS_SQL, rows, page_size=len(rows))
+    return cursor.rowcount
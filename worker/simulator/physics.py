@@ -1,6 +1,9 @@
+import math
 import random
 from datetime import datetime
 
+import numpy as np
+
 
 class ThermalModel:
     @staticmethod
@@ -10,9 +13,17 @@ class ThermalModel:
         max_temp: float,
         ambient_temp: float = 22.0
     ) -> float:
+        # idle/max temperatures are specified for a 22 °C inlet
         load_factor = cpu_load / 100.0
         temp_range = max_temp - idle_temp
-        return idle_temp + (temp_range * load_factor)
+        return idle_temp + (temp_range * load_factor) + (ambient_temp - 22.0)
+
+    @staticmethod
+    def approach_factor(rate, time_delta_seconds):
+        # Exact solution of dT/dt = rate / 60 * (target - T) over the step.
+        # The factor stays in [0, 1) for any gap, so a tick after a long
+        # worker pause converges on the target instead of overshooting it.
+        return -np.expm1(-rate * np.maximum(time_delta_seconds, 0.0) / 60.0)
 
     @staticmethod
     def apply_cooling(
@@ -25,7 +36,7 @@ class ThermalModel:
             return current_temp
 
         temp_diff = current_temp - target_temp
-        cooling_amount = temp_diff * cooling_rate * (time_delta_seconds / 60.0)
+        cooling_amount = temp_diff * -math.expm1(-cooling_rate * max(time_delta_seconds, 0.0) / 60.0)
         new_temp = current_temp - cooling_amount
 
         return max(new_temp, target_temp)
@@ -41,44 +52,109 @@ class ThermalModel:
             return current_temp
 
         temp_diff = target_temp - current_temp
-        heating_amount = temp_diff * heating_rate * (time_delta_seconds / 60.0)
+        heating_amount = temp_diff * -math.expm1(-heating_rate * max(time_delta_seconds, 0.0) / 60.0)
         new_temp = current_temp + heating_amount
 
         return min(new_temp, target_temp)
 
+    @staticmethod
+    def apply_cooling_array(
+        current_temp: np.ndarray,
+        target_temp: np.ndarray,
+        cooling_rate: np.ndarray,
+        time_delta_seconds: np.ndarray
+    ) -> np.ndarray:
+        cooled = current_temp - (current_temp - target_temp) * ThermalModel.approach_factor(cooling_rate, time_delta_seconds)
+        return np.where(current_temp <= target_temp, current_temp, np.maximum(cooled, target_temp))
+
+    @staticmethod
+    def apply_heating_array(
+        current_temp: np.ndarray,
+        target_temp: np.ndarray,
+        heating_rate: np.ndarray,
+        time_delta_seconds: np.ndarray
+    ) -> np.ndarray:
+        heated = current_temp + (target_temp - current_temp) * ThermalModel.approach_factor(heating_rate, time_delta_seconds)
+        return np.where(current_temp >= target_temp, current_temp, np.minimum(heated, target_temp))
+
+    @staticmethod
+    def step_temperature_array(
+        current_temp: np.ndarray,
+        target_temp: np.ndarray,
+        heating_rate: np.ndarray,
+        cooling_rate: np.ndarray,
+        time_delta_seconds: np.ndarray
+    ) -> np.ndarray:
+        return np.where(
+            current_temp < target_temp,
+            ThermalModel.apply_heating_array(current_temp, target_temp, heating_rate, time_delta_seconds),
+            ThermalModel.apply_cooling_array(current_temp, target_temp, cooling_rate, time_delta_seconds)
+        )
+
 
 class LoadSimulator:
     @staticmethod
     def generate_realistic_cpu(
         baseline: float,
         variance: float,
-        time_of_day: datetime
+        time_of_day: datetime,
+        rng: random.Random = random
     ) -> float:
+        day_factor = LoadSimulator.day_factor(time_of_day)
+
+        noise = rng.gauss(0, variance / 3)
+        cpu = baseline * day_factor + noise
+
+        return max(0.0, min(100.0, cpu))
+
+    @staticmethod
+    def day_factor(time_of_day: datetime) -> float:
         hour = time_of_day.hour
-        day_factor = 1.0
 
         if 9 <= hour <= 17:
-            day_factor = 1.2
+            return 1.2
         elif 0 <= hour <= 6:
-            day_factor = 0.7
+            return 0.7
+        return 1.0
 
-        noise = random.gauss(0, variance / 3)
-        cpu = baseline * day_factor + noise
+    @staticmethod
+    def generate_realistic_cpu_array(
+        baseline: np.ndarray,
+        variance: np.ndarray,
+        time_of_day: datetime,
+        rng: np.random.Generator
+    ) -> np.ndarray:
+        noise = rng.normal(0.0, 1.0, size=baseline.shape) * (variance / 3)
+        cpu = baseline * LoadSimulator.day_factor(time_of_day) + noise
 
-        return max(0.0, min(100.0, cpu))
+        return np.clip(cpu, 0.0, 100.0)
 
     @staticmethod
     def generate_realistic_ram(
         baseline: float,
         variance: float,
-        cpu_usage: float
+        cpu_usage: float,
+        rng: random.Random = random
     ) -> float:
         correlation = 0.3
-        noise = random.gauss(0, variance / 3)
+        noise = rng.gauss(0, variance / 3)
         ram = baseline + (cpu_usage - baseline) * correlation + noise
 
         return max(0.0, min(100.0, ram))
 
+    @staticmethod
+    def generate_realistic_ram_array(
+        baseline: np.ndarray,
+        variance: np.ndarray,
+        cpu_usage: np.ndarray,
+        rng: np.random.Generator
+    ) -> np.ndarray:
+        correlation = 0.3
+        noise = rng.normal(0.0, 1.0, size=baseline.shape) * (variance / 3)
+        ram = baseline + (cpu_usage - baseline) * correlation + noise
+
+        return np.clip(ram, 0.0, 100.0)
+
     @staticmethod
     def apply_stress_test(baseline: float, intensity: float) -> float:
         stress_load = 80 + (intensity * 15)
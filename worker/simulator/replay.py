@@ -0,0 +1,259 @@
+import base64
+import hashlib
+import json
+import os
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .engine import SimulationEngine
+from .fleet import FleetSnapshot
+from .models import MetricsSnapshot, SimulationEvent
+from core.timezone import now_warsaw
+
+TICK_OPS = ('simulate_tick', 'simulate_fleet_tick')
+
+
+# Ordered log of everything that fed a SimulationEngine: input calls,
+# every clock reading and a digest of every tick result. Saved as JSON
+# lines with a header line holding the engine seed. A live recording
+# streams to disk with flush(), which drops the entries it wrote.
+class Recording:
+    def __init__(self, seed: Optional[int] = None, entries: Optional[List[dict]] = None):
+        self.seed = seed
+        self.entries: List[dict] = entries or []
+        self._header_written = False
+
+    def add_op(self, op: str, **args):
+        self.entries.append({'op': op, 'args': args})
+
+    def add_clock(self, now: datetime) -> datetime:
+        self.entries.append({'clock': now.isoformat()})
+        return now
+
+    def add_digest(self, digest: str):
+        self.entries.append({'digest': digest})
+
+    def ops(self) -> List[dict]:
+        return [e for e in self.entries if 'op' in e]
+
+    def clock_readings(self) -> List[datetime]:
+        return [datetime.fromisoformat(e['clock']) for e in self.entries if 'clock' in e]
+
+    def digests(self) -> List[str]:
+        return [e['digest'] for e in self.entries if 'digest' in e]
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            f.write(json.dumps({'seed': self.seed}) + '\n')
+            for entry in self.entries:
+                f.write(json.dumps(entry) + '\n')
+
+    def flush(self, path: str):
+        if not self._header_written:
+            self.save(path)
+            self._header_written = True
+        else:
+            with open(path, 'a') as f:
+                for entry in self.entries:
+                    f.write(json.dumps(entry) + '\n')
+        self.entries.clear()
+
+    @classmethod
+    def load(cls, path: str) -> 'Recording':
+        with open(path) as f:
+            header = json.loads(f.readline())
+            entries = [json.loads(line) for line in f if line.strip()]
+        return cls(seed=header['seed'], entries=entries)
+
+
+# Every process runs its own engine with its own random streams, so each
+# one records to its own file (simulator.jsonl -> simulator.<pid>.jsonl).
+# A file replays on its own: state another process saved in between
+# arrives through the recorded restore() calls.
+def process_recording_path(path: str) -> str:
+    root, ext = os.path.splitext(path)
+    return f"{root}.{os.getpid()}{ext}"
+
+
+class ReplayClock:
+    def __init__(self, readings: Iterable[datetime]):
+        self.readings = deque(readings)
+
+    def __call__(self) -> datetime:
+        if not self.readings:
+            raise RuntimeError("Replay requested more clock readings than were recorded")
+        return self.readings.popleft()
+
+
+def snapshot_digest(result) -> str:
+    digest = hashlib.sha256()
+    if isinstance(result, FleetSnapshot):
+        for array in (result.server_ids, result.cpu_usage, result.ram_usage,
+                      result.temperature, result.uptime, result.is_online):
+            digest.update(array.tobytes())
+    else:
+        digest.update(repr((result.server_id, result.cpu_usage, result.ram_usage,
+                            result.temperature, result.uptime, result.status)).encode())
+    return digest.hexdigest()
+
+
+def _encode_checkpoint(checkpoint: Dict[str, bytes]) -> Dict[str, str]:
+    return {key: base64.b64encode(value).decode() for key, value in checkpoint.items()}
+
+
+def _decode_checkpoint(checkpoint: Dict[str, str]) -> Dict[str, bytes]:
+    return {key: base64.b64decode(value) for key, value in checkpoint.items()}
+
+
+def _checkpoint_digest(checkpoint: Dict[str, bytes]) -> str:
+    digest = hashlib.sha256()
+    for key in sorted(checkpoint):
+        digest.update(key.encode() + b'\0' + checkpoint[key])
+    return digest.hexdigest()
+
+
+# A restore records only the fields engine.restore reads (no version,
+# meta: or blob: fields of the stored hash), and of the fleet arrays only
+# the ones whose bytes differ from the engine's state at that point: the
+# arrays a tick leaves alone are named, not copied. Replay reaches the
+# restore in the same state, fills them back in and checks the digest.
+# Events carry an unrecorded wall-clock timestamp, so they are always
+# copied; the list is short.
+def _restore_args(checkpoint: Dict[str, bytes], current: Dict[str, bytes]) -> dict:
+    fields = {key: value for key, value in checkpoint.items() if key in current and key != 'saved_at'}
+    unchanged = sorted(key for key, value in fields.items() if key != 'events' and current[key] == value)
+    return {
+        'checkpoint': _encode_checkpoint({key: value for key, value in fields.items() if key not in unchanged}),
+        'unchanged': unchanged,
+        'sha256': _checkpoint_digest(fields),
+    }
+
+
+def _rebuild_checkpoint(args: dict, current: Dict[str, bytes]) -> Dict[str, bytes]:
+    checkpoint = _decode_checkpoint(args['checkpoint'])
+    checkpoint.update({key: current[key] for key in args.get('unchanged', ())})
+    if 'sha256' in args and _checkpoint_digest(checkpoint) != args['sha256']:
+        raise RuntimeError("Replayed state diverged before a recorded restore")
+    return checkpoint
+
+
+# Drop-in SimulationEngine that records its inputs. Only top-level calls
+# are logged; calls the engine makes to itself (prune_servers ->
+# remove_server, trigger_stress_test -> trigger_event) are replayed
+# implicitly.
+class RecordingEngine(SimulationEngine):
+    def __init__(self, seed: Optional[int] = None, clock: Callable[[], datetime] = now_warsaw):
+        self.recording = Recording()
+        self._depth = 0
+        super().__init__(seed=seed, clock=lambda: self.recording.add_clock(clock()))
+        self.recording.seed = self.seed
+
+    def _call(self, op: str, args: dict, call: Callable):
+        if self._depth == 0:
+            self.recording.add_op(op, **args)
+
+        self._depth += 1
+        try:
+            result = call()
+        finally:
+            self._depth -= 1
+
+        if self._depth == 0 and op in TICK_OPS:
+            self.recording.add_digest(snapshot_digest(result))
+        return result
+
+    def register_server(self, server_id: int, is_online: bool, current_cpu: float = 0.0,
+                        current_ram: float = 0.0, current_temp: float = 22.0, uptime: int = 0):
+        args = dict(server_id=server_id, is_online=is_online, current_cpu=current_cpu,
+                    current_ram=current_ram, current_temp=current_temp, uptime=uptime)
+        return self._call('register_server', args, lambda: super(RecordingEngine, self).register_server(**args))
+
+    def remove_server(self, server_id: int) -> bool:
+        return self._call('remove_server', {'server_id': server_id},
+                          lambda: super(RecordingEngine, self).remove_server(server_id))
+
+    def prune_servers(self, active_server_ids: Iterable[int]) -> int:
+        active = [int(server_id) for server_id in active_server_ids]
+        return self._call('prune_servers', {'active_server_ids': active},
+                          lambda: super(RecordingEngine, self).prune_servers(active))
+
+    def set_server_status(self, server_id: int, online: bool):
+        return self._call('set_server_status', {'server_id': server_id, 'online': online},
+                          lambda: super(RecordingEngine, self).set_server_status(server_id, online))
+
+    def set_fleet_status(self, server_ids, online):
+        args = dict(server_ids=np.asarray(server_ids).tolist(), online=np.asarray(online).tolist())
+        return self._call('set_fleet_status', args, lambda: super(RecordingEngine, self).set_fleet_status(server_ids, online))
+
+    def set_load_baselines(self, server_ids, cpu_baselines, ram_baselines):
+        args = dict(server_ids=np.asarray(server_ids).tolist(), cpu_baselines=np.asarray(cpu_baselines).tolist(),
+                    ram_baselines=np.asarray(ram_baselines).tolist())
+        return self._call('set_load_baselines', args,
+                          lambda: super(RecordingEngine, self).set_load_baselines(server_ids, cpu_baselines, ram_baselines))
+
+    def set_server_position(self, server_id: int, rack: int, slot: int):
+        args = dict(server_id=server_id, rack=rack, slot=slot)
+        return self._call('set_server_position', args, lambda: super(RecordingEngine, self).set_server_position(**args))
+
+    def set_load_baseline(self, server_id: int, cpu_baseline: float, ram_baseline: float):
+        args = dict(server_id=server_id, cpu_baseline=cpu_baseline, ram_baseline=ram_baseline)
+        return self._call('set_load_baseline', args, lambda: super(RecordingEngine, self).set_load_baseline(**args))
+
+    def trigger_stress_test(self, server_id: int, duration_seconds: int, intensity: float = 1.0,
+                            test_id: Optional[int] = None, start_time: Optional[datetime] = None):
+        args = dict(server_id=server_id, duration_seconds=duration_seconds, intensity=intensity, test_id=test_id)
+        recorded = dict(args, start_time=start_time.isoformat() if start_time else None)
+        return self._call('trigger_stress_test', recorded,
+                          lambda: super(RecordingEngine, self).trigger_stress_test(start_time=start_time, **args))
+
+    def cancel_stress_test(self, server_id: int, test_id: Optional[int] = None) -> List[SimulationEvent]:
+        args = dict(server_id=server_id, test_id=test_id)
+        return self._call('cancel_stress_test', args, lambda: super(RecordingEngine, self).cancel_stress_test(**args))
+
+    def trigger_event(self, event: SimulationEvent):
+        return self._call('trigger_event', {'event': event.to_dict()},
+                          lambda: super(RecordingEngine, self).trigger_event(event))
+
+    def simulate_tick(self, server_id: int, interval_seconds: int = 10) -> MetricsSnapshot:
+        args = dict(server_id=server_id, interval_seconds=interval_seconds)
+        return self._call('simulate_tick', args, lambda: super(RecordingEngine, self).simulate_tick(**args))
+
+    def simulate_fleet_tick(self, now: Optional[datetime] = None, room_temperature: Optional[float] = None) -> FleetSnapshot:
+        args = {'now': now.isoformat() if now else None, 'room_temperature': room_temperature}
+        return self._call('simulate_fleet_tick', args,
+                          lambda: super(RecordingEngine, self).simulate_fleet_tick(now, room_temperature))
+
+    def restore(self, checkpoint: Dict[str, bytes]):
+        return self._call('restore', _restore_args(checkpoint, self.checkpoint()),
+                          lambda: super(RecordingEngine, self).restore(checkpoint))
+
+
+def replay(recording: Recording) -> Tuple[SimulationEngine, List[str]]:
+    engine = SimulationEngine(seed=recording.seed, clock=ReplayClock(recording.clock_readings()))
+    digests = []
+
+    for entry in recording.ops():
+        op, args = entry['op'], dict(entry['args'])
+
+        if op == 'trigger_event':
+            args['event'] = SimulationEvent.from_dict(args['event'])
+        elif op == 'restore':
+            args = {'checkpoint': _rebuild_checkpoint(args, engine.checkpoint())}
+        elif op == 'simulate_fleet_tick' and args['now']:
+            args['now'] = datetime.fromisoformat(args['now'])
+        elif op == 'trigger_stress_test' and args.get('start_time'):
+            args['start_time'] = datetime.fromisoformat(args['start_time'])
+
+        result = getattr(engine, op)(**args)
+        if op in TICK_OPS:
+            digests.append(snapshot_digest(result))
+
+    return engine, digests
+
+
+def verify(recording: Recording) -> bool:
+    _, digests = replay(recording)
+    return digests == recording.digests()
@@ -0,0 +1,64 @@
+from typing import Optional
+
+import numpy as np
+
+AMBIENT_TEMP = 22.0
+BASE_POWER_KW = 1.5
+UPS_CAPACITY_KWH = 10.0
+# Room temperature rise per degree of average server temperature above 40 °C
+ROOM_HEAT_GAIN = 0.5
+
+
+# Advances the room model by one tick. The arrays hold the online
+# servers only. The environment (ORM row or any object with the same
+# attributes) is updated in place. Returns the UPS drain for this tick,
+# or None when the UPS is not discharging.
+def step_room(environment, temperature, cpu_usage, ram_usage) -> Optional[float]:
+    temperature = np.asarray(temperature, dtype=np.float64)
+    cpu_usage = np.asarray(cpu_usage, dtype=np.float64)
+    ram_usage = np.asarray(ram_usage, dtype=np.float64)
+    online_count = len(temperature)
+
+    # The room's cooling is sized for its fleet, so the heat balance is
+    # energy in over capacity: it follows the average server's exhaust
+    # heat, not how many servers there are. Room temperature feeds back
+    # into every server's inlet, so ROOM_HEAT_GAIN (and 0.3x that with the
+    # AC on) must stay below 1 for the loop to settle below the clamp.
+    if online_count:
+        avg_server_temp = float(temperature.mean())
+        server_heat_contribution = (avg_server_temp - 40) * ROOM_HEAT_GAIN
+    else:
+        server_heat_contribution = 0
+
+    if environment.ac_status:
+        temp_diff = environment.room_temperature - environment.ac_target_temp
+        cooling_rate = min(0.5, max(0.1, temp_diff * 0.1))
+        target_temp = environment.ac_target_temp + server_heat_contribution * 0.3
+    else:
+        cooling_rate = 0
+        target_temp = AMBIENT_TEMP + server_heat_contribution
+
+    current_temp = environment.room_temperature
+    if current_temp < target_temp:
+        environment.room_temperature = min(target_temp, current_temp + 0.2)
+    elif current_temp > target_temp:
+        environment.room_temperature = max(target_temp, current_temp - cooling_rate)
+
+    environment.room_temperature = round(max(15, min(45, environment.room_temperature)), 1)
+
+    server_power = float(np.sum(0.3 + (cpu_usage / 100 * 0.5) + (ram_usage / 100 * 0.3))) if online_count else 0.0
+
+    ac_power = 0.0
+    if environment.ac_status:
+        temp_diff = environment.room_temperature - environment.ac_target_temp
+        ac_power = 0.5 + max(0, temp_diff * 0.3)
+        ac_power = min(ac_power, 3.0)
+
+    environment.power_consumption = round(BASE_POWER_KW + server_power + ac_power, 2)
+
+    if environment.ups_on_battery and environment.ups_battery > 0:
+        drain_per_tick = (environment.power_consumption / UPS_CAPACITY_KWH) * (30.0 / 3600.0) * 100.0
+        environment.ups_battery = max(0, environment.ups_battery - drain_per_tick)
+        return drain_per_tick
+
+    return None
@@ -0,0 +1,71 @@
+from typing import Dict, Optional
+
+from .engine import SimulationEngine
+
+STATE_KEY = 'simulator:state'
+META_PREFIX = 'meta:'
+BLOB_PREFIX = 'blob:'
+
+
+# Keeps the simulator checkpoint in a Redis hash so every prefork child
+# works on the same fleet. The hash carries a version counter; a child
+# only deserializes the checkpoint when another process saved after it.
+# Values that must move together with the state are saved in the same
+# hash: short strings (e.g. the command stream position) in self.meta,
+# binary buffers (e.g. the metrics delta baseline) in self.blobs. The
+# client must be created with decode_responses=False.
+class RedisStateStore:
+    def __init__(self, redis_client, key: str = STATE_KEY):
+        self.redis = redis_client
+        self.key = key
+        self.version: Optional[int] = None
+        self.meta: Dict[str, str] = {}
+        self.blobs: Dict[str, bytes] = {}
+
+    def load(self, engine: SimulationEngine) -> bool:
+        remote_version = self.redis.hget(self.key, 'version')
+        if remote_version is None or int(remote_version) == self.version:
+            return False
+
+        checkpoint = {
+            field.decode(): value
+            for field, value in self.redis.hgetall(self.key).items()
+        }
+        engine.restore(checkpoint)
+        self.version = int(checkpoint['version'])
+        self.meta = {
+            field[len(META_PREFIX):]: value.decode()
+            for field, value in checkpoint.items()
+            if field.startswith(META_PREFIX)
+        }
+        self.blobs = {
+            field[len(BLOB_PREFIX):]: value
+            for field, value in checkpoint.items()
+            if field.startswith(BLOB_PREFIX)
+        }
+        return True
+
+    def save(self, engine: SimulationEngine) -> int:
+        return self.write(self.prepare(engine))
+
+    # prepare() serializes on the thread that owns the engine; write() only
+    # does I/O and may run elsewhere.
+    def prepare(self, engine: SimulationEngine) -> Dict[str, bytes]:
+        mapping = engine.checkpoint()
+        mapping.update({META_PREFIX + name: value.encode() for name, value in self.meta.items()})
+        mapping.update({BLOB_PREFIX + name: value for name, value in self.blobs.items()})
+        return mapping
+
+    def write(self, mapping: Dict[str, bytes]) -> int:
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hset(self.key, mapping=mapping)
+        pipe.hincrby(self.key, 'version', 1)
+        _, version = pipe.execute()
+        self.version = version
+        return version
+
+    def clear(self):
+        self.redis.delete(self.key)
+        self.version = None
+        self.meta = {}
+        self.blobs = {}
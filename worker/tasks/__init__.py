@@ -1,4 +1,5 @@
 from .celery_app import celery_app
 from . import background_jobs
+from . import warmup
 
-__all__ = ['celery_app', 'background_jobs']
+__all__ = ['celery_app', 'background_jobs', 'warmup']
@@ -0,0 +1,115 @@
+import time
+from datetime import timedelta
+from typing import List, Tuple
+
+from sqlalchemy import func, select
+
+from alerting.tracker import AlertTracker
+from core.timezone import now_warsaw
+# The API sends the same payloads and numbers its deltas on the same
+# sequence; one definition for both. alert_payload is re-exported for
+# the tasks.
+from app.core.worker_events import alert_payload, publish_sequenced
+
+ALERT_TRACKER_KEY = 'alerts:tracker'
+
+
+# Newest unread alert per (source, title) for the candidates' titles
+# within the longest dedup window: one query per run, however many
+# servers fire.
+def recent_unread_alerts(db, candidates) -> dict:
+    from app.models.alert import Alert
+
+    if not candidates:
+        return {}
+
+    cutoff = now_warsaw() - timedelta(minutes=max(c.dedup_minutes for c in candidates))
+    rows = db.execute(
+        select(Alert.source, Alert.title, func.max(Alert.created_at), func.max(Alert.id))
+        .where(
+            Alert.title.in_(sorted({c.title for c in candidates})),
+            Alert.created_at >= cutoff,
+            Alert.is_read == False
+        )
+        .group_by(Alert.source, Alert.title)
+    ).all()
+    return {(source, title): (created_at, alert_id) for source, title, created_at, alert_id in rows}
+
+
+# Adds an Alert for every candidate not deduplicated by an unread alert
+# inside its window. A grouped candidate instead refreshes the member
+# count of its unread group alert. Returns (created, updated), flushed so
+# they have ids; the caller commits.
+def store_alerts(db, candidates) -> Tuple[List, List]:
+    from app.models.alert import Alert, AlertLevel
+    from app.models.user import UserRole
+
+    recent = recent_unread_alerts(db, candidates)
+    now = now_warsaw()
+    created, updated = [], []
+
+    for candidate in candidates:
+        key = (candidate.source, candidate.title)
+        if key in recent and recent[key][0] >= now - timedelta(minutes=candidate.dedup_minutes):
+            if candidate.member_count > 1 and recent[key][1] is not None:
+                alert = db.get(Alert, recent[key][1])
+                alert.member_count = candidate.member_count
+                alert.message = candidate.message
+                updated.append(alert)
+            continue
+
+        alert = Alert(
+            title=candidate.title,
+            message=candidate.message,
+            level=AlertLevel(candidate.level),
+            source=candidate.source,
+            target_role=UserRole(candidate.target_role) if candidate.target_role else None,
+            is_read=False,
+            member_count=candidate.member_count,
+            created_at=now
+        )
+        recent[key] = (now, None)
+        created.append(alert)
+
+    db.add_all(created)
+    db.flush()
+    return created, updated
+
+
+def load_tracker(redis_client, tracker: AlertTracker):
+    try:
+        tracker.restore({
+            field.decode(): value for field, value in redis_client.hgetall(ALERT_TRACKER_KEY).items()
+        })
+    except Exception as redis_error:
+        print(f"[WARN] Failed to load alert tracker state: {redis_error}")
+
+
+def save_tracker(redis_client, tracker: AlertTracker):
+    try:
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.delete(ALERT_TRACKER_KEY)
+        buffers = tracker.to_buffers()
+        if buffers:
+            pipe.hset(ALERT_TRACKER_KEY, mapping=buffers)
+        pipe.execute()
+    except Exception as redis_error:
+        print(f"[WARN] Failed to save alert tracker state: {redis_error}")
+
+
+# Publishes created/updated alerts (payloads taken before commit, while
+# the rows are still loaded) as one numbered alerts_update delta.
+def publish_alerts(redis_client, changes: List[dict], alerts_generated: int):
+    payload = {
+        'kind': 'delta',
+        'alerts': changes,
+        'read_ids': [],
+        'deleted_ids': [],
+        'new_count': alerts_generated,
+        'timestamp': time.time()
+    }
+    try:
+        sequence = publish_sequenced(redis_client, payload)
+        print(f"[WORKER] Published {len(changes)} alert changes to WebSocket (sequence {sequence})")
+    except Exception as redis_error:
+        print(f"[WARN] Failed to publish alerts to Redis: {redis_error}")
@@ -5,193 +5,38 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 import time
 import sys
-import redis
-import json
 sys.path.append('/app')
+sys.path.insert(0, '/backend')
 
-from simulator.engine import SimulationEngine
+from alerting.rules import FleetMetrics, RuleTable, server_fields
+from alerting.tracker import AlertTracker
 from core.timezone import now_warsaw
+from tasks.single_flight import single_flight, get_job_stats
+from tasks.alert_store import store_alerts, alert_payload, publish_alerts, load_tracker, save_tracker
+from tasks.simulation_tick import (
+    SIMULATION_PERIOD, ALERTS_MODE, redis_client, state_store, config_cache, load_first, load_threshold_overrides, run_tick
+)
+
+ALERTS_PERIOD = 10.0
+PERIODIC_JOBS = ('simulate_server_metrics', 'check_alerts', 'cleanup_old_metrics')
 
 DATABASE_URL = os.getenv('DATABASE_URL')
-REDIS_URL = os.getenv('REDIS_URL', 'redis://redis:6379')
+# 'asyncio' when tasks.simulation_runner drives the simulator instead of beat
+SIMULATION_RUNNER = os.getenv('SIMULATION_RUNNER', 'celery')
 
 engine = create_engine(DATABASE_URL) if DATABASE_URL else None
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine) if engine else None
 
-redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-simulation_engine = SimulationEngine()
-
 
 @shared_task
+@single_flight('simulate_server_metrics', period=SIMULATION_PERIOD)
 def simulate_server_metrics():
     if not SessionLocal:
         return "Database not configured"
 
     db = SessionLocal()
     try:
-        sys.path.insert(0, '/backend')
-        from app.models.server import Server, ServerStatus
-        from app.models.server_metrics_history import ServerMetricsHistory
-        from app.models.stress_test_log import StressTestLog
-        from app.models.server_baseline import ServerBaseline
-
-        from app.models.environment import Environment
-
-        servers = db.query(Server).order_by(Server.id).all()
-        baselines = {b.server_id: b for b in db.query(ServerBaseline).all()}
-        environment = db.query(Environment).first()
-
-        running_tests = db.query(StressTestLog).filter(
-            StressTestLog.status == "running"
-        ).all()
-
-        for test in running_tests:
-            elapsed = (now_warsaw() - test.started_at).total_seconds()
-
-            if elapsed >= test.duration_seconds:
-                test.status = "completed"
-                test.completed_at = now_warsaw()
-
-                if test.server_id in simulation_engine.server_states:
-                    state = simulation_engine.server_states[test.server_id]
-                    test.max_cpu_reached = state.cpu_current
-                    test.max_ram_reached = state.ram_current
-                    test.max_temp_reached = state.temperature_current
-
-                db.commit()
-                print(f"[STRESS TEST] Completed test {test.id} for server {test.server_id}")
-            else:
-                if test.server_id not in [e.server_id for e in simulation_engine.pending_events if e.event_type == 'stress_test']:
-                    simulation_engine.trigger_stress_test(
-                        test.server_id,
-                        test.duration_seconds,
-                        test.intensity
-                    )
-                    print(f"[STRESS TEST] Activated test {test.id} for server {test.server_id}")
-
-        metrics_updated = 0
-        for server in servers:
-            is_online = server.status == ServerStatus.ONLINE
-
-            if server.id not in simulation_engine.server_states:
-                simulation_engine.register_server(
-                    server_id=server.id,
-                    is_online=is_online,
-                    current_cpu=server.cpu_usage if is_online else 0.0,
-                    current_ram=server.ram_usage if is_online else 0.0,
-                    current_temp=server.temperature,
-                    uptime=server.uptime if is_online else 0
-                )
-            else:
-                simulation_engine.set_server_status(server.id, is_online)
-
-            if server.id in baselines:
-                baseline = baselines[server.id]
-                simulation_engine.set_load_baseline(server.id, baseline.cpu_baseline, baseline.ram_baseline)
-
-            snapshot = simulation_engine.simulate_tick(server.id, interval_seconds=10)
-
-            server.cpu_usage = snapshot.cpu_usage
-            server.ram_usage = snapshot.ram_usage
-            server.temperature = snapshot.temperature
-            server.uptime = snapshot.uptime
-            server.status = ServerStatus.ONLINE if snapshot.status == 'online' else ServerStatus.OFFLINE
-
-            history = ServerMetricsHistory(
-                server_id=server.id,
-                timestamp=now_warsaw(),
-                cpu_usage=snapshot.cpu_usage,
-                ram_usage=snapshot.ram_usage,
-                temperature=snapshot.temperature,
-                uptime=snapshot.uptime,
-                status=snapshot.status
-            )
-            db.add(history)
-
-            metrics_updated += 1
-
-        if environment:
-            online_servers = [s for s in servers if s.status == ServerStatus.ONLINE]
-
-            if online_servers:
-                avg_server_temp = sum(s.temperature for s in online_servers) / len(online_servers)
-                server_heat_contribution = (avg_server_temp - 40) * 0.15 * len(online_servers)
-            else:
-                server_heat_contribution = 0
-
-            ambient_temp = 22.0
-
-            if environment.ac_status:
-                temp_diff = environment.room_temperature - environment.ac_target_temp
-                cooling_rate = min(0.5, max(0.1, temp_diff * 0.1))
-                target_temp = environment.ac_target_temp + server_heat_contribution * 0.3
-            else:
-                cooling_rate = 0
-                target_temp = ambient_temp + server_heat_contribution
-
-            current_temp = environment.room_temperature
-            if current_temp < target_temp:
-                environment.room_temperature = min(target_temp, current_temp + 0.2)
-            elif current_temp > target_temp:
-                environment.room_temperature = max(target_temp, current_temp - cooling_rate)
-
-            environment.room_temperature = round(max(15, min(45, environment.room_temperature)), 1)
-
-            base_power = 1.5
-
-            server_power = 0.0
-            for server in online_servers:
-                server_power += 0.3 + (server.cpu_usage / 100 * 0.5) + (server.ram_usage / 100 * 0.3)
-
-            ac_power = 0.0
-            if environment.ac_status:
-                temp_diff = environment.room_temperature - environment.ac_target_temp
-                ac_power = 0.5 + max(0, temp_diff * 0.3)
-                ac_power = min(ac_power, 3.0)
-
-            environment.power_consumption = round(base_power + server_power + ac_power, 2)
-
-            if environment.ups_on_battery and environment.ups_battery > 0:
-                ups_capacity_kwh = 10.0
-                drain_per_tick = (environment.power_consumption / ups_capacity_kwh) * (30.0 / 3600.0) * 100.0
-                environment.ups_battery = max(0, environment.ups_battery - drain_per_tick)
-                print(f"[UPS] Battery draining: {environment.ups_battery:.1f}% (drain: {drain_per_tick:.2f}%)")
-
-        db.commit()
-
-        servers_data = []
-        for server in servers:
-            servers_data.append({
-                'id': server.id,
-                'name': server.name,
-                'status': server.status.value,
-                'cpu_usage': server.cpu_usage,
-                'ram_usage': server.ram_usage,
-                'temperature': server.temperature,
-                'uptime': server.uptime
-            })
-
-        environment_data = None
-        if environment:
-            environment_data = {
-                'id': environment.id,
-                'room_temperature': environment.room_temperature,
-                'humidity': environment.humidity,
-                'power_consumption': environment.power_consumption,
-                'ac_status': environment.ac_status,
-                'ac_target_temp': environment.ac_target_temp,
-                'ups_battery': environment.ups_battery,
-                'ups_on_battery': environment.ups_on_battery
-            }
-
-        try:
-            redis_client.publish('metrics_update', json.dumps({
-                'servers': servers_data,
-                'environment': environment_data,
-                'timestamp': time.time()
-            }))
-        except Exception as redis_error:
-            print(f"[WARN] Failed to publish to Redis: {redis_error}")
+        metrics_updated = run_tick(db)
 
         print(f"[WORKER] Updated metrics for {metrics_updated} servers")
         return f"Updated {metrics_updated} servers"
@@ -204,214 +49,47 @@ def simulate_server_metrics():
 
 
 @shared_task
+@single_flight('check_alerts', period=ALERTS_PERIOD)
 def check_alerts():
     if not SessionLocal:
         return "Database not configured"
 
     db = SessionLocal()
     try:
-        sys.path.insert(0, '/backend')
         from app.models.server import Server, ServerStatus
-        from app.models.alert import Alert, AlertLevel
         from app.models.alert_threshold import AlertThreshold
-        from app.models.user import UserRole
-        from datetime import datetime, timedelta
-
         from app.models.environment import Environment
+        from sqlalchemy import select
 
-        thresholds = db.query(AlertThreshold).first()
+        config_cache.sync(('thresholds', 'threshold_overrides'))
+        thresholds = config_cache.get('thresholds', lambda: load_first(db, AlertThreshold))
         if not thresholds:
             print("[WORKER] No alert thresholds configured")
             return "No thresholds configured"
+        overrides = config_cache.get('threshold_overrides', lambda: load_threshold_overrides(db))
 
-        servers = db.query(Server).filter(Server.status == ServerStatus.ONLINE).all()
+        fields = server_fields()
+        rows = db.execute(
+            select(Server.id, Server.name, *(getattr(Server, field) for field in fields))
+            .where(Server.status == ServerStatus.ONLINE)
+            .order_by(Server.id)
+        ).all()
+        fleet = FleetMetrics.from_rows(rows, fields)
         environment = db.query(Environment).first()
-        alerts_generated = 0
-
-        for server in servers:
-            # CPU
-            if server.cpu_usage >= thresholds.cpu_critical_threshold:
-                if not _alert_exists(db, server.name, "Critical CPU Usage", minutes=5):
-                    alert = Alert(
-                        title="Critical CPU Usage",
-                        message=f"{server.name} CPU at {server.cpu_usage:.1f}%",
-                        level=AlertLevel.CRITICAL,
-                        source=server.name,
-                        target_role=UserRole.OPERATOR,
-                        is_read=False
-                    )
-                    db.add(alert)
-                    alerts_generated += 1
-
-            elif server.cpu_usage >= thresholds.cpu_warning_threshold:
-                if not _alert_exists(db, server.name, "High CPU Usage", minutes=5):
-                    alert = Alert(
-                        title="High CPU Usage",
-                        message=f"{server.name} CPU at {server.cpu_usage:.1f}%",
-                        level=AlertLevel.WARNING,
-                        source=server.name,
-                        target_role=UserRole.OPERATOR,
-                        is_read=False
-                    )
-                    db.add(alert)
-                    alerts_generated += 1
-
-            # Temperature
-            if server.temperature >= thresholds.temperature_critical_threshold:
-                if not _alert_exists(db, server.name, "Critical Temperature", minutes=5):
-                    alert = Alert(
-                        title="Critical Temperature",
-                        message=f"{server.name} temperature at {server.temperature:.1f}°C",
-                        level=AlertLevel.CRITICAL,
-                        source=server.name,
-                        target_role=UserRole.TECHNICIAN,
-                        is_read=False
-                    )
-                    db.add(alert)
-                    alerts_generated += 1
-
-            elif server.temperature >= thresholds.temperature_warning_threshold:
-                if not _alert_exists(db, server.name, "High Temperature", minutes=5):
-                    alert = Alert(
-                        title="High Temperature",
-                        message=f"{server.name} temperature at {server.temperature:.1f}°C",
-                        level=AlertLevel.WARNING,
-                        source=server.name,
-                        target_role=UserRole.TECHNICIAN,
-                        is_read=False
-                    )
-                    db.add(alert)
-                    alerts_generated += 1
-
-            # RAM
-            if server.ram_usage >= thresholds.ram_critical_threshold:
-                if not _alert_exists(db, server.name, "Critical RAM Usage", minutes=5):
-                    alert = Alert(
-                        title="Critical RAM Usage",
-                        message=f"{server.name} RAM at {server.ram_usage:.1f}%",
-                        level=AlertLevel.CRITICAL,
-                        source=server.name,
-                        target_role=UserRole.OPERATOR,
-                        is_read=False
-                    )
-                    db.add(alert)
-                    alerts_generated += 1
-
-            elif server.ram_usage >= thresholds.ram_warning_threshold:
-                if not _alert_exists(db, server.name, "High RAM Usage", minutes=5):
-                    alert = Alert(
-                        title="High RAM Usage",
-                        message=f"{server.name} RAM at {server.ram_usage:.1f}%",
-                        level=AlertLevel.WARNING,
-                        source=server.name,
-                        target_role=UserRole.OPERATOR,
-                        is_read=False
-                    )
-                    db.add(alert)
-                    alerts_generated += 1
-
-        if environment:
-            if environment.humidity >= thresholds.humidity_critical_threshold:
-                if not _alert_exists(db, "Environment", "Critical Humidity", minutes=5):
-                    alert = Alert(
-                        title="Critical Humidity",
-                        message=f"Room humidity at {environment.humidity:.1f}%",
-                        level=AlertLevel.CRITICAL,
-                        source="Environment",
-                        target_role=UserRole.TECHNICIAN,
-                        is_read=False
-                    )
-                    db.add(alert)
-                    alerts_generated += 1
-
-            elif environment.humidity >= thresholds.humidity_warning_threshold:
-                if not _alert_exists(db, "Environment", "High Humidity", minutes=5):
-                    alert = Alert(
-                        title="High Humidity",
-                        message=f"Room humidity at {environment.humidity:.1f}%",
-                        level=AlertLevel.WARNING,
-                        source="Environment",
-                        target_role=UserRole.TECHNICIAN,
-                        is_read=False
-                    )
-                    db.add(alert)
-                    alerts_generated += 1
-
-            if environment.ups_on_battery:
-                if not _alert_exists(db, "UPS", "Running on Battery", minutes=10):
-                    alert = Alert(
-                        title="Running on Battery",
-                        message="UPS is running on battery power - AC power lost",
-                        level=AlertLevel.INFO,
-                        source="UPS",
-                        target_role=None,
-                        is_read=False
-                    )
-                    db.add(alert)
-                    alerts_generated += 1
-
-            if environment.ups_battery <= 25 and environment.ups_battery > 0:
-                if not _alert_exists(db, "UPS", "Critical Battery Level", minutes=5):
-                    alert = Alert(
-                        title="Critical Battery Level",
-                        message=f"UPS battery at {environment.ups_battery:.0f}% - immediate action required",
-                        level=AlertLevel.CRITICAL,
-                        source="UPS",
-                        target_role=None,
-                        is_read=False
-                    )
-                    db.add(alert)
-                    alerts_generated += 1
-            elif environment.ups_battery <= 50 and environment.ups_battery > 25:
-                if not _alert_exists(db, "UPS", "Low Battery Level", minutes=5):
-                    alert = Alert(
-                        title="Low Battery Level",
-                        message=f"UPS battery at {environment.ups_battery:.0f}%",
-                        level=AlertLevel.ERROR,
-                        source="UPS",
-                        target_role=None,
-                        is_read=False
-                    )
-                    db.add(alert)
-                    alerts_generated += 1
-            elif environment.ups_battery <= 75 and environment.ups_battery > 50:
-                if not _alert_exists(db, "UPS", "Battery Warning", minutes=5):
-                    alert = Alert(
-                        title="Battery Warning",
-                        message=f"UPS battery at {environment.ups_battery:.0f}%",
-                        level=AlertLevel.WARNING,
-                        source="UPS",
-                        target_role=None,
-                        is_read=False
-                    )
-                    db.add(alert)
-                    alerts_generated += 1
 
+        # Hysteresis and storm state carries over between runs, which may
+        # land on different worker processes.
+        tracker = AlertTracker()
+        load_tracker(state_store.redis, tracker)
+        rules = RuleTable.compile(thresholds, fleet.server_ids, overrides)
+        created, updated = store_alerts(db, rules.evaluate(fleet, environment, tracker=tracker, now=time.time()))
+        changes = [alert_payload(alert) for alert in created + updated]
         db.commit()
+        save_tracker(state_store.redis, tracker)
+        alerts_generated = len(created)
 
-        if alerts_generated > 0:
-            all_alerts = db.query(Alert).filter(Alert.is_read == False).order_by(Alert.created_at.desc()).limit(50).all()
-            alerts_data = []
-            for a in all_alerts:
-                alerts_data.append({
-                    'id': a.id,
-                    'title': a.title,
-                    'message': a.message,
-                    'level': a.level.value,
-                    'source': a.source,
-                    'is_read': a.is_read,
-                    'created_at': a.created_at.isoformat() if a.created_at else None
-                })
-
-            try:
-                redis_client.publish('alerts_update', json.dumps({
-                    'alerts': alerts_data,
-                    'new_count': alerts_generated,
-                    'timestamp': time.time()
-                }))
-                print(f"[WORKER] Published {alerts_generated} new alerts to WebSocket")
-            except Exception as redis_error:
-                print(f"[WARN] Failed to publish alerts to Redis: {redis_error}")
+        if changes:
+            publish_alerts(redis_client, changes, alerts_generated)
 
         print(f"[WORKER] Generated {alerts_generated} new alerts")
         return f"Generated {alerts_generated} alerts"
@@ -423,20 +101,6 @@ def check_alerts():
         db.close()
 
 
-def _alert_exists(db, source: str, title: str, minutes: int = 5):
-    from app.models.alert import Alert
-    from datetime import timedelta
-
-    cutoff = now_warsaw() - timedelta(minutes=minutes)
-    existing = db.query(Alert).filter(
-        Alert.source == source,
-        Alert.title == title,
-        Alert.created_at >= cutoff,
-        Alert.is_read == False
-    ).first()
-    return existing is not None
-
-
 @shared_task
 def execute_scheduled_task(task_id: int):
     if not SessionLocal:
@@ -469,13 +133,13 @@ def generate_random_events():
 
 
 @shared_task
+@single_flight('cleanup_old_metrics', period=86400.0)
 def cleanup_old_metrics():
     if not SessionLocal:
         return "Database not configured"
 
     db = SessionLocal()
     try:
-        sys.path.insert(0, '/backend')
         from app.models.server_metrics_history import ServerMetricsHistory
         from datetime import timedelta
 
@@ -505,7 +169,6 @@ def check_recurring_tasks():
 
     db = SessionLocal()
     try:
-        sys.path.insert(0, '/backend')
         from app.models.scheduled_task import ScheduledTask, TaskStatus
         from datetime import timedelta
 
@@ -542,20 +205,33 @@ def check_recurring_tasks():
     finally:
         db.close()
 
+@shared_task
+def job_stats():
+    return {name: get_job_stats(name) for name in PERIODIC_JOBS + ('simulation_runner',)}
+
+
 from celery.schedules import crontab
 from tasks.celery_app import celery_app
 
 celery_app.conf.beat_schedule = {
-    'simulate-metrics-every-5-seconds': {
-        'task': 'tasks.background_jobs.simulate_server_metrics',
-        'schedule': 5.0,
-    },
-    'check-alerts-every-10-seconds': {
-        'task': 'tasks.background_jobs.check_alerts',
-        'schedule': 10.0,
-    },
     'cleanup-old-metrics-daily': {
         'task': 'tasks.background_jobs.cleanup_old_metrics',
         'schedule': crontab(hour=2, minute=0),
     },
 }
+
+if SIMULATION_RUNNER == 'celery':
+    celery_app.conf.beat_schedule['simulate-metrics-every-5-seconds'] = {
+        'task': 'tasks.background_jobs.simulate_server_metrics',
+        'schedule': SIMULATION_PERIOD,
+        # a tick still queued when the next one is due is dropped
+        'options': {'expires': SIMULATION_PERIOD},
+    }
+
+# With ALERTS_MODE=inline the simulation tick evaluates the rules itself
+if ALERTS_MODE == 'beat':
+    celery_app.conf.beat_schedule['check-alerts-every-10-seconds'] = {
+        'task': 'tasks.background_jobs.check_alerts',
+        'schedule': ALERTS_PERIOD,
+        'options': {'expires': ALERTS_PERIOD},
+    }
@@ -0,0 +1,53 @@
+import time
+from typing import Callable, Dict, Iterable
+
+import redis
+
+CONFIG_KINDS = ('baselines', 'environment', 'thresholds', 'threshold_overrides')
+CONFIG_VERSION_KEY = 'config:version:{kind}'
+
+
+# Per-process cache of rarely changing config rows. The backend bumps
+# config:version:<kind> (and publishes on config_invalidate) after every
+# write, so a tick costs one MGET and only kinds whose version moved are
+# reloaded. Entries also expire after max_age in case a bump was lost.
+# Loaders must return plain values, not ORM objects bound to a session.
+class ConfigCache:
+    def __init__(self, redis_client: redis.Redis, max_age: float = 60.0):
+        self.redis_client = redis_client
+        self.max_age = max_age
+        self._values: Dict[str, object] = {}
+        self._versions: Dict[str, object] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._remote: Dict[str, object] = {}
+        self.reloads: Dict[str, int] = {kind: 0 for kind in CONFIG_KINDS}
+
+    def sync(self, kinds: Iterable[str] = CONFIG_KINDS):
+        kinds = tuple(kinds)
+        try:
+            versions = self.redis_client.mget([CONFIG_VERSION_KEY.format(kind=kind) for kind in kinds])
+        except redis.RedisError as redis_error:
+            print(f"[WARN] Config versions unavailable, reloading config: {redis_error}")
+            for kind in kinds:
+                self.invalidate(kind)
+            return
+
+        for kind, version in zip(kinds, versions):
+            self._remote[kind] = version
+
+    def get(self, kind: str, loader: Callable[[], object]):
+        now = time.monotonic()
+        fresh = (
+            kind in self._values
+            and self._versions.get(kind) == self._remote.get(kind)
+            and now - self._loaded_at[kind] < self.max_age
+        )
+        if not fresh:
+            self._values[kind] = loader()
+            self._versions[kind] = self._remote.get(kind)
+            self._loaded_at[kind] = now
+            self.reloads[kind] += 1
+        return self._values[kind]
+
+    def invalidate(self, kind: str):
+        self._values.pop(kind, None)
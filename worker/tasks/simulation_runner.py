@@ -0,0 +1,219 @@
+import argparse
+import asyncio
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from redis.exceptions import LockError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append('/app')
+sys.path.insert(0, '/backend')
+
+from tasks import simulation_tick
+from tasks.simulation_tick import SIMULATION_PERIOD, TickResult
+from tasks.single_flight import LOCK_KEY, STATS_KEY, redis_client as lock_client
+
+JOB_NAME = 'simulation_runner'
+DATABASE_URL = os.getenv('DATABASE_URL')
+
+
+# Tick start lateness against the schedule, in seconds.
+class JitterStats:
+    def __init__(self, window: int = 720):
+        self.samples = deque(maxlen=window)
+        self.max = 0.0
+
+    def record(self, lateness: float):
+        self.samples.append(lateness)
+        self.max = max(self.max, lateness)
+
+    def summary(self) -> dict:
+        if not self.samples:
+            return {}
+        ordered = sorted(self.samples)
+        return {
+            'jitter_mean_ms': round(sum(ordered) / len(ordered) * 1000, 2),
+            'jitter_p99_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 2),
+            'jitter_max_ms': round(self.max * 1000, 2),
+        }
+
+
+# Long-running alternative to the Celery beat tick. It owns the engine
+# for its whole life and ticks on deadlines start + n * period of the
+# monotonic clock, so lateness never accumulates; a tick that misses
+# whole periods skips them. Reads run in a thread, the engine runs on
+# the event loop, and the writes of tick n (Postgres, state, publish)
+# run on a single persistence thread while tick n+1 sleeps, reads and
+# computes. It holds the simulate_server_metrics lock so queued Celery
+# ticks skip.
+class SimulationRunner:
+    def __init__(self, session_factory, period: float = SIMULATION_PERIOD, report_every: int = 12):
+        self.session_factory = session_factory
+        self.period = period
+        self.report_every = report_every
+        self.jitter = JitterStats()
+        self.runs = 0
+        self.overruns = 0
+        self.skipped = 0
+        self._stopping = asyncio.Event()
+        self._persist_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='simulation-persist')
+        self._lock = lock_client.lock(
+            LOCK_KEY.format(name='simulate_server_metrics'),
+            timeout=max(30.0, period * 6),
+            blocking=False
+        )
+
+    def stop(self):
+        self._stopping.set()
+
+    def _hold_lock(self):
+        try:
+            self._lock.reacquire()
+        except LockError:
+            if not self._lock.acquire():
+                raise RuntimeError("simulate_server_metrics lock is held by another process")
+
+    def _read(self):
+        db = self.session_factory()
+        try:
+            return simulation_tick.read_inputs(db)
+        finally:
+            db.close()
+
+    def _persist(self, result: TickResult) -> int:
+        db = self.session_factory()
+        try:
+            return simulation_tick.persist_tick(db, result)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # Returns False when the tick was discarded
+    async def _finish(self, pending: Optional[asyncio.Future], result: Optional[TickResult]) -> bool:
+        if pending is None:
+            return True
+        try:
+            await pending
+            return True
+        except Exception as e:
+            print(f"[ERROR] Failed to persist simulation tick: {e}")
+            simulation_tick.discard_tick(result)
+            return False
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while not self._lock.acquire():
+            print("[RUNNER] Waiting for running simulate_server_metrics to release its lock")
+            await asyncio.sleep(self.period)
+
+        db = self.session_factory()
+        try:
+            print(f"[RUNNER] Primed {simulation_tick.prime(db)} servers")
+        finally:
+            db.close()
+
+        start = loop.time()
+        tick = 0
+        pending, pending_result = None, None
+
+        try:
+            while not self._stopping.is_set():
+                deadline = start + tick * self.period
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=max(0.0, deadline - loop.time()))
+                    break
+                except asyncio.TimeoutError:
+                    pass
+
+                began = loop.time()
+                self.jitter.record(began - deadline)
+
+                result = None
+                try:
+                    self._hold_lock()
+                    inputs = await asyncio.to_thread(self._read)
+                    simulation_tick.apply_inputs(inputs)
+                    result = simulation_tick.compute_tick(inputs)
+                except Exception as e:
+                    print(f"[ERROR] Failed to simulate metrics: {e}")
+                    simulation_tick.discard_tick(result)
+                    result = None
+
+                # Writes stay in tick order: wait for the previous tick's
+                # persistence before queueing this one.
+                if not await self._finish(pending, pending_result) and result is not None:
+                    simulation_tick.rebase_tick(result, pending_result)
+                pending, pending_result = None, None
+                if result is not None:
+                    pending = loop.run_in_executor(self._persist_executor, self._persist, result)
+                    pending_result = result
+
+                self.runs += 1
+                elapsed = loop.time() - began
+                if elapsed > self.period:
+                    self.overruns += 1
+                    print(f"[WARN] {JOB_NAME}: tick took {elapsed:.2f}s, longer than its {self.period}s period")
+
+                tick += 1
+                behind = int((loop.time() - start) / self.period) - tick
+                if behind > 0:
+                    self.skipped += behind
+                    tick += behind
+
+                self._record(elapsed)
+                if self.runs % self.report_every == 0:
+                    print(f"[RUNNER] {self.runs} ticks, {self.overruns} overruns, {self.skipped} skipped, {self.jitter.summary()}")
+        finally:
+            await self._finish(pending, pending_result)
+            self._persist_executor.shutdown(wait=True)
+            try:
+                self._lock.release()
+            except Exception as e:
+                print(f"[WARN] {JOB_NAME}: failed to release lock: {e}")
+
+    def _record(self, elapsed: float):
+        try:
+            lock_client.hset(STATS_KEY.format(name=JOB_NAME), mapping={
+                'runs': self.runs,
+                'overruns': self.overruns,
+                'skipped': self.skipped,
+                'last_started_at': time.time() - elapsed,
+                'last_duration_ms': round(elapsed * 1000, 1),
+                **self.jitter.summary(),
+            })
+        except Exception as e:
+            print(f"[WARN] {JOB_NAME}: failed to record stats: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the simulator on a drift-free asyncio schedule")
+    parser.add_argument('--period', type=float, default=SIMULATION_PERIOD)
+    parser.add_argument('--report-every', type=int, default=12, help="log jitter every N ticks")
+    args = parser.parse_args()
+
+    if not DATABASE_URL:
+        sys.exit("DATABASE_URL is not set")
+
+    engine = create_engine(DATABASE_URL)
+    runner = SimulationRunner(sessionmaker(autocommit=False, autoflush=False, bind=engine),
+                              period=args.period, report_every=args.report_every)
+
+    async def serve():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, runner.stop)
+        await runner.run()
+
+    asyncio.run(serve())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,550 @@
+import json
+import os
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import numpy as np
+import redis
+from sqlalchemy import select, update
+
+from simulator.engine import SimulationEngine
+from simulator.fleet import FleetSnapshot
+from simulator.models import SimulationEvent
+from simulator.store import RedisStateStore, BLOB_PREFIX
+from simulator.replay import RecordingEngine, process_recording_path
+from simulator.room import step_room
+from simulator.persistence import copy_history, update_servers
+from simulator.commands import read_commands, latest_command_id, apply_command
+from simulator.deltas import MetricsDeltaEncoder
+from alerting.rules import FleetMetrics, RuleTable, server_fields
+from alerting.tracker import AlertTracker
+from core.timezone import now_warsaw
+from tasks.alert_store import store_alerts, alert_payload, publish_alerts
+from tasks.config_cache import ConfigCache
+
+SIMULATION_PERIOD = 5.0
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://redis:6379')
+SIMULATOR_SEED = int(os.getenv('SIMULATOR_SEED')) if os.getenv('SIMULATOR_SEED') else None
+SIMULATOR_RECORD_PATH = os.getenv('SIMULATOR_RECORD_PATH')
+METRICS_EPSILON = float(os.getenv('METRICS_EPSILON', '0.5'))
+METRICS_KEYFRAME_INTERVAL = int(os.getenv('METRICS_KEYFRAME_INTERVAL', '12'))
+METRICS_ENCODING = os.getenv('METRICS_ENCODING', 'json')
+KEYFRAME_REQUEST_KEY = 'metrics:keyframe_requested'
+METRICS_BLOB_PREFIX = 'metrics.'
+ALERTS_BLOB_PREFIX = 'alerts.'
+# 'inline' evaluates alert rules on every tick's in-memory results instead
+# of the separate check_alerts beat job
+ALERTS_MODE = os.getenv('ALERTS_MODE', 'beat')
+
+redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+if SIMULATOR_RECORD_PATH:
+    simulation_engine = RecordingEngine(seed=SIMULATOR_SEED)
+else:
+    simulation_engine = SimulationEngine(seed=SIMULATOR_SEED)
+state_store = RedisStateStore(redis.from_url(REDIS_URL))
+config_cache = ConfigCache(redis_client)
+metrics_encoder = MetricsDeltaEncoder(epsilon=METRICS_EPSILON, keyframe_interval=METRICS_KEYFRAME_INTERVAL)
+# Inline mode only; saved with the simulator state like the delta baseline
+alert_tracker = AlertTracker()
+
+
+# Configured load baselines as parallel arrays, built once per cache
+# reload and applied to the fleet in one step every tick.
+@dataclass(slots=True)
+class LoadBaselines:
+    server_ids: np.ndarray
+    cpu: np.ndarray
+    ram: np.ndarray
+
+
+# Everything a tick reads from Postgres and Redis. Gathered without
+# touching the engine, so it can be fetched off the engine's thread.
+@dataclass(slots=True)
+class TickInputs:
+    servers: list
+    baselines: LoadBaselines
+    environment: Optional[SimpleNamespace]
+    commands: List[dict]
+    command_cursor: str
+    running_tests: Optional[list]
+    force_keyframe: bool
+    thresholds: Optional[SimpleNamespace] = None
+    threshold_overrides: Optional[dict] = None
+
+
+# Everything a tick writes, already serialized, so persisting it never
+# reads engine state.
+@dataclass(slots=True)
+class TickResult:
+    snapshot: FleetSnapshot
+    environment: Optional[dict]
+    completed_tests: List[dict]
+    finished_events: List[SimulationEvent]
+    message: dict
+    state: Dict[str, bytes]
+    alert_candidates: list
+    # Inline mode: the alert tracker as it was before this tick, put back
+    # if the tick's alerts never reach the database
+    alert_tracker_before: Optional[Dict[str, bytes]] = None
+
+
+def load_simulator_state() -> bool:
+    try:
+        if state_store.load(simulation_engine):
+            print(f"[WORKER] Restored simulator state v{state_store.version} ({len(simulation_engine.fleet)} servers)")
+            metrics_encoder.restore({
+                name[len(METRICS_BLOB_PREFIX):]: value
+                for name, value in state_store.blobs.items()
+                if name.startswith(METRICS_BLOB_PREFIX)
+            })
+            alert_tracker.restore({
+                name[len(ALERTS_BLOB_PREFIX):]: value
+                for name, value in state_store.blobs.items()
+                if name.startswith(ALERTS_BLOB_PREFIX)
+            })
+            return True
+    except Exception as redis_error:
+        print(f"[WARN] Failed to load simulator state from Redis: {redis_error}")
+    return False
+
+
+# Cached config is detached from the session: plain namespaces holding
+# the table's columns.
+def load_rows(db, model, *criteria):
+    rows = db.execute(select(*model.__table__.columns).where(*criteria)).mappings().all()
+    return [SimpleNamespace(**row) for row in rows]
+
+
+def load_first(db, model):
+    rows = load_rows(db, model)
+    return rows[0] if rows else None
+
+
+def _load_baselines(db) -> LoadBaselines:
+    from app.models.server_baseline import ServerBaseline
+
+    rows = db.execute(select(ServerBaseline.server_id, ServerBaseline.cpu_baseline, ServerBaseline.ram_baseline)).all()
+    return LoadBaselines(
+        server_ids=np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)),
+        cpu=np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows)),
+        ram=np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows))
+    )
+
+
+# server_id -> metric -> level -> threshold, as RuleTable.compile takes it.
+def load_threshold_overrides(db) -> dict:
+    from app.models.alert_threshold_override import AlertThresholdOverride
+
+    overrides = {}
+    for row in load_rows(db, AlertThresholdOverride):
+        overrides.setdefault(row.server_id, {})[row.metric] = {
+            'warning': row.warning_threshold,
+            'critical': row.critical_threshold,
+        }
+    return overrides
+
+
+def _keyframe_requested() -> bool:
+    try:
+        return redis_client.getdel(KEYFRAME_REQUEST_KEY) is not None
+    except Exception as redis_error:
+        print(f"[WARN] Failed to check for keyframe requests: {redis_error}")
+        return False
+
+
+# Plain rows instead of ORM objects: the tick is written back with
+# set-based statements, so nothing needs the identity map.
+def _load_servers(db) -> list:
+    from app.models.server import Server
+
+    return db.execute(
+        select(
+            Server.id, Server.name, Server.status,
+            Server.cpu_usage, Server.ram_usage, Server.temperature, Server.uptime
+        ).order_by(Server.id)
+    ).all()
+
+
+def read_inputs(db) -> TickInputs:
+    from app.models.environment import Environment
+    from app.models.stress_test_log import StressTestLog
+    from app.models.alert_threshold import AlertThreshold
+
+    alerts_inline = ALERTS_MODE == 'inline'
+    config_cache.sync(
+        ('baselines', 'environment', 'thresholds', 'threshold_overrides') if alerts_inline
+        else ('baselines', 'environment')
+    )
+    servers = _load_servers(db)
+
+    # With no saved stream position (fresh Redis) the running tests are
+    # taken from the database once and the stream is followed from its
+    # current end.
+    cursor = state_store.meta.get('command_cursor')
+    running_tests = None
+    if cursor is None:
+        cursor = latest_command_id(redis_client)
+        running_tests = db.execute(
+            select(
+                StressTestLog.id, StressTestLog.server_id, StressTestLog.started_at,
+                StressTestLog.duration_seconds, StressTestLog.intensity
+            ).where(StressTestLog.status == "running")
+        ).all()
+    commands, cursor = read_commands(redis_client, cursor)
+
+    return TickInputs(
+        servers=servers,
+        baselines=config_cache.get('baselines', lambda: _load_baselines(db)),
+        environment=config_cache.get('environment', lambda: load_first(db, Environment)),
+        commands=commands,
+        command_cursor=cursor,
+        running_tests=running_tests,
+        force_keyframe=_keyframe_requested(),
+        thresholds=config_cache.get('thresholds', lambda: load_first(db, AlertThreshold)) if alerts_inline else None,
+        threshold_overrides=(
+            config_cache.get('threshold_overrides', lambda: load_threshold_overrides(db)) if alerts_inline else None
+        )
+    )
+
+
+# Status and baselines are assigned to the fleet arrays in one step; only
+# servers the engine has not seen yet are registered one by one.
+def _sync_servers(servers: list, baselines: LoadBaselines):
+    from app.models.server import ServerStatus
+
+    server_ids = np.fromiter((server.id for server in servers), dtype=np.int64, count=len(servers))
+    online = np.fromiter((server.status == ServerStatus.ONLINE for server in servers), dtype=bool, count=len(servers))
+
+    removed = simulation_engine.prune_servers(server_ids)
+    if removed:
+        print(f"[WORKER] Evicted {removed} deleted servers from simulator")
+
+    if len(simulation_engine.fleet) < len(servers):
+        for server in servers:
+            if simulation_engine.has_server(server.id):
+                continue
+            is_online = server.status == ServerStatus.ONLINE
+            simulation_engine.register_server(
+                server_id=server.id,
+                is_online=is_online,
+                current_cpu=server.cpu_usage if is_online else 0.0,
+                current_ram=server.ram_usage if is_online else 0.0,
+                current_temp=server.temperature,
+                uptime=server.uptime if is_online else 0
+            )
+
+    simulation_engine.set_fleet_status(server_ids, online)
+    simulation_engine.set_load_baselines(baselines.server_ids, baselines.cpu, baselines.ram)
+
+
+def apply_inputs(inputs: TickInputs):
+    _sync_servers(inputs.servers, inputs.baselines)
+
+    for test in inputs.running_tests or ():
+        if not simulation_engine.has_active_stress_test(test.server_id):
+            simulation_engine.trigger_stress_test(
+                test.server_id, test.duration_seconds, test.intensity,
+                test_id=test.id, start_time=test.started_at
+            )
+
+    for command in inputs.commands:
+        applied = apply_command(simulation_engine, command)
+        if applied:
+            print(f"[STRESS TEST] {applied}")
+    state_store.meta['command_cursor'] = inputs.command_cursor
+
+
+def _collect_completed_tests(events: List[SimulationEvent]) -> List[dict]:
+    completed = []
+    for event in events:
+        if event.event_type != 'stress_test':
+            continue
+
+        values = {'status': "completed", 'completed_at': now_warsaw()}
+        state = simulation_engine.get_state(event.server_id)
+        if state:
+            values.update(
+                max_cpu_reached=state.cpu_current,
+                max_ram_reached=state.ram_current,
+                max_temp_reached=state.temperature_current
+            )
+        completed.append({'test_id': event.params.get('test_id'), 'server_id': event.server_id, 'values': values})
+    return completed
+
+
+def _metrics_message(frame, snapshot, names) -> dict:
+    indices = frame.indices
+    if frame.keyframe:
+        indices = indices[np.argsort(snapshot.server_ids[indices], kind='stable')]
+
+    rows = zip(
+        snapshot.server_ids[indices].tolist(),
+        snapshot.is_online[indices].tolist(),
+        np.round(snapshot.cpu_usage[indices], 2).tolist(),
+        np.round(snapshot.ram_usage[indices], 2).tolist(),
+        np.round(snapshot.temperature[indices], 2).tolist(),
+        snapshot.uptime[indices].tolist()
+    )
+    servers_data = []
+    for server_id, online, cpu, ram, temp, uptime in rows:
+        row = {
+            'id': server_id,
+            'status': 'online' if online else 'offline',
+            'cpu_usage': cpu,
+            'ram_usage': ram,
+            'temperature': temp,
+            'uptime': uptime
+        }
+        if frame.keyframe:
+            row['name'] = names.get(server_id)
+        servers_data.append(row)
+
+    return {
+        'kind': 'keyframe' if frame.keyframe else 'delta',
+        'sequence': frame.sequence,
+        'servers': servers_data,
+        'environment': frame.environment,
+        'timestamp': time.time()
+    }
+
+
+# Alert rules against this tick's online servers and room, before any of
+# it is written back.
+def _alert_candidates(inputs: TickInputs, snapshot: FleetSnapshot, environment) -> list:
+    if not inputs.thresholds:
+        return []
+
+    online = snapshot.is_online
+    names = {server.id: server.name for server in inputs.servers}
+    fleet = FleetMetrics(
+        server_ids=snapshot.server_ids[online],
+        names=[names.get(server_id, f"Server {server_id}") for server_id in snapshot.server_ids[online].tolist()],
+        values={field: getattr(snapshot, field)[online] for field in server_fields()}
+    )
+    rules = RuleTable.compile(inputs.thresholds, fleet.server_ids, inputs.threshold_overrides)
+    candidates = rules.evaluate(fleet, environment, tracker=alert_tracker, now=time.time())
+    _store_tracker_blobs()
+    return candidates
+
+
+def _store_tracker_blobs():
+    for name in [name for name in state_store.blobs if name.startswith(ALERTS_BLOB_PREFIX)]:
+        del state_store.blobs[name]
+    state_store.blobs.update({
+        ALERTS_BLOB_PREFIX + name: value for name, value in alert_tracker.to_buffers().items()
+    })
+
+
+# The tracker only knows an alert fired; whether its row was written is
+# decided in persist_tick. When that fails, forget what this tick fired
+# so the alerts fire again next tick instead of being held as active.
+# A rollback can only make alerts fire again, which store_alerts dedups.
+def _restore_tracker(buffers: Optional[Dict[str, bytes]]):
+    if buffers is None:
+        return
+    alert_tracker.restore(buffers)
+    _store_tracker_blobs()
+
+
+def compute_tick(inputs: TickInputs) -> TickResult:
+    tracker_before = alert_tracker.to_buffers() if inputs.thresholds else None
+    try:
+        return _compute_tick(inputs, tracker_before)
+    except Exception:
+        _restore_tracker(tracker_before)
+        raise
+
+
+def _compute_tick(inputs: TickInputs, tracker_before: Optional[Dict[str, bytes]]) -> TickResult:
+    environment = inputs.environment
+
+    fleet_snapshot = simulation_engine.simulate_fleet_tick(
+        room_temperature=environment.room_temperature if environment else None
+    )
+    finished_events = simulation_engine.drain_finished_events()
+
+    environment_data = None
+    if environment:
+        online = fleet_snapshot.is_online
+        drain_per_tick = step_room(
+            environment,
+            fleet_snapshot.temperature[online],
+            fleet_snapshot.cpu_usage[online],
+            fleet_snapshot.ram_usage[online]
+        )
+        if drain_per_tick is not None:
+            print(f"[UPS] Battery draining: {environment.ups_battery:.1f}% (drain: {drain_per_tick:.2f}%)")
+
+        environment_data = {
+            'id': environment.id,
+            'room_temperature': environment.room_temperature,
+            'humidity': environment.humidity,
+            'power_consumption': environment.power_consumption,
+            'ac_status': environment.ac_status,
+            'ac_target_temp': environment.ac_target_temp,
+            'ups_battery': environment.ups_battery,
+            'ups_on_battery': environment.ups_on_battery
+        }
+
+    # Encoded before the state is serialized: the delta baseline is part of it.
+    frame = metrics_encoder.encode(fleet_snapshot, environment_data, force_keyframe=inputs.force_keyframe)
+    state_store.blobs.update({
+        METRICS_BLOB_PREFIX + name: value for name, value in metrics_encoder.to_buffers().items()
+    })
+
+    # Before the state is serialized: the tracker is part of it.
+    alert_candidates = _alert_candidates(inputs, fleet_snapshot, environment)
+
+    # Only the process that ran the tick writes, and only what it recorded
+    # since its last tick.
+    if SIMULATOR_RECORD_PATH:
+        simulation_engine.recording.flush(process_recording_path(SIMULATOR_RECORD_PATH))
+
+    return TickResult(
+        snapshot=fleet_snapshot,
+        environment=environment_data,
+        completed_tests=_collect_completed_tests(finished_events),
+        finished_events=finished_events,
+        message=_metrics_message(frame, fleet_snapshot, {server.id: server.name for server in inputs.servers}),
+        state=state_store.prepare(simulation_engine),
+        alert_candidates=alert_candidates,
+        alert_tracker_before=tracker_before
+    )
+
+
+def _publish_metrics(message: dict):
+    if METRICS_ENCODING == 'msgpack':
+        import msgpack
+
+        # Already wrapped for the browser, so the API forwards it untouched
+        redis_client.publish('metrics_update:msgpack', msgpack.packb({'type': 'metrics_update', 'data': message}))
+    else:
+        redis_client.publish('metrics_update', json.dumps(message))
+
+
+def persist_tick(db, result: TickResult) -> int:
+    from app.models.environment import Environment
+    from app.models.stress_test_log import StressTestLog
+
+    cursor = db.connection().connection.cursor()
+    metrics_updated = update_servers(cursor, result.snapshot)
+    copy_history(cursor, result.snapshot)
+
+    if result.environment:
+        db.execute(
+            update(Environment)
+            .where(Environment.id == result.environment['id'])
+            .values(
+                room_temperature=result.environment['room_temperature'],
+                power_consumption=result.environment['power_consumption'],
+                ups_battery=result.environment['ups_battery']
+            )
+        )
+
+    completed_updates = []
+    for completed in result.completed_tests:
+        # Only tests still marked running: a cancelled test keeps its status.
+        criteria = [StressTestLog.status == "running"]
+        if completed['test_id'] is not None:
+            criteria.append(StressTestLog.id == completed['test_id'])
+        else:
+            criteria.append(StressTestLog.server_id == completed['server_id'])
+
+        values = completed['values']
+        if db.execute(update(StressTestLog).where(*criteria).values(**values)).rowcount:
+            print(f"[STRESS TEST] Completed test {completed['test_id']} for server {completed['server_id']}")
+            completed_updates.append({
+                'event': 'completed',
+                'test_id': completed['test_id'],
+                'server_id': completed['server_id'],
+                'max_cpu': values.get('max_cpu_reached'),
+                'max_ram': values.get('max_ram_reached'),
+                'max_temp': values.get('max_temp_reached')
+            })
+
+    created_alerts, updated_alerts = store_alerts(db, result.alert_candidates)
+    alert_changes = [alert_payload(alert) for alert in created_alerts + updated_alerts]
+
+    db.commit()
+
+    try:
+        state_store.write(result.state)
+    except Exception as redis_error:
+        print(f"[WARN] Failed to save simulator state to Redis: {redis_error}")
+
+    try:
+        _publish_metrics(result.message)
+        for completed in completed_updates:
+            redis_client.publish('stress_test_update', json.dumps(completed))
+    except Exception as redis_error:
+        print(f"[WARN] Failed to publish to Redis: {redis_error}")
+
+    if alert_changes:
+        print(f"[WORKER] Generated {len(created_alerts)} new alerts")
+        publish_alerts(redis_client, alert_changes, len(created_alerts))
+
+    return metrics_updated
+
+
+# Undo what a failed persist leaves behind in memory: completions are
+# retried next tick, the environment is reloaded from the database and
+# the alert tracker forgets the alerts that were not stored.
+def discard_tick(result: Optional[TickResult]):
+    if result is not None:
+        simulation_engine.finished_events[:0] = result.finished_events
+        _restore_tracker(result.alert_tracker_before)
+    config_cache.invalidate('environment')
+
+
+# For a runner that computes the next tick before the previous one's
+# persist result is known: after discarding `discarded`, the already
+# computed `result` must not carry its tracker state forward, neither as
+# its rollback point nor in the simulator state it saves.
+def rebase_tick(result: TickResult, discarded: TickResult):
+    if discarded.alert_tracker_before is None:
+        return
+    result.alert_tracker_before = discarded.alert_tracker_before
+    prefix = BLOB_PREFIX + ALERTS_BLOB_PREFIX
+    for name in [name for name in result.state if name.startswith(prefix)]:
+        del result.state[name]
+    result.state.update({prefix + name: value for name, value in alert_tracker.to_buffers().items()})
+
+
+# Loads the shared state, fills the config cache and registers the fleet
+# without consuming the commands or keyframe requests meant for the next
+# tick. Returns the number of servers known to the engine.
+def prime(db) -> int:
+    from app.models.environment import Environment
+    from app.models.alert_threshold import AlertThreshold
+
+    if load_simulator_state():
+        config_cache.invalidate('environment')
+    config_cache.sync()
+
+    baselines = config_cache.get('baselines', lambda: _load_baselines(db))
+    config_cache.get('environment', lambda: load_first(db, Environment))
+    config_cache.get('thresholds', lambda: load_first(db, AlertThreshold))
+    config_cache.get('threshold_overrides', lambda: load_threshold_overrides(db))
+    _sync_servers(_load_servers(db), baselines)
+    return len(simulation_engine.fleet)
+
+
+def run_tick(db) -> int:
+    # The environment's room/power/UPS readings are advanced by whichever
+    # process ran the last tick, so a cached copy is only trusted while
+    # this process is the one that saved the simulator state.
+    if load_simulator_state():
+        config_cache.invalidate('environment')
+
+    result = None
+    try:
+        inputs = read_inputs(db)
+        apply_inputs(inputs)
+        result = compute_tick(inputs)
+        return persist_tick(db, result)
+    except Exception:
+        discard_tick(result)
+        raise
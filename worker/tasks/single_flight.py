@@ -0,0 +1,97 @@
+import functools
+import os
+import time
+from typing import Dict
+
+import redis
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://redis:6379')
+STATS_KEY = 'worker:jobs:{name}'
+LOCK_KEY = 'lock:job:{name}'
+
+redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+
+
+# Runs a periodic job at most once at a time across all workers.
+#  - a run that finds the lock held is skipped (skipped_locked)
+#  - a run that starts less than stale_fraction * period after the last
+#    one started is a backlog duplicate and is coalesced (skipped_stale)
+#  - a run that takes longer than its period counts as an overrun
+# Counters live in the worker:jobs:<name> hash. If Redis is down the job
+# runs unguarded rather than not at all.
+def single_flight(name: str, period: float, lock_timeout: float = None, stale_fraction: float = 0.5):
+    lock_timeout = lock_timeout or max(30.0, period * 6)
+    stats_key = STATS_KEY.format(name=name)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                lock = redis_client.lock(LOCK_KEY.format(name=name), timeout=lock_timeout, blocking=False)
+                acquired = lock.acquire()
+            except redis.RedisError as redis_error:
+                print(f"[WARN] {name}: single-flight lock unavailable, running unguarded: {redis_error}")
+                return func(*args, **kwargs)
+
+            if not acquired:
+                _incr(stats_key, 'skipped_locked')
+                print(f"[WORKER] {name}: previous run still in progress, skipping")
+                return "Skipped: already running"
+
+            try:
+                if _is_stale(stats_key, period * stale_fraction):
+                    _incr(stats_key, 'skipped_stale')
+                    print(f"[WORKER] {name}: stale queued run coalesced")
+                    return "Skipped: stale"
+
+                started = time.time()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    finished = time.time()
+                    _record_run(stats_key, started, finished)
+                    duration = finished - started
+                    if duration > period:
+                        _incr(stats_key, 'overruns')
+                        print(f"[WARN] {name}: run took {duration:.2f}s, longer than its {period}s period")
+            finally:
+                try:
+                    lock.release()
+                except redis.RedisError as redis_error:
+                    print(f"[WARN] {name}: failed to release lock: {redis_error}")
+
+        return wrapper
+    return decorator
+
+
+def _is_stale(stats_key: str, min_gap: float) -> bool:
+    try:
+        last_started = redis_client.hget(stats_key, 'last_started_at')
+    except redis.RedisError:
+        return False
+    return last_started is not None and time.time() - float(last_started) < min_gap
+
+
+def _record_run(stats_key: str, started: float, finished: float):
+    try:
+        pipe = redis_client.pipeline()
+        pipe.hincrby(stats_key, 'runs', 1)
+        pipe.hset(stats_key, mapping={
+            'last_started_at': started,
+            'last_finished_at': finished,
+            'last_duration_ms': round((finished - started) * 1000, 1),
+        })
+        pipe.execute()
+    except redis.RedisError as redis_error:
+        print(f"[WARN] Failed to record job run: {redis_error}")
+
+
+def _incr(stats_key: str, field: str):
+    try:
+        redis_client.hincrby(stats_key, field, 1)
+    except redis.RedisError:
+        pass
+
+
+def get_job_stats(name: str) -> Dict[str, str]:
+    return redis_client.hgetall(STATS_KEY.format(name=name))
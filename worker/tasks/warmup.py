@@ -0,0 +1,53 @@
+import time
+
+from celery.signals import worker_process_init
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from tasks import background_jobs, simulation_tick
+from tasks.single_flight import redis_client as lock_client
+
+
+# Runs once in every prefork child before it accepts a task, so the first
+# tick after a deploy or autoscale costs what every later one does:
+# backend models imported and mappers configured, a pooled Postgres
+# connection and the Redis connections open, the simulator state loaded
+# and the config cache filled. Each step fails soft; the tasks redo
+# whatever is missing on first use.
+@worker_process_init.connect
+def warm_up(**kwargs):
+    started = time.perf_counter()
+
+    try:
+        import app.models  # noqa: F401 -- registers every mapper
+        configure_mappers()
+    except Exception as e:
+        print(f"[WARN] Warm-up: failed to load backend models: {e}")
+        return
+
+    for client in (simulation_tick.redis_client, simulation_tick.state_store.redis, lock_client):
+        try:
+            client.ping()
+        except Exception as redis_error:
+            print(f"[WARN] Warm-up: Redis unavailable: {redis_error}")
+            break
+
+    if not background_jobs.SessionLocal:
+        return
+
+    try:
+        with background_jobs.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except Exception as e:
+        print(f"[WARN] Warm-up: database unavailable: {e}")
+        return
+
+    db = background_jobs.SessionLocal()
+    try:
+        servers = simulation_tick.prime(db)
+        print(f"[WORKER] Warm-up done in {(time.perf_counter() - started) * 1000:.0f} ms ({servers} servers primed)")
+    except Exception as e:
+        print(f"[WARN] Warm-up: failed to prime simulator: {e}")
+        db.rollback()
+    finally:
+        db.close()
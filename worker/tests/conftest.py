@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The worker runs with its own directory on sys.path (/app in the image)
+# and the backend tree next to it (/backend)
+WORKER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, WORKER_DIR)
+sys.path.insert(1, os.path.join(os.path.dirname(WORKER_DIR), 'backend'))
@@ -0,0 +1,167 @@
+from dataclasses import replace
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from alerting.rules import RULE_SPECS, Band, FleetMetrics, RuleSpec, RuleTable, GROUP_SOURCE
+from alerting.tracker import AlertTracker
+
+CPU = RuleSpec('cpu', 'cpu_usage', 'server',
+               (Band('critical', "Critical CPU", threshold=95.0), Band('warning', "High CPU", threshold=85.0)),
+               "{name} CPU at {value:.1f}%", 'operator', hysteresis=5.0)
+BATTERY = RuleSpec('ups_battery', 'ups_battery', 'environment',
+                   (Band('critical', "Critical Battery", threshold=25.0), Band('warning', "Battery Warning", threshold=75.0)),
+                   "UPS battery at {value:.0f}%", None, direction='below', floor=0.0, source="UPS", hysteresis=2.0)
+
+
+def compile_rule(spec, servers=1):
+    return RuleTable.compile(None, np.arange(1, servers + 1, dtype=np.int64), specs=[spec]).rules[0]
+
+
+def step(tracker, rule, values, now=0.0):
+    values = np.asarray(values, dtype=np.float64)
+    entity_ids = np.arange(1, len(values) + 1, dtype=np.int64)
+    fired, bands, groups = tracker.update(rule, entity_ids, values, now)
+    return fired.tolist(), bands.tolist(), groups
+
+
+def test_overrides_apply_to_the_shared_overridable_metrics_only():
+    from app.core.alert_metrics import OVERRIDABLE_METRICS
+
+    assert set(OVERRIDABLE_METRICS) <= {spec.metric for spec in RULE_SPECS if spec.scope == 'server'}
+
+    humidity = replace(CPU, metric='humidity')
+    overrides = {2: {'cpu': {'warning': 50.0}, 'humidity': {'warning': 50.0}}}
+    cpu_rule, humidity_rule = RuleTable.compile(None, np.array([1, 2]), overrides, specs=[CPU, humidity]).rules
+    assert cpu_rule.thresholds.tolist() == [[95.0, 95.0], [85.0, 50.0]]
+    assert humidity_rule.thresholds.tolist() == [[95.0, 95.0], [85.0, 85.0]]
+
+
+def test_fires_once_while_held_within_hysteresis():
+    tracker, rule = AlertTracker(), compile_rule(CPU)
+
+    assert step(tracker, rule, [86.0])[0] == [0]
+    # back under the threshold but within 5 points of it: still active, no repeat
+    assert step(tracker, rule, [82.0]) == ([], [1], [])
+    assert step(tracker, rule, [86.0]) == ([], [1], [])
+
+
+def test_releases_past_hysteresis_and_fires_again():
+    tracker, rule = AlertTracker(), compile_rule(CPU)
+
+    step(tracker, rule, [86.0])
+    assert step(tracker, rule, [79.0]) == ([], [-1], [])
+    assert step(tracker, rule, [86.0])[0] == [0]
+
+
+def test_escalation_fires_and_deescalation_is_held():
+    tracker, rule = AlertTracker(), compile_rule(CPU)
+
+    step(tracker, rule, [86.0])
+    assert step(tracker, rule, [96.0]) == ([0], [0], [])
+    # 91 is within hysteresis of the critical band: stays critical
+    assert step(tracker, rule, [91.0]) == ([], [0], [])
+    # below 90 falls back to the warning band without a new alert
+    assert step(tracker, rule, [88.0]) == ([], [1], [])
+
+
+def test_below_rule_holds_above_its_threshold():
+    tracker, rule = AlertTracker(), compile_rule(BATTERY)
+
+    assert step(tracker, rule, [70.0])[0] == [0]
+    assert step(tracker, rule, [76.0]) == ([], [1], [])
+    assert step(tracker, rule, [78.0]) == ([], [-1], [])
+
+
+@pytest.mark.parametrize('second_run, fires', [(5.0, False), (9.9, True), (10.0, True)])
+def test_min_duration_tolerates_early_runs(second_run, fires):
+    tracker = AlertTracker()
+    rule = compile_rule(replace(CPU, min_duration=10.0))
+
+    assert step(tracker, rule, [86.0], now=0.0)[0] == []
+    assert (step(tracker, rule, [86.0], now=second_run)[0] == [0]) is fires
+
+
+def test_min_duration_restarts_when_the_match_drops():
+    tracker = AlertTracker()
+    rule = compile_rule(replace(CPU, min_duration=10.0))
+
+    step(tracker, rule, [86.0], now=0.0)
+    step(tracker, rule, [50.0], now=5.0)
+    assert step(tracker, rule, [86.0], now=10.0)[0] == []
+    assert step(tracker, rule, [86.0], now=20.0)[0] == [0]
+
+
+def test_storm_replaces_individual_alerts_with_a_growing_group():
+    spec = replace(CPU, storm_size=4)
+    tracker, rule = AlertTracker(), compile_rule(spec, servers=8)
+    calm = [50.0] * 8
+
+    # below storm size: individual alerts
+    fired, _, groups = step(tracker, rule, [86.0, 86.0, 86.0] + calm[3:])
+    assert fired == [0, 1, 2] and groups == []
+
+    # the fourth server starts a storm: no individual alert, one group
+    fired, _, groups = step(tracker, rule, [86.0] * 4 + calm[4:])
+    assert fired == []
+    assert [(band, members.tolist()) for band, members in groups] == [(1, [0, 1, 2, 3])]
+
+    # unchanged membership is not re-sent; growth is
+    assert step(tracker, rule, [86.0] * 4 + calm[4:])[2] == []
+    fired, _, groups = step(tracker, rule, [86.0] * 6 + calm[6:])
+    assert fired == [] and [len(members) for _, members in groups] == [6]
+
+    # storm ends below half the storm size; new matches alert individually
+    step(tracker, rule, [86.0] + calm[1:])
+    fired, _, groups = step(tracker, rule, [86.0, 50.0, 86.0] + calm[3:])
+    assert fired == [2] and groups == []
+
+
+def test_state_survives_a_round_trip_and_fleet_changes():
+    tracker, rule = AlertTracker(), compile_rule(CPU, servers=2)
+    step(tracker, rule, [86.0, 50.0])
+
+    restored = AlertTracker()
+    restored.restore(tracker.to_buffers())
+    # server 1 is still active; server 3 is new to the tracker
+    fired, bands, _ = restored.update(rule, np.array([1, 3], dtype=np.int64), np.array([86.0, 86.0]), 0.0)
+    assert fired.tolist() == [1] and bands.tolist() == [1, 1]
+
+
+def test_evaluate_with_tracker_emits_a_grouped_candidate():
+    spec = replace(CPU, storm_size=3)
+    server_ids = np.arange(1, 5, dtype=np.int64)
+    fleet = FleetMetrics(server_ids=server_ids, names=[f"Server-{i}" for i in range(1, 5)],
+                         values={'cpu_usage': np.array([86.0, 87.0, 88.0, 10.0])})
+    table = RuleTable.compile(None, server_ids, specs=[spec])
+
+    candidates = table.evaluate(fleet, SimpleNamespace(), tracker=AlertTracker(), now=0.0)
+
+    assert len(candidates) == 1
+    assert candidates[0].source == GROUP_SOURCE
+    assert candidates[0].member_count == 3
+    assert candidates[0].message == "3 servers: Server-1, Server-2, Server-3"
+
+
+def test_alerts_fire_again_after_a_discarded_evaluation():
+    # The simulation tick snapshots the tracker before evaluating and
+    # restores it when persisting the alerts fails.
+    spec = replace(CPU, min_duration=10.0, storm_size=2)
+    tracker, rule = AlertTracker(), compile_rule(spec, servers=3)
+    step(tracker, rule, [86.0, 50.0, 50.0], now=0.0)
+
+    before = tracker.to_buffers()
+    assert step(tracker, rule, [86.0, 50.0, 50.0], now=10.0)[0] == [0]
+    tracker.restore(before)
+
+    assert step(tracker, rule, [86.0, 50.0, 50.0], now=15.0)[0] == [0]
+
+    # a discarded storm group is sent again too
+    step(tracker, rule, [86.0, 86.0, 50.0], now=30.0)
+    before = tracker.to_buffers()
+    fired, _, groups = step(tracker, rule, [86.0, 86.0, 50.0], now=40.0)
+    assert fired == [] and [members.tolist() for _, members in groups] == [[0, 1]]
+    tracker.restore(before)
+    fired, _, groups = step(tracker, rule, [86.0, 86.0, 50.0], now=45.0)
+    assert fired == [] and [members.tolist() for _, members in groups] == [[0, 1]]